@@ -0,0 +1,48 @@
+"""Measure the memory allocated while parsing markup and the memory kept alive by the tokens of
+compiled markup.
+
+Run with `python benchmarks/bench_allocations.py`
+"""
+import gc
+import tracemalloc
+
+from saimll import SAIML
+
+MARKUP = [
+    f"*\\[[@F cyan]Info[@F]\\]* request {i} handled in _{i % 97}ms_ by [@F #ead1a8]worker-{i % 8}"
+    for i in range(2000)
+]
+
+
+def main():
+    SAIML.configure_cache(maxsize=0)
+    for markup in MARKUP[:10]:
+        SAIML.compile(markup)
+
+    # Peak and total allocated memory while parsing, results are dropped immediately
+    gc.collect()
+    tracemalloc.start()
+    for markup in MARKUP:
+        SAIML.parse(markup)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # Memory kept alive by the compiled tokens
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    compiled = [SAIML.compile(markup) for markup in MARKUP]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    stats = after.compare_to(before, "filename")
+    blocks = sum(stat.count_diff for stat in stats)
+    size = sum(stat.size_diff for stat in stats)
+
+    print(f"parses:                  {len(MARKUP)}")
+    print(f"peak traced memory:      {peak / 1024:.1f} KiB")
+    print(f"retained blocks/compile: {blocks / len(compiled):.1f}")
+    print(f"retained bytes/compile:  {size / len(compiled):.0f}")
+    SAIML.configure_cache(maxsize=1024)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Convert fifty thousand random colors from rgb to hsl and back, and write their escape sequences,
+with a `ColorArray` and one `Color` object at a time.
+
+Run with `python benchmarks/bench_color_array.py`
+"""
+from random import Random
+from time import perf_counter
+
+from saimll.saiml.color import Color, ColorArray
+from saimll.saiml.markup.gradient import _numpy
+
+COUNT = 50_000
+
+
+def time(name: str, run) -> None:
+    start = perf_counter()
+    run()
+    elapsed = perf_counter() - start
+    print(f"{name:<32}{elapsed:>8.3f}s{elapsed / COUNT * 1e6:>8.2f}us per color")
+
+
+def objects(colors) -> None:
+    for color in colors:
+        hsl = Color.RGB(*color).to_hsl()
+        r, g, b = hsl.rgb()
+        f"\x1b[38;2;{r};{g};{b}m"
+
+
+def batched(colors) -> None:
+    ColorArray(colors).to_hsl().fg_sgr()
+
+
+def main():
+    random = Random(0)
+    colors = [
+        (random.randrange(256), random.randrange(256), random.randrange(256)) for _ in range(COUNT)
+    ]
+
+    print(f"NumPy: {'installed' if _numpy() is not None else 'not installed'}")
+    time("Color.RGB -> HSL -> sgr", lambda: objects(colors))
+    time("ColorArray -> hsl -> fg_sgr", lambda: batched(colors))
+    time("ColorArray -> oklab -> to_hex", lambda: ColorArray(colors).to_oklab().to_hex())
+    time("ColorArray.fg_sgr 256 colors", lambda: ColorArray(colors).fg_sgr(256))
+
+
+if __name__ == "__main__":
+    main()
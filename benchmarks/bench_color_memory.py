@@ -0,0 +1,63 @@
+"""Measure the memory kept alive by color objects and the time to create them and get their rgb
+values. Distinct colors show the size of one instance, repeated colors show how much a theme
+cache that keeps the same colors many times holds.
+
+Run with `python benchmarks/bench_color_memory.py`
+"""
+import gc
+import tracemalloc
+from random import Random
+from time import perf_counter
+
+from saimll.saiml.color import Color
+
+COUNT = 100_000
+DISTINCT = 1_000
+
+
+def measure(name: str, create) -> None:
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    colors = create()
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # The list of colors is not counted
+    size = after - before - colors.__sizeof__()
+    print(f"{name:<28}{size / len(colors):>8.1f} bytes per color")
+
+
+def time(name: str, run) -> None:
+    start = perf_counter()
+    run()
+    elapsed = perf_counter() - start
+    print(f"{name:<28}{elapsed / COUNT * 1e6:>8.2f}us per color")
+
+
+def main():
+    random = Random(0)
+    rgb = [
+        (random.randrange(256), random.randrange(256), random.randrange(256)) for _ in range(COUNT)
+    ]
+    codes = ["#{:02x}{:02x}{:02x}".format(*color) for color in rgb]
+    hsl = [Color.HEX(code).to_rgb().to_hsl() for code in codes[:DISTINCT]]
+    hsl = [(color.h, color.s, color.l) for color in hsl]
+
+    print(f"{COUNT} distinct colors")
+    measure("Color.RGB", lambda: [Color.RGB(*color) for color in rgb])
+    measure("Color.HEX", lambda: [Color.HEX(code) for code in codes])
+
+    print(f"\n{COUNT} colors, {DISTINCT} distinct")
+    measure("Color.RGB", lambda: [Color.RGB(*rgb[index % DISTINCT]) for index in range(COUNT)])
+    measure("Color.HEX", lambda: [Color.HEX(codes[index % DISTINCT]) for index in range(COUNT)])
+    measure("Color.HSL", lambda: [Color.HSL(*hsl[index % DISTINCT]) for index in range(COUNT)])
+    measure("Color.XTERM", lambda: [Color.XTERM(index % 256) for index in range(COUNT)])
+
+    print(f"\n{COUNT} colors, {DISTINCT} distinct")
+    time("Color.HEX()", lambda: [Color.HEX(codes[index % DISTINCT]) for index in range(COUNT)])
+    colors = [Color.HSL(*hsl[index % DISTINCT]) for index in range(COUNT)]
+    time("Color.HSL.rgb()", lambda: [color.rgb() for color in colors])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Compare coloring text through a markup round trip, the way `encode` and `style()` used to, with
+the escape sequences of the color objects.
+
+Run with `python benchmarks/bench_color_sgr.py`
+"""
+from timeit import repeat
+
+from saimll.saiml.color import Color, style
+from saimll.saiml.markup import SAIML
+
+COUNT = 20_000
+COLORS = [Color.HEX("#{:06x}".format(index * 2654435 % 0xFFFFFF)) for index in range(COUNT)]
+
+
+def markup_encode() -> None:
+    for color in COLORS:
+        r, g, b = color.rgb()
+        SAIML.parse(f"[@F {r},{g},{b}]▉ {color} ▉")
+
+
+def sgr_encode() -> None:
+    for color in COLORS:
+        color.encode()
+
+
+def markup_style() -> None:
+    for color in COLORS:
+        r, g, b = color.rgb()
+        SAIML.parse(f"[@F {r},{g},{b} @B 4]*{SAIML.escape('status')}")
+
+
+def sgr_style() -> None:
+    for color in COLORS:
+        style("status", fg=color, bg=4, bold=True)
+
+
+def main():
+    for name, run in (
+        ("encode through markup", markup_encode),
+        ("encode with fg_sgr", sgr_encode),
+        ("style through markup", markup_style),
+        ("style with color tokens", sgr_style),
+    ):
+        SAIML.clear_cache()
+        best = min(repeat(run, number=1, repeat=3))
+        print(f"{name:<28}{best / COUNT * 1e6:>8.2f}us per color")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Compare the memoized color resolver against the previous resolver that ran uncompiled regexes
+for every color. Uses the colors from `examples/basics.py`.
+
+Run with `python benchmarks/bench_colors.py`
+"""
+from timeit import repeat
+
+from saimll.saiml.markup.formatting import (
+    HEX,
+    PREDEFINED,
+    RESETCOLOR,
+    RGB,
+    XTERM,
+    ColorType,
+    get_color,
+)
+
+COLORS = ["#83a748", "206", "138,43,226", "220;20;60", "255;255,255", "cyan", "red", ""]
+
+
+def legacy_get_color(types, content: str) -> list:
+    """The previous resolver."""
+    from re import match
+
+    results = []
+    content = content.lower()
+    for ctype in types:
+        if len(content) == 0:
+            results.append(RESETCOLOR(ctype))
+        elif content.startswith("#"):
+            if len(content) == 4 and match(r"#[a-fA-F0-9]{3}", content):
+                results.append(HEX(ctype, content))
+            elif len(content) == 7 and match(r"#[a-fA-F0-9]{6}", content):
+                results.append(HEX(ctype, content))
+        elif match(r"\d{1,3}\s*[,;]\s*\d{1,3}\s*[,;]\s*\d{1,3}", content):
+            rgb = content.replace(";", ",").split(",")
+            results.append(RGB(ctype, rgb[0].strip(), rgb[1].strip(), rgb[2].strip()))
+        elif match(r"\d{1,3}", content):
+            results.append(XTERM(ctype, content))
+        else:
+            results.append(PREDEFINED[content](ctype))
+    return results
+
+
+def main(number: int = 20000):
+    types = [ColorType.FG]
+    for color in COLORS:
+        assert legacy_get_color(types, color) == get_color(types, color), color
+
+    def legacy():
+        for color in COLORS:
+            legacy_get_color(types, color)
+
+    def memoized():
+        for color in COLORS:
+            get_color(types, color)
+
+    old = min(repeat(legacy, number=number, repeat=5)) / (number * len(COLORS))
+    new = min(repeat(memoized, number=number, repeat=5)) / (number * len(COLORS))
+    print(f"legacy   {old * 1e9:>8.0f}ns per color")
+    print(f"memoized {new * 1e9:>8.0f}ns per color ({old / new:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
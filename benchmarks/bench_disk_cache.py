@@ -0,0 +1,44 @@
+"""Compare a cold start, a new parser rendering markup for the first time, with and without a
+disk cache written by an earlier parser. The time with the disk cache includes reading the file.
+
+Run with `python benchmarks/bench_disk_cache.py`
+"""
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from saimll.saiml.markup.markup import SAIMLParser
+
+LINES = [
+    f"*\\[[@F {color}]{label}[@F]\\]* [@F #8aadf4]{index}[@F] _done_"
+    for index, (label, color) in enumerate(
+        [("Info", "cyan"), ("Warning", "yellow"), ("Error", "red"), ("Debug", "white")] * 50
+    )
+]
+
+
+def cold_start(path=None) -> float:
+    parser = SAIMLParser()
+    if path is not None:
+        parser.enable_disk_cache(path=path)
+    start = perf_counter()
+    for line in LINES:
+        parser.parse(line)
+    elapsed = perf_counter() - start
+    parser.enable_disk_cache(False)
+    return elapsed
+
+
+def main():
+    with TemporaryDirectory() as directory:
+        path = Path(directory, "markup.marshal")
+        cold_start(path)
+
+        best = min(cold_start() for _ in range(20))
+        print(f"parse     {best * 1e3:>8.2f}ms for {len(LINES)} lines")
+        best = min(cold_start(path) for _ in range(20))
+        print(f"disk      {best * 1e3:>8.2f}ms for {len(LINES)} lines")
+
+
+if __name__ == "__main__":
+    main()
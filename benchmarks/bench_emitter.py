@@ -0,0 +1,163 @@
+"""Compare the number of bytes written by the state diffing emitter against the previous
+optimizer that only merged adjacent formatting tokens and always ended with a reset.
+
+The corpus is made of log labels, pretty printed values, and colored paths similar to what the
+logger and pprint helpers produce.
+
+Run with `python benchmarks/bench_emitter.py`
+"""
+from typing import Optional
+
+from saimll import SAIML
+from saimll.pprint import p_value
+from saimll.saiml.markup.formatting import LINK, RESET, ColorType
+from saimll.saiml.markup.tokens import Bold, Color, Op, Underline
+
+
+class Formatter:
+    """The previous optimizer's combined format tokens that are next to eachother."""
+
+    __slots__ = ("_fg", "_bg", "_underline", "_bold")
+
+    def __init__(self):
+        self._fg = None
+        self._bg = None
+        self._underline = None
+        self._bold = None
+
+    @property
+    def color(self) -> str:
+        """The colors current in the format"""
+        return f"{self._fg};{self._bg}"
+
+    @color.setter
+    def color(self, color: Color) -> None:
+        if color.type == [ColorType.FG]:
+            self._fg = color
+        elif color.type == [ColorType.BG]:
+            self._bg = color
+        elif color.type == ColorType.BOTH:
+            self._fg = Color("", [color.colors[0]], [ColorType.FG])
+            self._bg = Color("", [color.colors[1]], [ColorType.BG])
+
+    @property
+    def bold(self) -> Optional[Bold]:
+        """The bold toggle currently in the format."""
+        return self._bold
+
+    @bold.setter
+    def bold(self, bold: Bold) -> None:
+        self._bold = bold if self._bold is None else None
+
+    @property
+    def underline(self) -> Optional[Underline]:
+        """The underline toggle currently in the format."""
+        return self._underline
+
+    @bold.setter
+    def underline(self, underline: Underline) -> None:
+        self._underline = underline if self._underline is None else None
+
+    def is_empty(self) -> bool:
+        """True if all of fg, bg, underline, and bold are None."""
+        return (
+            self._fg is None
+            and self._bg is None
+            and self._underline is None
+            and self._bold is None
+        )
+
+    def __str__(self) -> str:
+        values = []
+        if self._bold is not None:
+            values.append(self._bold.value)
+        if self._underline is not None:
+            values.append(self._underline.value)
+        if self._fg is not None:
+            values.append(self._fg.value)
+        if self._bg is not None:
+            values.append(self._bg.value)
+
+        if len(values) > 0:
+            return f"\x1b[{';'.join(str(value) for value in values)}m"
+        else:
+            return ""
+
+    def __repr__(self) -> str:
+        return f"<Format: {repr(str(self))}>"
+
+
+def legacy_render(tokens: list) -> str:
+    """The previous optimizer and renderer."""
+    open_link, func = False, None
+    formatter = Formatter()
+    last_format = Formatter()
+    output = []
+
+    for token in tokens:
+        if token.op == Op.COLOR:
+            formatter.color = token
+        elif token.op == Op.BOLD:
+            formatter.bold = token
+        elif token.op == Op.UNDERLINE:
+            formatter.underline = token
+        elif token.op == Op.HLINK:
+            if open_link and not token.closing:
+                output.append(LINK.CLOSE)
+            open_link = not token.closing or not open_link
+            output.append(token.value)
+        elif token.op == Op.FUNC:
+            func = token
+        else:
+            if not formatter.is_empty():
+                last_format = formatter
+                output.append(str(formatter))
+                formatter = Formatter()
+            if func is not None:
+                value = func.exec(token.value)
+                if isinstance(value, str):
+                    output.append(value)
+                    output.append(str(last_format))
+                func = None
+            else:
+                output.append(str(token))
+
+    if not formatter.is_empty():
+        output.append(str(formatter))
+    if open_link:
+        output.append(LINK.CLOSE)
+    return "".join(output) + RESET
+
+
+def corpus() -> list[str]:
+    labels = [("Info", "cyan"), ("Warning", "yellow"), ("Error", "red"), ("Success", "green")]
+    values = [
+        {"user": "fox", "id": 12, "roles": ["admin", "dev"], "active": True},
+        [1, 2.5, None, "text", (3, 4)],
+        {"nested": {"depth": {"is": "limited"}}, "empty": []},
+    ]
+    markup = []
+    for i in range(200):
+        label, color = labels[i % len(labels)]
+        markup.append(f"*\\[[@F {color}]{label}[@F]\\]* request {i} handled in {i % 37}ms")
+        markup.append(f"[@F yellow]src[@F] > [@F yellow]saimll[@F] > [@F yellow]log_{i}.py[@F] ")
+        markup.append(p_value(values[i % len(values)], depth=3, decode=False))
+        markup.append(f"[@F red]*error*[@F red] in [@F red]module_{i}[@F]: plain message")
+        markup.append(f"status line {i} with no formatting at all")
+    return markup
+
+
+def main():
+    SAIML.configure_cache(maxsize=0)
+    before = after = 0
+    for markup in corpus():
+        before += len(legacy_render(SAIML.compile(markup).tokens).encode())
+        after += len(SAIML.parse(markup).encode())
+    SAIML.configure_cache(maxsize=1024)
+
+    print(f"previous optimizer: {before:>8} bytes")
+    print(f"diffing emitter:    {after:>8} bytes ({(before - after) / before:.1%} smaller)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Compare `SAIML.escape` against the original implementation, which split and joined the whole
+string once per special character, and against a single pass `re.sub` and `str.translate`.
+`escape_many` is compared against escaping each string on it's own.
+
+Run with `python benchmarks/bench_escape.py`
+"""
+from re import compile as re_compile
+from timeit import repeat
+
+from saimll import SAIML
+
+SPECIAL_CHARS = re_compile(r"[\\*_\[]")
+TABLE = str.maketrans({"\\": "\\\\", "*": "\\*", "_": "\\_", "[": "\\["})
+
+VALUES = [
+    "request served in 12ms",
+    "tired_fox",
+    "[admin] *root*",
+    "C:\\Users\\fox\\my_file.txt",
+    "a_b*" * 50,
+]
+
+
+def legacy_escape(text: str) -> str:
+    schars = ["\\", "*", "_", "["]
+    for char in schars:
+        text = f"\\{char}".join(text.split(char))
+    return text
+
+
+def sub_escape(text: str) -> str:
+    return SPECIAL_CHARS.sub(r"\\\g<0>", text)
+
+
+def translate_escape(text: str) -> str:
+    return text.translate(TABLE)
+
+
+def main(number: int = 20000):
+    for value in VALUES:
+        assert legacy_escape(value) == SAIML.escape(value) == sub_escape(value)
+
+    print(f"{'':<12}" + "".join(f"{name:>12}" for name in ("legacy", "re.sub", "translate", "escape")))
+    for value in VALUES:
+        times = []
+        for func in (legacy_escape, sub_escape, translate_escape, SAIML.escape):
+            best = min(repeat(lambda: func(value), number=number, repeat=5)) / number
+            times.append(f"{best * 1e6:>10.2f}us")
+        print(f"{value[:10]!r:<12}" + "".join(times))
+
+    batch = VALUES[:4] * 250
+    assert SAIML.escape_many(batch) == [legacy_escape(value) for value in batch]
+    for name, func in (
+        ("legacy loop", lambda: [legacy_escape(value) for value in batch]),
+        ("escape loop", lambda: [SAIML.escape(value) for value in batch]),
+        ("escape_many", lambda: SAIML.escape_many(batch)),
+    ):
+        best = min(repeat(func, number=200, repeat=5)) / 200
+        print(f"{name:<12}{best * 1e6:>10.2f}us per {len(batch)} strings")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""Time the rainbow and gradient function macros. Gradients over text of the same length reuse
+the cached ramp, while the first call for a length interpolates the ramp.
+
+Run with `python benchmarks/bench_gradient.py`
+"""
+from timeit import repeat
+
+from saimll import SAIML
+from saimll.saiml.markup.gradient import ramp, ramp_sequences
+
+BANNER = "=" * 80
+
+
+def main(number: int = 2000):
+    rainbow = SAIML._funcs["rainbow"]
+    gradient = SAIML._funcs["gradient"]
+
+    def cold():
+        ramp.cache_clear()
+        ramp_sequences.cache_clear()
+        gradient(BANNER, "#f00", "#0f0", "#00f", "oklab")
+
+    for name, func in (
+        ("rainbow", lambda: rainbow(BANNER)),
+        ("gradient rgb", lambda: gradient(BANNER, "#f00", "#00f")),
+        ("gradient oklab", lambda: gradient(BANNER, "#f00", "#0f0", "#00f", "oklab")),
+        ("gradient cold", cold),
+    ):
+        best = min(repeat(func, number=number, repeat=5)) / number
+        print(f"{name:<16}{best * 1e6:>8.2f}us per {len(BANNER)} characters")
+
+    wide = gradient("=" * 2000, "#000", "#fff")
+    print(f"2000 character gray gradient: {wide.count(chr(27))} escape sequences")
+
+
+if __name__ == "__main__":
+    main()
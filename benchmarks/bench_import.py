@@ -0,0 +1,87 @@
+"""Import time regression check for `from saimll import SAIML`.
+
+Each run starts a fresh interpreter with `python -X importtime` and sums the time of the imports
+triggered by the statement, less the imports of an empty interpreter. The best of several runs
+is compared against the budget. Modules that should only be imported on first use are checked
+as well.
+
+Run with `python benchmarks/bench_import.py [--budget MS]`. Exits with 1 if the budget is blown.
+"""
+import subprocess
+import sys
+from argparse import ArgumentParser
+
+STATEMENT = "from saimll import SAIML"
+
+BUDGET_MS = 40.0
+"""Import time budget in milliseconds."""
+
+LAZY = (
+    "lib2to3",
+    "inspect",
+    "dataclasses",
+    "html",
+    "numpy",
+    "saimll.logger",
+    "saimll.pprint",
+    "saimll.saiml.color",
+    "saimll.saiml.markup.template",
+    "saimll.saiml.markup.width",
+    "saimll.saiml.markup.gradient",
+)
+"""Modules that must not be imported by the statement."""
+
+
+def import_times(code: str) -> dict[str, int]:
+    """Get the cumulative import time, in microseconds, of each top level import."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        if not name[1:].startswith(" "):
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def main():
+    parser = ArgumentParser()
+    parser.add_argument("--budget", type=float, default=BUDGET_MS)
+    parser.add_argument("--runs", type=int, default=7)
+    args = parser.parse_args()
+
+    best, heaviest = None, {}
+    for _ in range(args.runs):
+        baseline = import_times("pass")
+        times = import_times(STATEMENT)
+        added = {name: time for name, time in times.items() if name not in baseline}
+        total = sum(added.values()) / 1000
+        if best is None or total < best:
+            best, heaviest = total, added
+
+    for name, time in sorted(heaviest.items(), key=lambda item: -item[1])[:8]:
+        print(f"  {name:<32}{time / 1000:>8.2f}ms")
+    print(f"{STATEMENT}: {best:.2f}ms (budget {args.budget:.2f}ms)")
+
+    loaded = subprocess.run(
+        [sys.executable, "-c", f"import sys; {STATEMENT}; print(' '.join(sys.modules))"],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.split()
+    eager = [module for module in LAZY if module in loaded]
+    if eager:
+        print(f"Imported eagerly: {', '.join(eager)}")
+
+    if best > args.budget or eager:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
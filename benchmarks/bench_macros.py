@@ -0,0 +1,23 @@
+"""Time compiling macros with the sigil dispatch table, including a registered theme macro.
+
+Run with `python benchmarks/bench_macros.py`
+"""
+from timeit import repeat
+
+from saimll.saiml.markup.markup import SAIMLParser
+
+MACROS = ["@F red @B 3", "~https://example.com", "@F #ead1a8@B3", "^rainbow", "$", "@F 114;12,212"]
+
+
+def main(number: int = 5000):
+    parser = SAIMLParser()
+    parser.register_macro("%", {"error": "@F red @B black"})
+    parse_macro = parser._SAIMLParser__parse_macro
+
+    for name, macros in (("builtin", MACROS), ("theme", ["%error", "@F red %error"])):
+        best = min(repeat(lambda: [parse_macro(m) for m in macros], number=number, repeat=5))
+        print(f"{name:<8}{best / (number * len(macros)) * 1e6:>8.2f}us per macro")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+"""Compare printing log lines to a stream without color against printing them as truecolor ansi.
+Every line is unique, like real log output, so the compiled markup cache doesn't help.
+
+Run with `python benchmarks/bench_nocolor.py`
+"""
+from io import StringIO
+from timeit import repeat
+
+from saimll import SAIML
+
+LINES = [f"*\\[[@F cyan]Info[@F]\\]* request [@F green]{i}[@F] took _{i % 97}ms_" for i in range(2000)]
+
+
+def run(backend: str):
+    def body():
+        SAIML.clear_cache()
+        out = StringIO()
+        for line in LINES:
+            SAIML.render_into(line, out, backend)
+
+    return body
+
+
+def main(number: int = 5):
+    for backend in ("ansi", "plain"):
+        best = min(repeat(run(backend), number=number, repeat=5)) / (number * len(LINES))
+        print(f"{backend:<8}{best * 1e6:>8.2f}us per line")
+
+
+if __name__ == "__main__":
+    main()
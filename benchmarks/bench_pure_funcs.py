@@ -0,0 +1,48 @@
+"""Compare an expensive function macro defined as pure, with its results cached, against the
+same function called on every render. Every line of markup is unique but the text given to the
+function repeats, like a highlighted label in log output.
+
+Run with `python benchmarks/bench_pure_funcs.py`
+"""
+from timeit import repeat
+
+from saimll.saiml.markup.markup import SAIMLParser
+
+LINES = [
+    f"[@F {index % 7}]{index}[@F] [^highlight bold]{index % 10} items[] done"
+    for index in range(1000)
+]
+
+
+def highlight(text: str, weight: str = "normal") -> str:
+    # Stand in for a tokenizing syntax highlighter
+    marked = "".join(f"\x1b[1m{char}\x1b[22m" if char.isdigit() else char for char in text * 20)
+    return marked[: len(text)]
+
+
+def run(pure: bool):
+    parser = SAIMLParser()
+    parser.define("highlight", highlight, pure=pure)
+
+    def body():
+        parser.clear_cache()
+        for line in LINES:
+            parser.parse(line)
+
+    return body, parser
+
+
+def main(number: int = 5):
+    for pure in (False, True):
+        body, parser = run(pure)
+        best = min(repeat(body, number=number, repeat=5)) / (number * len(LINES))
+        print(f"{'pure' if pure else 'impure':<8}{best * 1e6:>8.2f}us per line")
+
+    body, parser = run(True)
+    with parser.profile() as stats:
+        body()
+    print(f"hit rate {stats.func_hit_rate('highlight'):.2%}")
+
+
+if __name__ == "__main__":
+    main()
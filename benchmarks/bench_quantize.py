@@ -0,0 +1,45 @@
+"""Convert one million random colors to the closest xterm 256 and ansi 16 colors. The brute force
+search of the whole palette is timed on a sample and shown for comparison.
+
+Run with `python benchmarks/bench_quantize.py`
+"""
+from random import Random
+from time import perf_counter
+
+from saimll.saiml.markup.palette import rgb_to_ansi16, rgb_to_xterm, xterm_rgb
+
+COUNT = 1_000_000
+SAMPLE = 20_000
+
+
+def brute_force(red: int, green: int, blue: int) -> int:
+    return min(
+        range(16, 256),
+        key=lambda index: sum((a - b) ** 2 for a, b in zip(xterm_rgb(index), (red, green, blue))),
+    )
+
+
+def time(name: str, convert, colors) -> None:
+    start = perf_counter()
+    for color in colors:
+        convert(*color)
+    elapsed = perf_counter() - start
+    print(f"{name:<24}{elapsed:>8.3f}s{elapsed / len(colors) * 1e6:>8.2f}us per color")
+
+
+def main():
+    random = Random(0)
+    colors = [
+        (random.randrange(256), random.randrange(256), random.randrange(256)) for _ in range(COUNT)
+    ]
+
+    time(f"brute force ({SAMPLE})", brute_force, colors[:SAMPLE])
+    time("rgb_to_xterm", rgb_to_xterm, colors)
+    time("rgb_to_xterm perceptual", lambda r, g, b: rgb_to_xterm(r, g, b, True), colors)
+    time("rgb_to_ansi16", rgb_to_ansi16, colors)
+    time("rgb_to_ansi16 perceptual", lambda r, g, b: rgb_to_ansi16(r, g, b, True), colors)
+    print(rgb_to_xterm.cache_info())
+
+
+if __name__ == "__main__":
+    main()
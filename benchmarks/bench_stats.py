@@ -0,0 +1,37 @@
+"""Measure the cost of parser instrumentation. Parsing with stats disabled should match the
+uninstrumented parser, the cost of profiling is shown for comparison.
+
+Run with `python benchmarks/bench_stats.py`
+"""
+from timeit import repeat
+
+from saimll import SAIML
+
+MARKUP = ["[@F red]Hello[@F] *world* [~https://example.com]link[~] %d" % i for i in range(200)]
+
+
+def parse_all():
+    SAIML.clear_cache()
+    for markup in MARKUP:
+        SAIML.parse(markup)
+
+
+def profiled():
+    with SAIML.profile():
+        parse_all()
+
+
+def main(number: int = 50):
+    for name, func in (("disabled", parse_all), ("profiled", profiled)):
+        best = min(repeat(func, number=number, repeat=7)) / (number * len(MARKUP))
+        print(f"{name:<10}{best * 1e6:>8.2f}us per uncached parse")
+
+    with SAIML.profile() as stats:
+        parse_all()
+    for phase, seconds in stats.phases.items():
+        print(f"  {phase:<10}{seconds * 1e3:>8.2f}ms")
+    print(stats)
+
+
+if __name__ == "__main__":
+    main()
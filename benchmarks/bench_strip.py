@@ -0,0 +1,52 @@
+"""Compare the precompiled strip patterns against the original `SAIML.strip`, which imported `re`
+and used one combined pattern on every call, and time stripping a large log with `strip_stream`.
+
+Run with `python benchmarks/bench_strip.py`
+"""
+from io import StringIO
+from timeit import repeat
+
+from saimll import SAIML
+from saimll.saiml.markup.strip import StripMode
+
+
+def legacy_strip(text: str) -> str:
+    from re import sub
+
+    return sub(
+        r"\x1b\[(\d{0,2};?)*m|(?<!\\)\*|(?<!\\)_|(?<!\\)\[[^\[\]]+\]|\\",
+        "",
+        text,
+    )
+
+
+LINES = [
+    SAIML.parse("*\\[[@F cyan]Info[@F]\\]* ") + "request served in 12ms\n",
+    SAIML.parse("*\\[[@F #ff8800]Warning[@F]\\]* ") + "slow query on users\n",
+    SAIML.parse("[~https://example.com]*link*[~] [@F 196 @B 21]error[]") + "\n",
+]
+
+
+def main(number: int = 20000):
+    for name, func in (
+        ("legacy", lambda: [legacy_strip(line) for line in LINES]),
+        ("both", lambda: [SAIML.strip(line) for line in LINES]),
+        ("ansi", lambda: [SAIML.strip(line, StripMode.ANSI) for line in LINES]),
+    ):
+        best = min(repeat(func, number=number, repeat=5)) / (number * len(LINES))
+        print(f"{name:<10}{best * 1e6:>8.2f}us per line")
+
+    log = "".join(LINES) * 100_000
+    for chunk_size in (4 * 1024, 64 * 1024):
+        best = min(
+            repeat(
+                lambda: SAIML.strip_stream(StringIO(log), StringIO(), StripMode.ANSI, chunk_size),
+                number=1,
+                repeat=3,
+            )
+        )
+        print(f"stream {chunk_size // 1024}KiB chunks: {len(log) / best / 1e6:.1f}M chars/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""Compare rendering a markup template against formatting values into markup and parsing it, and
+against a plain `str.format` call.
+
+Run with `python benchmarks/bench_template.py`
+"""
+from timeit import repeat
+
+from saimll import SAIML
+
+MARKUP = "[@F red]{user}[@F] failed in *{ms}*ms"
+VALUES = [("fox", 12), ("tired_fox", 7), ("[admin]", 1200), ("*root*", 3)]
+
+
+def main(number: int = 5000):
+    template = SAIML.template(MARKUP)
+    plain = "{user} failed in {ms}ms"
+
+    def render_template():
+        for user, ms in VALUES:
+            template.render(user=user, ms=ms)
+
+    def parse_escaped():
+        SAIML.clear_cache()
+        for user, ms in VALUES:
+            SAIML.parse(MARKUP.format(user=SAIML.escape(user), ms=ms))
+
+    def str_format():
+        for user, ms in VALUES:
+            plain.format(user=user, ms=ms)
+
+    for name, func in (
+        ("str.format", str_format),
+        ("template", render_template),
+        ("escape+parse", parse_escaped),
+    ):
+        best = min(repeat(func, number=number, repeat=5)) / (number * len(VALUES))
+        print(f"{name:<14}{best * 1e6:>8.2f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Compare the scanning tokenizer against the previous character by character tokenizer on long,
+mostly plain, markup strings.
+
+Run with `python benchmarks/bench_tokenizer.py`
+"""
+from timeit import repeat
+
+from saimll import SAIML
+from saimll.saiml.markup.formatting import BOLD, UNDERLINE
+from saimll.saiml.markup.tokens import Bold, Escape, Text, Underline
+
+
+def legacy_parse_tokens(parser, string: str) -> list:
+    """The previous tokenizer that walked the markup one character at a time."""
+    parse_macro = parser._SAIMLParser__parse_macro
+    bold_state, underline_state = BOLD.POP, UNDERLINE.POP
+    global_escape, escaped = False, False
+    text, output = [], []
+    index = 0
+
+    def consume_macro(index: int, global_escape: bool):
+        start = index
+        index += 1
+        char = string[index]
+        macro = []
+        while char != "]":
+            macro.append(char)
+            index += 1
+            if index == len(string):
+                raise ValueError(f"Macro's must be closed \n {string[start-1:]}")
+            char = string[index]
+        tokens = parse_macro("".join(macro))
+        if len([token for token in tokens if isinstance(token, Escape)]) % 2 != 0:
+            global_escape = not global_escape
+        output.extend([token for token in tokens if not isinstance(token, Escape)])
+        return index, global_escape
+
+    while index < len(string):
+        char = string[index]
+        if char == "*" and not escaped and not global_escape:
+            if len(text) > 0:
+                output.append(Text("".join(text)))
+                text = []
+            bold_state = BOLD.inverse(bold_state)
+            output.append(Bold(bold_state))
+        elif char == "_" and not escaped and not global_escape:
+            if len(text) > 0:
+                output.append(Text("".join(text)))
+                text = []
+            underline_state = UNDERLINE.inverse(underline_state)
+            output.append(Underline(underline_state))
+        elif char == "[" and not escaped:
+            if len(text) > 0:
+                output.append(Text("".join(text)))
+                text = []
+            index, global_escape = consume_macro(index, global_escape)
+        elif char == "\\" and not escaped:
+            escaped = True
+        else:
+            text.append(char)
+            escaped = False
+        index += 1
+
+    if len(text) > 0:
+        output.append(Text("".join(text)))
+    return output
+
+
+SAMPLES = {
+    "plain 200": "lorem ipsum dolor sit amet, " * 7,
+    "plain 10k": "lorem ipsum dolor sit amet, " * 360,
+    "log line": "*\\[[@F cyan]Info[@F]\\]* " + "request handled in 12ms path=/api/v1/users " * 20,
+    "mixed": ("[@F #ead1a8]status[@F] ok *bold* _line_ " + "plain text " * 30) * 10,
+}
+
+
+def main(number: int = 200):
+    parse_tokens = SAIML._SAIMLParser__parse_tokens
+
+    print(f"{'sample':<12}{'legacy':>12}{'scanner':>12}{'speedup':>10}")
+    for name, markup in SAMPLES.items():
+        legacy = [str(token) for token in legacy_parse_tokens(SAIML, markup)]
+        current = [str(token) for token in parse_tokens(markup)]
+        assert legacy == current, f"tokenizers disagree on {name!r}"
+
+        old = min(repeat(lambda: legacy_parse_tokens(SAIML, markup), number=number, repeat=5))
+        new = min(repeat(lambda: parse_tokens(markup), number=number, repeat=5))
+        print(
+            f"{name:<12}{old / number * 1e6:>10.1f}us{new / number * 1e6:>10.1f}us"
+            f"{old / new:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
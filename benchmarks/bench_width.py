@@ -0,0 +1,44 @@
+"""Compare padding table cells by rendering, stripping, and measuring with `len` against the
+width aware operations on compiled markup and rendered ansi.
+
+Run with `python benchmarks/bench_width.py`
+"""
+from timeit import repeat
+
+from saimll import SAIML
+from saimll.saiml.markup import width
+
+CELLS = [
+    "[@F green]ok[@F]",
+    "*[@F red]failed[@F]*",
+    "[@F cyan]漢字テスト[@F]",
+    "_[~https://example.com]docs[~]_",
+    "[@F #ff8800]a much longer cell that needs truncating[@F]",
+] * 10
+WIDTH = 16
+
+
+def legacy_cell(markup: str) -> str:
+    rendered = SAIML.parse(markup)
+    visible = len(SAIML.strip(rendered))
+    return rendered + " " * max(WIDTH - visible, 0)
+
+
+def main(number: int = 2000):
+    compiled = [SAIML.compile(cell) for cell in CELLS]
+    rendered = [SAIML.parse(cell) for cell in CELLS]
+
+    for name, func in (
+        ("parse+strip+len", lambda: [legacy_cell(cell) for cell in CELLS]),
+        (
+            "rendered ansi",
+            lambda: [width.ljust(width.truncate(cell, WIDTH), WIDTH) for cell in rendered],
+        ),
+        ("compiled ljust", lambda: [cell.ljust(WIDTH) for cell in compiled]),
+    ):
+        best = min(repeat(func, number=number, repeat=5)) / number
+        print(f"{name:<16}{best * 1e6:>8.1f}us per {len(CELLS)} cells")
+
+
+if __name__ == "__main__":
+    main()
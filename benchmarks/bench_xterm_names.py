@@ -0,0 +1,45 @@
+"""Compare looking up xterm colors by name with the name index against the original scan of every
+color, for a name at the end of the table and for a typo.
+
+Run with `python benchmarks/bench_xterm_names.py`
+"""
+from timeit import repeat
+
+from saimll.saiml.color.xterm_colors import XTERM_COLORS
+from saimll.saiml.color.xterm_index import suggest_xterm_name, xterm_code
+
+
+def legacy_lookup(color: str):
+    value, longest_match = None, ""
+    for xterm in XTERM_COLORS:
+        if xterm[1].lower() == color.lower():
+            value = xterm[0]
+        else:
+            matching = ""
+            for c1, c2 in zip(color.lower(), xterm[1].lower()):
+                if c1 != c2:
+                    break
+                matching += c1
+            if len(matching) > len(longest_match):
+                longest_match = matching
+    return value, longest_match
+
+
+def indexed_lookup(color: str):
+    code = xterm_code(color)
+    return code, None if code is not None else suggest_xterm_name(color)
+
+
+def main(number: int = 2000):
+    indexed_lookup("Gallery")
+    print(f"{'name':<10}{'legacy':>10}{'indexed':>10}{'speedup':>10}")
+    for name in ("Gallery", "Gallry"):
+        legacy = min(repeat(lambda: legacy_lookup(name), number=number, repeat=5)) / number
+        indexed = min(repeat(lambda: indexed_lookup(name), number=number, repeat=5)) / number
+        print(
+            f"{name:<10}{legacy * 1e6:>8.1f}us{indexed * 1e6:>8.2f}us{legacy / indexed:>9.0f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,35 @@
-from .saiml import SAIML, style
-from .pprint import pprint, p_value, ppath
-from .logger import *
+"""Submodules are imported the first time one of their names is used so `from saimll import SAIML`
+does not import the logger, pprint, or color packages."""
+from __future__ import annotations
+
+from importlib import import_module
+from typing import Any
 
 __version__ = "0.5.1"
+
+_LAZY = {
+    "SAIML": ".saiml",
+    "style": ".saiml",
+    "pprint": ".pprint",
+    "p_value": ".pprint",
+    "ppath": ".pprint",
+    "Log": ".logger",
+    "Logger": ".logger",
+    "LogLevel": ".logger",
+}
+"""The submodule that each public name is imported from."""
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *_LAZY})
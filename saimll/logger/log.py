@@ -5,6 +5,7 @@ from io import StringIO, TextIOWrapper
 from typing import Any, Callable, Optional, TextIO
 
 from saimll import SAIML
+from saimll.saiml.markup.strip import StripMode
 
 from .encoding import encodings
 from .LogLevel import LogLevel
@@ -123,8 +124,8 @@ class Log:
         """
 
         if file is not None:
-            for log in self.buffer:
-                file.write(SAIML.strip(log))
+            # Messages are written as is so only the ansi from the labels is removed
+            file.write(SAIML.strip("".join(self.buffer), StripMode.ANSI))
         else:
             for log in self.buffer:
                 self._output.write(log)
@@ -176,10 +177,12 @@ class Log:
         message = " ".join(message)
         message += "\n" if not message.endswith("\n") else ""
         
+        # Labels use the colors the output can display, or plain text when it has no color
+        backend = SAIML.output_backend(self._output)
         if clr is not None:
-            self.buffer.append(SAIML.parse(f"*\[[@F{clr}]{label}[@F]\]* ") + message)
+            self.buffer.append(SAIML.parse(f"*\[[@F{clr}]{label}[@F]\]* ", backend) + message)
         else:
-            self.buffer.append(SAIML.parse(f"*\[{label}\]* ") + message)
+            self.buffer.append(SAIML.parse(f"*\[{label}\]* ", backend) + message)
 
         if len(gaps) == 2 and gaps[1]:
             self.buffer.append("\n")
@@ -36,11 +36,10 @@ def pprint(
     seperator: str = " ",
     handler: Optional[Callable] = None,
 ):
-    """Pretty print any value with formatting and color."""
-    from sys import stdout
-
-    values = [p_value(value, depth=depth, handler=handler) for value in values]
-    stdout.write(seperator.join(values) + end)
+    """Pretty print any value with formatting and color. Only the text is printed when stdout
+    can't display color."""
+    values = [p_value(value, depth=depth, decode=False, handler=handler) for value in values]
+    SAIML.print(*values, sep=seperator, end=end)
 
 
 def p_value(
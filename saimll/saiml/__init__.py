@@ -5,6 +5,18 @@ SAIML is the name for the inline markup language for this library. This allows t
 Includes:
 
 * parse -> returns formatted strings
+* compile -> returns reusable compiled markup, parse results are cached
+* enable_disk_cache -> keep compiled markup in a file so new processes render it without parsing
+* parse_many -> returns formatted strings for a batch of markup strings
+* stream -> incrementally parse markup that arrives in chunks with feed() and close()
+* render_into -> render markup straight into a write callable, text stream, or bytearray
+* profile -> collect parse counts, bytes, cache hits, macros, function macro time, and phase timings with `with SAIML.profile() as stats:`
+* template -> markup with `{field}`s that is parsed once and rendered with render(**values)
+* backends -> render to truecolor, 256 color, or 16 color ansi, plain text, or html with `parse(text, backend="html")`
+* color detection -> print, pprint, and Log use the colors the output can display and write plain text to pipes and files or with `NO_COLOR`, `FORCE_COLOR` turns color back on
+* Color -> fg_sgr() and bg_sgr() write a color's escape sequence for any color depth, style() and encode() use them instead of parsing markup
+* ColorArray -> convert many colors between rgb, hex, hsl, hsv, yiq, and oklab at once and write their escape sequences, with NumPy when it is installed
+* visible width -> compiled markup has visible_width(), truncate(), slice(), ljust(), rjust(), and center() that handle wide characters
 * pprint -> parse SAIML markup strings and display them to stdout
 * More to come...
 
@@ -44,12 +56,47 @@ create a hyperlink, and call a builtin function. All macros will ignore extra wh
             SAIML.print("[^hw]Cat goes moo")
             ```
         * The above example lets SAIML know about the function hello_world and says it can be called with `hw`
+        * Functions that always return the same result for the same text can be defined with `pure=True`, `SAIML.define("hw", hello_world, pure=True)`, so their results are cached
+        * Arguments after the name, `[^hw one, two]`, are split when the markup is parsed and passed to the function after the text
         * Then all that needs to happen is to call it with `[^hw]`
     * Example:
         * `[^rainbow]Rainbow Text` will return the string with a rainbow foreground color.
+        * `[^gradient #f00,#00f]Gradient Text` will blend the foreground from red to blue. Any number of colors can be given and the last argument can be the color space to blend in; `rgb`, `hsl`, or `oklab`.
+
+4. Registered macros
+    * New kinds of macros can be added with `SAIML.register_macro(sigil, handler)`. The handler gets the name after the sigil and returns the macro it stands for.
+    * Example:
+        ```python
+        SAIML.register_macro("%", {"error": "@F red @B black", "ok": "@F green"})
+        SAIML.print("[%error]Failed[] [%ok]Passed")
+        ```
+    * Registered macros are compiled once when the markup is parsed so they render as fast as the builtin macros.
 
 SAIML also follows some inspiration from markdown where `*` means toggle bold and `_` means to toggle underline.
 To reset all attributes, color and formatting, use the empty brackets `[]`.
 """
+from importlib import import_module
+from typing import Any
+
 from .markup import SAIML
-from .color import Color, style
+
+_LAZY = {
+    "Color": ".color",
+    "style": ".color",
+}
+"""Names imported from the color package the first time they are used."""
+
+__all__ = ["SAIML", *_LAZY]
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted({*globals(), *_LAZY})
@@ -1,32 +1,37 @@
-from typing import Callable
+from typing import Callable, Optional
 from saimll.saiml.markup import SAIML
-from .colors import Color
+from saimll.saiml.markup.formatting import BOLD, PREDEFINED, UNDERLINE, ColorType
+from saimll.saiml.markup.tokens import BOLD_TOKENS, UNDERLINE_TOKENS, Func, HLink, Text, Token
+from saimll.saiml.markup.tokens import Color as ColorToken
+from .colors import Color, ColorBase
+from .array import ColorArray
 
 COLOR = str | int | tuple | Color
 base_colors = ["black", "red", "green", "yellow", "blue", "magenta", "cyan", "white"]
 
 
-def _parse_color(color: COLOR, spec: str = "F"):
-    code = ""
-    if color is not None:
-        if isinstance(color, str):
-            if color.startswith("#"):
-                code = f"@{spec} {','.join(Color.HEX(color).rgb())}"
-            elif color.lower() in base_colors:
-                code = f"@{spec} {color.lower()}"
-            else:
-                code = f"@{spec} {Color.XTERM(color).code}"
-        elif isinstance(color, int):
-            code = f"@{spec} {Color.XTERM(color).code}"
-        elif isinstance(color, tuple):
-            if len(color) != 3:
-                raise ValueError("There may only be 3 values in the rgb tuple")
+def _parse_color(color: COLOR, ctype: int = ColorType.FG) -> Optional[str]:
+    """The color code of a fg or bg color given to `style()`, None if there is no color."""
+    if color is None:
+        return None
+    if isinstance(color, str) and color.lower() in base_colors:
+        return PREDEFINED[color.lower()](ctype)
 
-            if any(val < 0 or val > 255 for val in color):
-                raise ValueError("RGB values may only be from 0 to 255")
+    if isinstance(color, str):
+        color = Color.HEX(color) if color.startswith("#") else Color.XTERM(color)
+    elif isinstance(color, int):
+        color = Color.XTERM(color)
+    elif isinstance(color, tuple):
+        if len(color) != 3:
+            raise ValueError("There may only be 3 values in the rgb tuple")
 
-            code = f"@{spec} {','.join(str(channel) for channel in color)}"
-    return code
+        if any(val < 0 or val > 255 for val in color):
+            raise ValueError("RGB values may only be from 0 to 255")
+
+        color = Color.RGB(*color)
+    elif not isinstance(color, ColorBase):
+        return None
+    return color.fg_code() if ctype == ColorType.FG else color.bg_code()
 
 
 def style(
@@ -44,42 +49,47 @@ def style(
 
     value = " ".join(string)
 
-    macro = []
+    tokens: list[Token] = []
 
     # foreground and background colors
-    macro.append(_parse_color(fg))
-    macro.append(_parse_color(bg, "B"))
+    codes, types = [], []
+    for color, ctype in ((fg, ColorType.FG), (bg, ColorType.BG)):
+        code = _parse_color(color, ctype)
+        if code is not None:
+            codes.append(code)
+            types.append(ctype)
+    if len(codes) > 0:
+        tokens.append(ColorToken("", codes, types))
 
     # url
     if url is not None:
-        macro.append(f"~{url}")
+        tokens.append(HLink(f"~{url}"))
 
     # Run through function
     if isinstance(function, str):
         if function in SAIML._funcs:
-            macro.append(f"^{function}")
+            tokens.append(Func(f"^{function}", SAIML._funcs))
         else:
             raise KeyError(f"{function} is a unkown custom function")
     elif isinstance(function, tuple):
         if len(function) == 2 and isinstance(function[0], str) and callable(function[1]):
             SAIML.define(function[0], function[1])
-            macro.append(f"^{function[0]}")
+            tokens.append(Func(f"^{function[0]}", SAIML._funcs))
         else:
             raise TypeError(
                 "If you are providing a new custom function it must be a tuple of one \
 str and one Callable"
             )
-    head = ""
 
     # Bold
     if bold:
-        head += "*"
+        tokens.append(BOLD_TOKENS[BOLD.PUSH])
 
     # Underline
     if uline:
-        head += "_"
+        tokens.append(UNDERLINE_TOKENS[UNDERLINE.PUSH])
 
-    # Parse with SAIML and return
-    return SAIML.parse(
-        f"[{' '.join(attr for attr in macro if attr.strip() != '')}]{head}{SAIML.escape(value)}"
-    )
+    # Render the tokens directly, the text is never parsed as markup
+    if len(value) > 0:
+        tokens.append(Text(value))
+    return SAIML.render_tokens(tokens)
@@ -0,0 +1,382 @@
+"""Many colors stored together and converted between color spaces at once.
+
+A `ColorArray` keeps its colors as a flat `array("d")` of channel values, three per color, in
+one of the color spaces in `ARRAY_SPACES`:
+
+* rgb: red, green, and blue from 0 to 255
+* hsl: hue in degrees from 0 to 360, saturation and lightness from 0 to 1
+* hsv: hue in degrees from 0 to 360, saturation and value from 0 to 1
+* yiq: luminance from 0 to 1, in-phase and quadrature
+* oklab: lightness, green to red, and blue to yellow
+
+Hex codes are rgb colors written as text, so they are read with `from_hex` and written with
+`to_hex`. Values are not rounded between conversions, only when they are turned into rgb
+integers, hex codes, or escape sequences.
+
+If NumPy is installed the whole array is converted with vectorized math on a view of the same
+memory. Without it each color is converted in pure python with `colorsys` and gives the same
+results.
+"""
+from __future__ import annotations
+
+import colorsys
+from array import array
+from typing import TYPE_CHECKING, Iterable, Iterator, Sequence, Tuple, Union
+
+from saimll.saiml.markup.backends import ColorDepth
+from saimll.saiml.markup.gradient import _numpy, _oklab_to_rgb, _rgb_to_oklab
+from saimll.saiml.markup.palette import rgb_to_ansi16, rgb_to_xterm
+
+if TYPE_CHECKING:
+    from .colors import ColorBase
+
+__all__ = [
+    "ColorArray",
+    "ARRAY_SPACES",
+]
+
+Channels = Tuple[float, float, float]
+
+ARRAY_SPACES = ("rgb", "hsl", "hsv", "yiq", "oklab")
+"""The color spaces a `ColorArray` can hold."""
+
+
+def _to_rgb(space: str, color: Channels) -> Channels:
+    """Convert one color to rgb from 0 to 1."""
+    if space == "rgb":
+        return (color[0] / 255, color[1] / 255, color[2] / 255)
+    if space == "hsl":
+        return colorsys.hls_to_rgb(color[0] / 360 % 1, color[2], color[1])
+    if space == "hsv":
+        return colorsys.hsv_to_rgb(color[0] / 360 % 1, color[1], color[2])
+    if space == "yiq":
+        return colorsys.yiq_to_rgb(*color)
+    return _oklab_to_rgb(color)
+
+
+def _from_rgb(space: str, color: Channels) -> Channels:
+    """Convert one color from rgb from 0 to 1."""
+    if space == "rgb":
+        return (color[0] * 255, color[1] * 255, color[2] * 255)
+    if space == "hsl":
+        h, l, s = colorsys.rgb_to_hls(*color)
+        return (h * 360, s, l)
+    if space == "hsv":
+        h, s, v = colorsys.rgb_to_hsv(*color)
+        return (h * 360, s, v)
+    if space == "yiq":
+        return colorsys.rgb_to_yiq(*color)
+    return _rgb_to_oklab(tuple(channel * 255 for channel in color))
+
+
+def _hue_numpy(numpy, red, green, blue, maxc, delta):
+    """The hue from 0 to 1 of rgb channels, the same as `colorsys`."""
+    safe = numpy.where(delta == 0, 1.0, delta)
+    rc, gc, bc = (maxc - red) / safe, (maxc - green) / safe, (maxc - blue) / safe
+    hue = numpy.where(red == maxc, bc - gc, numpy.where(green == maxc, 2.0 + rc - bc, 4.0 + gc - rc))
+    return numpy.where(delta == 0, 0.0, (hue / 6.0) % 1.0)
+
+
+def _hls_channel_numpy(numpy, m1, m2, hue):
+    hue = hue % 1.0
+    return numpy.where(
+        hue < 1 / 6,
+        m1 + (m2 - m1) * hue * 6.0,
+        numpy.where(
+            hue < 0.5, m2, numpy.where(hue < 2 / 3, m1 + (m2 - m1) * (2 / 3 - hue) * 6.0, m1)
+        ),
+    )
+
+
+def _linear_numpy(numpy, channel):
+    return numpy.where(channel <= 0.04045, channel / 12.92, ((channel + 0.055) / 1.055) ** 2.4)
+
+
+def _gamma_numpy(numpy, channel):
+    return numpy.where(
+        channel <= 0.0031308,
+        12.92 * channel,
+        1.055 * numpy.abs(channel) ** (1 / 2.4) * numpy.sign(channel) - 0.055,
+    )
+
+
+def _to_rgb_numpy(numpy, space: str, values):
+    """Convert an (n, 3) array to rgb from 0 to 1."""
+    a, b, c = values[:, 0], values[:, 1], values[:, 2]
+    if space == "rgb":
+        return values / 255.0
+    if space == "hsv":
+        hue = (a / 360.0) % 1.0
+        sector = numpy.floor(hue * 6.0)
+        f = hue * 6.0 - sector
+        p, q, t = c * (1.0 - b), c * (1.0 - b * f), c * (1.0 - b * (1.0 - f))
+        sector = sector.astype(int) % 6
+        choices = [(c, t, p), (q, c, p), (p, c, t), (p, q, c), (t, p, c), (c, p, q)]
+        channels = [numpy.choose(sector, [choice[index] for choice in choices]) for index in range(3)]
+        gray = b == 0.0
+        return numpy.stack([numpy.where(gray, c, channel) for channel in channels], axis=1)
+    if space == "hsl":
+        hue, s, l = (a / 360.0) % 1.0, b, c
+        m2 = numpy.where(l <= 0.5, l * (1.0 + s), l + s - l * s)
+        m1 = 2.0 * l - m2
+        channels = [
+            _hls_channel_numpy(numpy, m1, m2, hue + 1 / 3),
+            _hls_channel_numpy(numpy, m1, m2, hue),
+            _hls_channel_numpy(numpy, m1, m2, hue - 1 / 3),
+        ]
+        gray = s == 0.0
+        return numpy.stack([numpy.where(gray, l, channel) for channel in channels], axis=1)
+    if space == "yiq":
+        rgb = numpy.stack(
+            [
+                a + 0.9468822170900693 * b + 0.6235565819861433 * c,
+                a - 0.27478764629897834 * b - 0.6356910791873801 * c,
+                a - 1.1085450346420322 * b + 1.7090069284064666 * c,
+            ],
+            axis=1,
+        )
+        return numpy.clip(rgb, 0.0, 1.0)
+
+    l = (a + 0.3963377774 * b + 0.2158037573 * c) ** 3
+    m = (a - 0.1055613458 * b - 0.0638541728 * c) ** 3
+    s = (a - 0.0894841775 * b - 1.2914855480 * c) ** 3
+    return numpy.stack(
+        [
+            _gamma_numpy(numpy, 4.0767416621 * l - 3.3077115913 * m + 0.2309699292 * s),
+            _gamma_numpy(numpy, -1.2684380046 * l + 2.6097574011 * m - 0.3413193965 * s),
+            _gamma_numpy(numpy, -0.0041960863 * l - 0.7034186147 * m + 1.7076147010 * s),
+        ],
+        axis=1,
+    )
+
+
+def _from_rgb_numpy(numpy, space: str, rgb):
+    """Convert an (n, 3) array of rgb from 0 to 1 to the color space."""
+    red, green, blue = rgb[:, 0], rgb[:, 1], rgb[:, 2]
+    if space == "rgb":
+        return rgb * 255.0
+    if space in ("hsl", "hsv"):
+        maxc, minc = rgb.max(axis=1), rgb.min(axis=1)
+        delta = maxc - minc
+        hue = _hue_numpy(numpy, red, green, blue, maxc, delta) * 360.0
+        if space == "hsv":
+            saturation = numpy.where(maxc == 0, 0.0, delta / numpy.where(maxc == 0, 1.0, maxc))
+            return numpy.stack([hue, numpy.where(delta == 0, 0.0, saturation), maxc], axis=1)
+        lightness = (maxc + minc) / 2.0
+        divisor = numpy.where(lightness <= 0.5, maxc + minc, 2.0 - maxc - minc)
+        saturation = numpy.where(delta == 0, 0.0, delta / numpy.where(delta == 0, 1.0, divisor))
+        return numpy.stack([hue, saturation, lightness], axis=1)
+    if space == "yiq":
+        y = 0.30 * red + 0.59 * green + 0.11 * blue
+        return numpy.stack(
+            [y, 0.74 * (red - y) - 0.27 * (blue - y), 0.48 * (red - y) + 0.41 * (blue - y)], axis=1
+        )
+
+    r, g, b = (_linear_numpy(numpy, channel) for channel in (red, green, blue))
+    l = numpy.cbrt(0.4122214708 * r + 0.5363325363 * g + 0.0514459929 * b)
+    m = numpy.cbrt(0.2119034982 * r + 0.6806995451 * g + 0.1073969566 * b)
+    s = numpy.cbrt(0.0883024619 * r + 0.2817188376 * g + 0.6299787005 * b)
+    return numpy.stack(
+        [
+            0.2104542553 * l + 0.7936177850 * m - 0.0040720468 * s,
+            1.9779984951 * l - 2.4285922050 * m + 0.4505937099 * s,
+            0.0259040371 * l + 0.7827717662 * m - 0.8086757660 * s,
+        ],
+        axis=1,
+    )
+
+
+def _clamp(channel: float) -> int:
+    return min(max(round(channel), 0), 255)
+
+
+class ColorArray:
+    """Colors in one color space stored in a single contiguous array.
+
+    Args:
+        values (Iterable[float] | Iterable[tuple[float, float, float]]): The channels of the
+        colors, either flat or as a tuple for each color
+        space (str): The color space of the values, one of `ARRAY_SPACES`. Defaults to rgb.
+
+    Raises:
+        ValueError: If the color space is unknown or the values aren't a multiple of three
+    """
+
+    __slots__ = ("_values", "_space")
+
+    def __init__(
+        self,
+        values: Union[Iterable[float], Iterable[Sequence[float]]] = (),
+        space: str = "rgb",
+    ) -> None:
+        if space not in ARRAY_SPACES:
+            raise ValueError(
+                f"Unknown color space {space!r}, expected one of {', '.join(ARRAY_SPACES)}"
+            )
+
+        if isinstance(values, array) and values.typecode == "d":
+            flat = array("d", values)
+        else:
+            flat = array("d")
+            for value in values:
+                if isinstance(value, (int, float)):
+                    flat.append(value)
+                else:
+                    flat.extend(value)
+        if len(flat) % 3 != 0:
+            raise ValueError("Colors must have three channels each")
+
+        self._values: array = flat
+        self._space: str = space
+
+    @classmethod
+    def from_hex(cls, codes: Iterable[str]) -> ColorArray:
+        """Create an rgb array from hex codes, `#ead1a8` or `#fff`.
+
+        Raises:
+            ValueError: If a code isn't 3 or 6 hexadecimal digits
+        """
+        values = array("d")
+        for code in codes:
+            code = code.strip().lstrip("#")
+            if len(code) == 3:
+                code = "".join(digit * 2 for digit in code)
+            if len(code) != 6:
+                raise ValueError(f"Hex codes must be either 3 or 6 in length: was {code!r}")
+            values.extend(bytes.fromhex(code))
+        return cls(values, "rgb")
+
+    @classmethod
+    def from_colors(cls, colors: Iterable[ColorBase]) -> ColorArray:
+        """Create an rgb array from color objects, like `Color.HEX` or `Color.HSL`."""
+        values = array("d")
+        for color in colors:
+            values.extend(color.rgb())
+        return cls(values, "rgb")
+
+    @property
+    def space(self) -> str:
+        """The color space of the values."""
+        return self._space
+
+    @property
+    def values(self) -> array:
+        """The flat array of channel values, three for each color."""
+        return self._values
+
+    def to(self, space: str) -> ColorArray:
+        """Convert every color to another color space.
+
+        Args:
+            space (str): The color space to convert to, one of `ARRAY_SPACES`
+
+        Returns:
+            ColorArray: The converted colors. The same array if it is already in the color space.
+        """
+        if space == self._space:
+            return self
+        if space not in ARRAY_SPACES:
+            raise ValueError(
+                f"Unknown color space {space!r}, expected one of {', '.join(ARRAY_SPACES)}"
+            )
+
+        numpy = _numpy()
+        if numpy is not None and len(self._values) > 0:
+            view = numpy.frombuffer(self._values, dtype=numpy.float64).reshape(-1, 3)
+            rgb = _to_rgb_numpy(numpy, self._space, view)
+            converted = numpy.ascontiguousarray(_from_rgb_numpy(numpy, space, rgb), numpy.float64)
+            values = array("d")
+            values.frombytes(converted.tobytes())
+            return ColorArray(values, space)
+
+        values = array("d")
+        for color in self:
+            values.extend(_from_rgb(space, _to_rgb(self._space, color)))
+        return ColorArray(values, space)
+
+    def to_rgb(self) -> ColorArray:
+        """Convert every color to rgb."""
+        return self.to("rgb")
+
+    def to_hsl(self) -> ColorArray:
+        """Convert every color to hsl."""
+        return self.to("hsl")
+
+    def to_hsv(self) -> ColorArray:
+        """Convert every color to hsv."""
+        return self.to("hsv")
+
+    def to_yiq(self) -> ColorArray:
+        """Convert every color to yiq."""
+        return self.to("yiq")
+
+    def to_oklab(self) -> ColorArray:
+        """Convert every color to oklab."""
+        return self.to("oklab")
+
+    def rgb(self) -> list[tuple[int, int, int]]:
+        """The rgb value of every color, rounded and clamped to 0-255."""
+        values = self.to("rgb")._values
+        return [
+            (_clamp(values[index]), _clamp(values[index + 1]), _clamp(values[index + 2]))
+            for index in range(0, len(values), 3)
+        ]
+
+    def to_hex(self) -> list[str]:
+        """The hex code of every color, `#ead1a8`."""
+        return ["#{:02x}{:02x}{:02x}".format(*color) for color in self.rgb()]
+
+    def fg_sgr(self, depth: int = ColorDepth.TRUECOLOR) -> list[str]:
+        """The foreground escape sequence of every color.
+
+        Args:
+            depth (int): The `ColorDepth` to write the colors for. Colors are mapped to the
+            closest xterm or system color for 256 and 16 colors.
+        """
+        return self.__sgr(38, depth)
+
+    def bg_sgr(self, depth: int = ColorDepth.TRUECOLOR) -> list[str]:
+        """The background escape sequence of every color.
+
+        Args:
+            depth (int): The `ColorDepth` to write the colors for. Colors are mapped to the
+            closest xterm or system color for 256 and 16 colors.
+        """
+        return self.__sgr(48, depth)
+
+    def __sgr(self, base: int, depth: int) -> list[str]:
+        colors = self.rgb()
+        if depth <= ColorDepth.NONE:
+            return [""] * len(colors)
+        if depth > ColorDepth.XTERM256:
+            prefix = f"\x1b[{base};2;"
+            return [f"{prefix}{r};{g};{b}m" for r, g, b in colors]
+        if depth == ColorDepth.XTERM256:
+            prefix = f"\x1b[{base};5;"
+            return [f"{prefix}{rgb_to_xterm(r, g, b)}m" for r, g, b in colors]
+
+        sequences = []
+        for color in colors:
+            index = rgb_to_ansi16(*color)
+            code = base - 8 + index if index < 8 else base + 44 + index
+            sequences.append(f"\x1b[{code}m")
+        return sequences
+
+    def __len__(self) -> int:
+        return len(self._values) // 3
+
+    def __getitem__(self, index: int) -> Channels:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("ColorArray index out of range")
+        start = index * 3
+        return tuple(self._values[start : start + 3])
+
+    def __iter__(self) -> Iterator[Channels]:
+        values = self._values
+        for index in range(0, len(values), 3):
+            yield (values[index], values[index + 1], values[index + 2])
+
+    def __repr__(self) -> str:
+        return f"<ColorArray: {len(self)} {self._space} colors>"
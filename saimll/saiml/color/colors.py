@@ -1,29 +1,148 @@
 from __future__ import annotations
-from functools import cached_property
+from functools import lru_cache
 
 from typing import Optional, overload
-from re import match
+from re import compile as re_compile
 import colorsys
 
-from saimll.saiml.markup import SAIML
+from saimll.saiml.markup.backends import ColorDepth
+from saimll.saiml.markup.formatting import RESET
+from saimll.saiml.markup.palette import downsample, rgb_to_ansi16, rgb_to_xterm
 
 from .xterm_colors import XTERM_COLORS
+from .xterm_index import suggest_xterm_name, xterm_code, xterm_name
 
 
 __all__ = ["Color"]
 
+COLOR_CACHE_SIZE = 4096
+"""The number of recently created colors that are shared instead of created again."""
+
+HEX_DIGITS = re_compile(r"[0-9a-fA-F]+")
+
+
+@lru_cache(maxsize=COLOR_CACHE_SIZE, typed=True)
+def _shared(cls: type, *values) -> ColorBase:
+    """Create a color, or get the instance already created with the same values. Values are
+    compared by type too, so `RGB(1.0, 2, 3)` keeps its float instead of sharing `RGB(1, 2, 3)`."""
+    return cls._create(*values)
+
+
+@lru_cache(maxsize=COLOR_CACHE_SIZE)
+def _sgr_params(color: ColorBase) -> str:
+    """The SGR parameters of a color after the 38 or 48 that selects fg or bg, `2;234;209;168`
+    or `5;9`."""
+    return color._params()
+
 
 class ColorBase:
-    """Base class for a color"""
+    """Base class for a color.
+
+    Colors are immutable and hashable. Creating a color with the same values as a recently
+    created color returns the same instance, so colors kept in many places share their memory and
+    their converted rgb value.
+    """
+
+    __slots__ = ()
+
+    _fields: tuple[str, ...] = ()
+    """The attributes that make up the color, in the order they are passed when creating it."""
+
+    @classmethod
+    def _create(cls, *values) -> ColorBase:
+        """Validate the values and create a new instance. Only called when there isn't a shared
+        instance."""
+        return cls._build(*values)
+
+    @classmethod
+    def _build(cls, *values) -> ColorBase:
+        color = object.__new__(cls)
+        for name, value in zip(cls._fields, values):
+            object.__setattr__(color, name, value)
+        return color
+
+    def _values(self) -> tuple:
+        return tuple(getattr(self, name) for name in self._fields)
 
     def as_str(self) -> str:
         """Stringify the color representation."""
         return f"{self.__class__.__name__}()"
 
     def rgb(self) -> tuple[int, int, int]:
-        """Get the rgb values as a tuple."""
+        """Get the rgb values as a tuple. The values are converted once and kept by the color."""
+        try:
+            return self._rgb
+        except AttributeError:
+            rgb = self._convert()
+            object.__setattr__(self, "_rgb", rgb)
+            return rgb
+
+    def _convert(self) -> tuple[int, int, int]:
+        """Convert the color to rgb values."""
         return (0, 0, 0)
 
+    def to_xterm(self, perceptual: bool = False) -> Color.XTERM:
+        """Get the closest xterm color from the 6x6x6 color cube or grayscale ramp, codes 16-255.
+        The system colors, 0-15, are skipped as they vary between terminals.
+
+        Args:
+            perceptual (bool): Find the color that looks the closest instead of the color with
+            the closest rgb values.
+        """
+        return Color.XTERM(rgb_to_xterm(*self.__clamped(), perceptual))
+
+    def to_ansi16(self, perceptual: bool = False) -> Color.XTERM:
+        """Get the closest of the 16 system colors, xterm codes 0-15.
+
+        Args:
+            perceptual (bool): Find the color that looks the closest instead of the color with
+            the closest rgb values.
+        """
+        return Color.XTERM(rgb_to_ansi16(*self.__clamped(), perceptual))
+
+    def __clamped(self) -> tuple[int, int, int]:
+        """The rgb values rounded and clamped to 0-255. Lossy colors, like yiq, can go past."""
+        return tuple(min(max(round(channel), 0), 255) for channel in self.rgb())
+
+    def _params(self) -> str:
+        return "2;{};{};{}".format(*self.__clamped())
+
+    def fg_code(self) -> str:
+        """The SGR parameters that set the foreground to the color, `38;2;234;209;168`. This is
+        the color code used by color tokens."""
+        return f"38;{_sgr_params(self)}"
+
+    def bg_code(self) -> str:
+        """The SGR parameters that set the background to the color, `48;2;234;209;168`. This is
+        the color code used by color tokens."""
+        return f"48;{_sgr_params(self)}"
+
+    def fg_sgr(self, depth: int = ColorDepth.TRUECOLOR) -> str:
+        """The escape sequence that sets the foreground to the color.
+
+        Args:
+            depth (int): The `ColorDepth` to write the color for. The color is mapped to the
+            closest xterm or system color for 256 and 16 colors.
+        """
+        return self.__sgr(38, depth)
+
+    def bg_sgr(self, depth: int = ColorDepth.TRUECOLOR) -> str:
+        """The escape sequence that sets the background to the color.
+
+        Args:
+            depth (int): The `ColorDepth` to write the color for. The color is mapped to the
+            closest xterm or system color for 256 and 16 colors.
+        """
+        return self.__sgr(48, depth)
+
+    def __sgr(self, base: int, depth: int) -> str:
+        if depth <= ColorDepth.NONE:
+            return ""
+        code = f"{base};{_sgr_params(self)}"
+        if depth <= ColorDepth.XTERM256:
+            code = downsample(code, depth)
+        return f"\x1b[{code}m"
+
     def encode(self, *args: str) -> str:
         """Convert the color to a ansi code and return a formatted string with that color.
         This is usefull if you want to output the color to a terminal.
@@ -33,8 +152,26 @@ class ColorBase:
             text = text.format(color=str(self))
         except Exception as exception:  # pylint: disable=unused-variable,broad-except
             pass
-        r, g, b = self.rgb()
-        return SAIML.parse(f"[@F {r},{g},{b}]{text}")
+        return f"{self.fg_sgr()}{text}{RESET}"
+
+    def __setattr__(self, name: str, value) -> None:
+        raise AttributeError(f"Color.{type(self).__name__} is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"Color.{type(self).__name__} is immutable")
+
+    def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
+        if type(other) is not type(self):
+            return NotImplemented
+        return self._values() == other._values()
+
+    def __hash__(self) -> int:
+        return hash((type(self), self._values()))
+
+    def __reduce__(self):
+        return (type(self), self._values())
 
     def __str__(self) -> str:
         return self.as_str()
@@ -58,34 +195,35 @@ class Color:
         blue: int
         """Amount of blue in the color from 0 to 255."""
 
+        __slots__ = ("red", "green", "blue", "_alpha")
+        _fields = __slots__
+
         @overload
-        def __init__(self, color: int, alpha: Optional[int] = 1):
+        def __new__(cls, color: int, alpha: Optional[int] = 1):
             ...
 
-        def __init__(
-            self,
+        def __new__(
+            cls,
             red: int,
             green: Optional[int] = None,
             blue: Optional[int] = None,
             alpha: Optional[int] = 1,
-        ) -> None:
+        ) -> Color.RGB:
             if red is not None and green is None and blue is None:
                 if red < 0 or red > 255:
                     raise ValueError("RGB value must be from 0 to 255.")
-                self.red = red
-                self.blue = red
-                self.green = red
-            else:
-                if red < 0 or red > 255:
-                    raise ValueError("Red value must be from 0 to 255.")
-                self.red = red or 0
-                if green < 0 or green > 255:
-                    raise ValueError("Green value must be from 0 to 255.")
-                self.green = green or 0
-                if blue < 0 or blue > 255:
-                    raise ValueError("Blue value must be from 0 to 255.")
-                self.blue = blue or 0
-            self._alpha = alpha
+                return _shared(cls, red, red, red, alpha)
+            return _shared(cls, red, green, blue, alpha)
+
+        @classmethod
+        def _create(cls, red: int, green: int, blue: int, alpha: Optional[int]) -> Color.RGB:
+            if red < 0 or red > 255:
+                raise ValueError("Red value must be from 0 to 255.")
+            if green < 0 or green > 255:
+                raise ValueError("Green value must be from 0 to 255.")
+            if blue < 0 or blue > 255:
+                raise ValueError("Blue value must be from 0 to 255.")
+            return cls._build(red or 0, green or 0, blue or 0, alpha)
 
         @property
         def r(self) -> int:
@@ -147,7 +285,7 @@ class Color:
             return (r / 255, g / 255, b / 255)
 
         def rgb(self) -> tuple[int, int, int]:
-            return (self.r, self.g, self.b)
+            return (self.red, self.green, self.blue)
 
         def as_str(self) -> str:
             """Stringify the color representation."""
@@ -159,15 +297,21 @@ class Color:
         value: str
         """Hex code."""
 
-        def __init__(self, code: str) -> None:
-            code = code.strip().lstrip("#")
+        __slots__ = ("value", "_rgb")
+        _fields = ("value",)
+
+        def __new__(cls, code: str) -> Color.HEX:
+            return _shared(cls, code.strip().lstrip("#"))
+
+        @classmethod
+        def _create(cls, code: str) -> Color.HEX:
             if len(code) != 3 and len(code) != 6:
                 raise ValueError("Hex codes must be either 3 or 6 in length.")
 
-            if not all(match(r"[0-9a-fA-F]{3,6}", code) is not None for val in code):
+            if HEX_DIGITS.fullmatch(code) is None:
                 raise ValueError("Hex values must be 0-9 and A-F")
 
-            self.value = code
+            return cls._build(code)
 
         @property
         def code(self) -> str:
@@ -178,7 +322,7 @@ class Color:
             """Convert from hex to rgb."""
             return Color.RGB(*self.rgb())
 
-        def rgb(self) -> tuple[int, int, int]:
+        def _convert(self) -> tuple[int, int, int]:
             code = self.value
             if len(self.value) == 3:
                 code = "".join([f"{val}{val}" for val in self.value])
@@ -206,22 +350,27 @@ class Color:
         lightness: float
         """Lightness of the color as a percent. 0% is black, 100% is white."""
 
-        def __init__(self, h: int, s: float, l: float) -> None:
+        __slots__ = ("hue", "saturation", "lightness", "_rgb")
+        _fields = ("hue", "saturation", "lightness")
+
+        def __new__(cls, h: int, s: float, l: float) -> Color.HSL:
+            return _shared(cls, h, s, l)
+
+        @classmethod
+        def _create(cls, h: int, s: float, l: float) -> Color.HSL:
             if h < 0 or h > 360:
                 raise ValueError(f"Hue must be a degree from 0 to 360: was {h}")
-            self.hue = h
 
             if s > 1 or s < 0:
                 raise ValueError(
                     f"Saturation must be a percentage from 0.0 to 1.0: was {s}"
                 )
-            self.saturation = s
 
             if l > 1 or l < 0:
                 raise ValueError(
                     f"Lightness must be a percentage from 0.0 to 1.0: was {l}"
                 )
-            self.lightness = l
+            return cls._build(h, s, l)
 
         @property
         def h(self) -> int:
@@ -244,7 +393,7 @@ class Color:
             """Convert from hsl to rgb."""
             return Color.RGB(*self.rgb())
 
-        def rgb(self) -> tuple[int, int, int]:
+        def _convert(self) -> tuple[int, int, int]:
             return tuple(
                 round(i * 255)
                 for i in colorsys.hls_to_rgb(self.h / 360, self.l, self.s)
@@ -266,22 +415,27 @@ class Color:
         value: float
         """Brightness of the color as a percent. 0% is black, 100% is white."""
 
-        def __init__(self, h: int, s: float, v: float) -> None:
+        __slots__ = ("hue", "saturation", "value", "_rgb")
+        _fields = ("hue", "saturation", "value")
+
+        def __new__(cls, h: int, s: float, v: float) -> Color.HSV:
+            return _shared(cls, h, s, v)
+
+        @classmethod
+        def _create(cls, h: int, s: float, v: float) -> Color.HSV:
             if h < 0 or h > 360:
                 raise ValueError(f"Hue must be a degree from 0 to 360: was {h}")
-            self.hue = h
 
             if s > 1 or s < 0:
                 raise ValueError(
                     f"Saturation must be a percentage from 0.0 to 1.0: was {s}"
                 )
-            self.saturation = s
 
             if v > 1 or v < 0:
                 raise ValueError(
                     f"Lightness must be a percentage from 0.0 to 1.0: was {v}"
                 )
-            self.value = v
+            return cls._build(h, s, v)
 
         @property
         def h(self) -> int:
@@ -304,7 +458,7 @@ class Color:
             """Convert from hsl to rgb."""
             return Color.RGB(*self.rgb())
 
-        def rgb(self) -> tuple[int, int, int]:
+        def _convert(self) -> tuple[int, int, int]:
             return tuple(
                 round(i * 255)
                 for i in colorsys.hsv_to_rgb(self.h / 360, self.s, self.v)
@@ -327,22 +481,27 @@ class Color:
         quadrature: int
         """purple to green value of the color."""
 
-        def __init__(self, y: float, i: float, q: float) -> None:
+        __slots__ = ("luminance", "in_phase", "quadrature", "_rgb")
+        _fields = ("luminance", "in_phase", "quadrature")
+
+        def __new__(cls, y: float, i: float, q: float) -> Color.YIQ:
+            return _shared(cls, y, i, q)
+
+        @classmethod
+        def _create(cls, y: float, i: float, q: float) -> Color.YIQ:
             if y < 0 or y > 1:
                 raise ValueError(f"Luminance must be a value from 0 to 1: was {y}")
-            self.luminance = y
 
             if i < -0.523 or i > 0.523:
                 raise ValueError(
                     f"in_phase must be a value from -0.523 to 0.523: was {i}"
                 )
-            self.in_phase = i
 
             if q < -0.596 or q > 0.596:
                 raise ValueError(
                     f"quadrature must be a value from -0.596 to 0.596: was {q}"
                 )
-            self.quadrature = q
+            return cls._build(y, i, q)
 
         @property
         def y(self) -> int:
@@ -363,7 +522,7 @@ class Color:
             """Convert from yiq to rgb."""
             return Color.RGB(*self.rgb())
 
-        def rgb(self) -> tuple[int, int, int]:
+        def _convert(self) -> tuple[int, int, int]:
             return tuple(
                 round(i * 255) for i in colorsys.yiq_to_rgb(self.y, self.i, self.q)
             )
@@ -374,54 +533,62 @@ class Color:
     class XTERM(ColorBase):
         """Xterm representation of a color. 256 colors."""
 
-        def __init__(self, color: int | str) -> None:
-            self.value = None
+        value: int
+        """The color code from 0 to 255."""
 
-            if isinstance(color, int):
-                if color < 0 or color > 255:
-                    raise ValueError("Xterm color must be between 0 and 255")
-                self.value = color
+        __slots__ = ("value",)
+        _fields = __slots__
 
-            longest_match = ""
+        def __new__(cls, color: int | str) -> Color.XTERM:
             if isinstance(color, str):
-                for xterm in XTERM_COLORS:
-                    if xterm[1].lower() == color.lower():
-                        self.value = xterm[0]
-                    else:
-                        matching = ""
-                        for c1, c2 in zip(color.lower(), xterm[1].lower()):
-                            if c1 != c2:
-                                break
-                            matching += c1
-
-                        if len(matching) > len(longest_match):
-                            longest_match = matching
-
-                if self.value is None:
+                code = xterm_code(color)
+                if code is None:
+                    suggestion = suggest_xterm_name(color)
                     raise ValueError(
-                        f"Invalid xterm color name {color!r}. Did you mean {longest_match!r}"
+                        f"Invalid xterm color name {color!r}."
+                        + (f" Did you mean {suggestion!r}" if suggestion is not None else "")
                     )
+                color = code
+            return _shared(cls, color)
 
-            if self.value is None:
+        @classmethod
+        def _create(cls, color: int) -> Color.XTERM:
+            if not isinstance(color, int):
                 raise ValueError(f"Invalid xterm color code: was {color}")
+            if color < 0 or color > 255:
+                raise ValueError("Xterm color must be between 0 and 255")
+            return cls._build(color)
 
         @property
         def code(self) -> int:
             """The color code of the xterm color. Readonly."""
             return self.value
 
-        @cached_property
+        @property
         def name(self) -> str:
             """The name of the xterm color."""
-            return XTERM_COLORS[self.code][1]
+            return xterm_name(self.code)
 
         def to_rgb(self) -> Color.RGB:
             """Convert from xterm to rgb."""
             return Color.RGB(*XTERM_COLORS[self.code][2])
 
+        def to_xterm(self, perceptual: bool = False) -> Color.XTERM:
+            if self.code >= 16:
+                return self
+            return super().to_xterm(perceptual)
+
+        def to_ansi16(self, perceptual: bool = False) -> Color.XTERM:
+            if self.code < 16:
+                return self
+            return super().to_ansi16(perceptual)
+
         def rgb(self) -> tuple[int, int, int]:
             return XTERM_COLORS[self.code][2]
 
+        def _params(self) -> str:
+            return f"5;{self.code}"
+
         def as_str(self) -> str:
             return f"xterm({self.code})"
 
@@ -0,0 +1,110 @@
+"""Lookups over the names of the xterm colors.
+
+The index is built from `XTERM_COLORS` the first time a name is looked up. Names are case
+insensitive and names with alternatives, like `Magenta/Fuchsia`, can also be looked up by each
+alternative, `magenta` or `fuchsia`. Suggestions for unknown names come from a sorted list of the
+names, where the closest names are next to where the unknown name would be inserted.
+"""
+from __future__ import annotations
+
+from bisect import bisect_left
+from functools import lru_cache
+from re import compile as re_compile
+from typing import Optional
+
+from .xterm_colors import XTERM_COLORS
+
+__all__ = [
+    "xterm_code",
+    "xterm_name",
+    "suggest_xterm_name",
+]
+
+NUMBERED = re_compile(r"(.*?)(\d*)")
+"""Splits a name into its base and trailing number, `Cyan/Aqua1` into `Cyan/Aqua` and `1`."""
+
+
+@lru_cache(maxsize=1)
+def _index() -> tuple[dict[str, int], list[str], list[str]]:
+    """The code of each lowercase name, the sorted lowercase names, and the names they came from."""
+    codes: dict[str, int] = {}
+    names: dict[str, str] = {}
+    for code, name, _ in XTERM_COLORS:
+        key = name.lower()
+        codes[key] = code
+        names[key] = name
+
+    for code, name, _ in XTERM_COLORS:
+        base, number = NUMBERED.fullmatch(name).groups()
+        if "/" in base:
+            for alternative in base.split("/"):
+                key = f"{alternative}{number}".lower()
+                if key not in codes:
+                    codes[key] = code
+                    names[key] = f"{alternative}{number}"
+
+    keys = sorted(names)
+    return codes, keys, [names[key] for key in keys]
+
+
+def xterm_code(name: str) -> Optional[int]:
+    """The code of a named xterm color.
+
+    Args:
+        name (str): The case insensitive name of the color
+
+    Returns:
+        int | None: The code from 0 to 255 or None if there is no color with the name
+    """
+    return _index()[0].get(name.lower())
+
+
+def xterm_name(code: int) -> str:
+    """The name of an xterm color.
+
+    Args:
+        code (int): The code from 0 to 255
+
+    Returns:
+        str: The name of the color
+    """
+    return XTERM_COLORS[code][1]
+
+
+def _common(first: str, second: str) -> int:
+    length = 0
+    for a, b in zip(first, second):
+        if a != b:
+            break
+        length += 1
+    return length
+
+
+def suggest_xterm_name(name: str) -> Optional[str]:
+    """The color name that shares the longest prefix with the given name, for "did you mean"
+    messages. Finding it is a binary search of the sorted names.
+
+    Args:
+        name (str): The unknown name
+
+    Returns:
+        str | None: The closest name or None if no name starts with the same character
+    """
+    _, keys, names = _index()
+    key = name.lower()
+    index = bisect_left(keys, key)
+
+    best, length = None, 0
+    for neighbor in (index - 1, index):
+        if 0 <= neighbor < len(keys):
+            common = _common(key, keys[neighbor])
+            if common > length:
+                best, length = neighbor, common
+    if best is None:
+        return None
+
+    # Prefer the shared prefix when it is a name itself, `Bluee` suggests `Blue`
+    prefix = bisect_left(keys, key[:length])
+    if keys[prefix] == key[:length]:
+        best = prefix
+    return names[best]
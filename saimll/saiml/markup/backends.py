@@ -0,0 +1,281 @@
+"""Render targets for parsed SAIML markup.
+
+The parser turns markup into tokens once. A backend turns those tokens into the final output.
+The ansi backends write SGR sequences for truecolor, 256 color, or 16 color terminals, the plain
+backend only writes the text, and the html backend writes styled `<span>` elements.
+
+Backends are selected by name, `"ansi"`, `"truecolor"`, `"256"`, `"16"`, `"plain"`, or `"html"`,
+or by passing a `Backend` instance. New backends can be added with `register_backend`.
+"""
+from __future__ import annotations
+
+from re import compile as re_compile
+from typing import Optional, Union
+
+from .emitter import ColorMap, Style, emit
+from .palette import code_rgb, downsample
+from .stream import ParseState
+from .tokens import Op, Token
+
+__all__ = [
+    "ColorDepth",
+    "Backend",
+    "AnsiBackend",
+    "PlainBackend",
+    "HtmlBackend",
+    "BACKENDS",
+    "get_backend",
+    "register_backend",
+    "depth_backend",
+]
+
+def html_escape(text: str, quote: bool = True) -> str:
+    """Escape `&`, `<`, and `>`, and quotes if `quote` is True, for html. Avoids importing the
+    html module and its entity tables."""
+    text = text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+    if quote:
+        text = text.replace('"', "&quot;").replace("'", "&#x27;")
+    return text
+
+
+ANSI_SEQUENCE = re_compile(r"\x1b\[[0-9;]*m|\x1b\]8;;.*?\x1b\\")
+"""Matches SGR and hyperlink sequences. Used to remove ansi from the output of function macros."""
+
+
+class ColorDepth:
+    """The number of colors a render target can display."""
+
+    NONE: int = 0
+    ANSI16: int = 16
+    XTERM256: int = 256
+    TRUECOLOR: int = 1 << 24
+
+
+class Backend:
+    """Base class for render targets. A backend renders the tokens of parsed markup into a
+    string. The style, open function macro, and anything else the backend needs between chunks of
+    a stream is kept in the `ParseState`.
+    """
+
+    name: str = ""
+    escapes: bool = False
+    """Whether plain text is changed when it is written, like html escaping `<` and `>`."""
+
+    def render(self, tokens: list[Token], state: ParseState, final: bool = True) -> str:
+        """Render tokens into the backends output format.
+
+        Args:
+            tokens (list[Token]): The tokens generated from parsing the SAIML markup
+            state (ParseState): The state carried between chunks of markup
+            final (bool): Whether these are the last tokens
+
+        Returns:
+            str: The rendered string
+        """
+        raise NotImplementedError
+
+    def escape(self, text: str) -> str:
+        """Prepare plain text to be written in the backends output format.
+
+        Args:
+            text (str): The plain text
+
+        Returns:
+            str: The text as it is written by the backend
+        """
+        return text
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__}: {self.name}>"
+
+
+class AnsiBackend(Backend):
+    """Render markup as ansi escape sequences. Colors that the terminal can't display are mapped
+    to the closest color that it can.
+    """
+
+    def __init__(self, depth: int = ColorDepth.TRUECOLOR) -> None:
+        self.depth: int = depth
+        self.name = "ansi" if depth > ColorDepth.XTERM256 else str(depth)
+        self._colors: Optional[ColorMap] = None
+        if depth <= ColorDepth.XTERM256:
+            self._colors = lambda code: downsample(code, depth)
+
+    def render(self, tokens: list[Token], state: ParseState, final: bool = True) -> str:
+        return emit(tokens, state, final, self._colors)
+
+
+class PlainBackend(Backend):
+    """Render only the text of the markup. All formatting is dropped, including any ansi written
+    by function macros.
+    """
+
+    name = "plain"
+
+    def render(self, tokens: list[Token], state: ParseState, final: bool = True) -> str:
+        func = state.func
+        output = []
+
+        for token in tokens:
+            op = token.op
+            if op == Op.TEXT:
+                text = token.value
+                if func is not None:
+                    if state.stats is None:
+                        text, func = func.exec(text), None
+                    else:
+                        text, func = state.stats.call(func, text), None
+                    if not isinstance(text, str):
+                        continue
+                    text = ANSI_SEQUENCE.sub("", text)
+                output.append(text)
+            elif op == Op.FUNC:
+                func = token
+            elif op == Op.RESET:
+                func = None
+
+        state.func = func
+        return "".join(output)
+
+
+class HtmlBackend(Backend):
+    """Render markup as html. Each run of text with the same style is wrapped in a single
+    `<span>` with inline css and hyperlinks become `<a>` elements. Text is html escaped and ansi
+    written by function macros is removed.
+    """
+
+    name = "html"
+    escapes = True
+
+    def render(self, tokens: list[Token], state: ParseState, final: bool = True) -> str:
+        style = state.style
+        current = state.terminal
+        func = state.func
+        output = []
+
+        for token in tokens:
+            op = token.op
+            if op == Op.TEXT:
+                text = token.value
+                if func is not None:
+                    if state.stats is None:
+                        text, func = func.exec(text), None
+                    else:
+                        text, func = state.stats.call(func, text), None
+                    if not isinstance(text, str):
+                        continue
+                    text = ANSI_SEQUENCE.sub("", text)
+                if len(text) > 0:
+                    self.__sync(output, style, current)
+                    output.append(html_escape(text, quote=False))
+            elif op == Op.FUNC:
+                func = token
+            else:
+                if op == Op.RESET:
+                    func = None
+                style.apply(token)
+
+        if final:
+            style.reset()
+            style.link = None
+            self.__sync(output, style, current)
+
+        state.func = func
+        return "".join(output)
+
+    def escape(self, text: str) -> str:
+        return html_escape(text, quote=False)
+
+    @staticmethod
+    def __css(style: Style) -> str:
+        css = []
+        for prop, code in (("color", style.fg), ("background-color", style.bg)):
+            rgb = None if code is None else code_rgb(code)
+            if rgb is not None:
+                css.append("{}:#{:02x}{:02x}{:02x}".format(prop, *rgb))
+        if style.bold:
+            css.append("font-weight:bold")
+        if style.underline:
+            css.append("text-decoration:underline")
+        return ";".join(css)
+
+    def __sync(self, output: list[str], style: Style, current: Style) -> None:
+        """Close and open elements so the output matches the requested style."""
+        css = self.__css(style)
+        opened = self.__css(current)
+        if css == opened and style.link == current.link:
+            return
+
+        if opened:
+            output.append("</span>")
+        if style.link != current.link:
+            if current.link is not None:
+                output.append("</a>")
+            if style.link is not None:
+                output.append(f'<a href="{html_escape(style.link)}">')
+        if css:
+            output.append(f'<span style="{css}">')
+
+        current.update(style)
+        current.link = style.link
+
+
+BACKENDS: dict[str, Backend] = {
+    "ansi": AnsiBackend(ColorDepth.TRUECOLOR),
+    "256": AnsiBackend(ColorDepth.XTERM256),
+    "16": AnsiBackend(ColorDepth.ANSI16),
+    "plain": PlainBackend(),
+    "html": HtmlBackend(),
+}
+"""The registered backends by name."""
+BACKENDS["truecolor"] = BACKENDS["ansi"]
+
+
+def register_backend(name: str, backend: Backend) -> None:
+    """Register a backend so it can be selected by name.
+
+    Args:
+        name (str): The name used to select the backend
+        backend (Backend): The backend
+    """
+    BACKENDS[name.lower()] = backend
+
+
+def get_backend(backend: Union[str, Backend]) -> Backend:
+    """Get a registered backend by name. Backend instances are returned as is.
+
+    Args:
+        backend (str | Backend): The name of the backend or a backend
+
+    Raises:
+        ValueError: If there is no backend with the given name
+
+    Returns:
+        Backend: The backend
+    """
+    if isinstance(backend, Backend):
+        return backend
+    try:
+        return BACKENDS[str(backend).lower()]
+    except KeyError:
+        raise ValueError(
+            f"Unknown backend {backend!r}, expected one of {', '.join(BACKENDS)}"
+        ) from None
+
+
+def depth_backend(depth: int) -> Backend:
+    """Get the registered backend for a color depth. A depth of `ColorDepth.NONE` is plain text.
+
+    Args:
+        depth (int): A `ColorDepth`
+
+    Returns:
+        Backend: The backend that renders the most colors the depth can display
+    """
+    if depth <= ColorDepth.NONE:
+        return BACKENDS["plain"]
+    if depth < ColorDepth.XTERM256:
+        return BACKENDS["16"]
+    if depth < ColorDepth.TRUECOLOR:
+        return BACKENDS["256"]
+    return BACKENDS["ansi"]
@@ -0,0 +1,371 @@
+"""Compiled SAIML markup and the LRU cache that sits behind `SAIML.parse`.
+
+Parsing a markup string is deterministic for a given set of function macros, so the result of
+parsing can be kept and reused. A `CompiledMarkup` holds the optimized tokens of a markup string
+along with its rendered ansi value, and `MarkupCache` keeps the most recently used compiled
+markup bounded by both an entry count and a byte budget.
+"""
+from __future__ import annotations
+
+from collections import OrderedDict
+from sys import getsizeof
+from threading import Lock
+from typing import Iterable, NamedTuple, Optional
+
+from .backends import BACKENDS, Backend
+from .stream import ParseState
+from .tokens import Token
+
+__all__ = [
+    "CompiledMarkup",
+    "MarkupCache",
+    "CacheInfo",
+]
+
+
+class CompiledMarkup:
+    """A SAIML markup string that has already been parsed. It can be rendered any number of times
+    without being parsed again.
+
+    The value is rendered by the backend of the parser that compiled it. Rendering with another
+    backend renders the tokens once and keeps the result.
+
+    Markup that calls a function macro that isn't pure is dynamic. Only its tokens are kept and
+    it is rendered again every time so the function is called again.
+    """
+
+    def __init__(
+        self,
+        markup: str,
+        tokens: list[Token],
+        value: str,
+        funcs: Iterable[str] = (),
+        backend: Optional[Backend] = None,
+        dynamic: bool = False,
+    ):
+        self._markup: str = markup
+        self._tokens: list[Token] = tokens
+        self._value: str = value
+        self._funcs: frozenset[str] = frozenset(funcs)
+        self._backend: Backend = BACKENDS["ansi"] if backend is None else backend
+        self._dynamic: bool = dynamic
+        self._renders: dict[Backend, str] = {}
+        self._width: Optional[int] = None
+        self._size: int = (
+            getsizeof(markup)
+            + getsizeof(value)
+            + getsizeof(tokens)
+            + sum(getsizeof(token) for token in tokens)
+        )
+        self._owner: Optional[MarkupCache] = None
+
+    @property
+    def markup(self) -> str:
+        """The SAIML markup string that was compiled."""
+        return self._markup
+
+    @property
+    def tokens(self) -> list[Token]:
+        """The optimized tokens generated from the markup."""
+        return self._tokens
+
+    @property
+    def funcs(self) -> frozenset[str]:
+        """The names of the function macros referenced by the markup."""
+        return self._funcs
+
+    @property
+    def dynamic(self) -> bool:
+        """True if the markup is rendered again every time because it calls a function macro that
+        isn't pure."""
+        return self._dynamic
+
+    @property
+    def size(self) -> int:
+        """Approximate number of bytes held by the markup, its tokens, and every rendered value,
+        including the values rendered with other backends."""
+        return self._size
+
+    def render(self, backend: Optional[Backend] = None) -> str:
+        """The rendered string of the compiled markup.
+
+        Args:
+            backend (Backend, optional): The backend to render with. Defaults to the backend the
+            markup was compiled with.
+
+        Returns:
+            str: The rendered string
+        """
+        if self._dynamic:
+            backend = self._backend if backend is None else backend
+            return backend.render(self._tokens, ParseState())
+        if backend is None or backend is self._backend:
+            return self._value
+
+        value = self._renders.get(backend)
+        if value is None:
+            value = self._renders[backend] = backend.render(self._tokens, ParseState())
+            if self._owner is None:
+                self._size += getsizeof(value)
+            else:
+                self._owner._grow(self, getsizeof(value))
+        return value
+
+    def visible_width(self) -> int:
+        """The number of columns the text of the markup takes in a terminal."""
+        if self._width is None:
+            from .width import tokens_width
+
+            self._width = tokens_width(self._tokens)
+        return self._width
+
+    def slice(self, start: int = 0, stop: Optional[int] = None) -> str:
+        """Render the text between the start and stop columns. Formatting that applies to the
+        kept text is kept.
+
+        Args:
+            start (int): The first column to keep
+            stop (int, optional): The column to stop at. Defaults to the end of the text.
+
+        Returns:
+            str: The rendered slice
+        """
+        from .width import slice_tokens
+
+        return self._backend.render(slice_tokens(self._tokens, start, stop), ParseState())
+
+    def truncate(self, width: int, ellipsis: str = "…") -> str:
+        """Render the markup shortened to fit in the given width. The ellipsis is added where
+        the text was cut and takes the style of the text it replaces.
+
+        Args:
+            width (int): The maximum width
+            ellipsis (str): Text added to show the text was cut. Defaults to `…`
+
+        Returns:
+            str: The rendered markup that fits in the width. When the ellipsis is wider than the
+            width only the formatting is rendered.
+        """
+        if self.visible_width() <= width:
+            return self.render()
+
+        from .width import slice_tokens, text_width
+
+        stop = width - text_width(ellipsis)
+        if stop < 0:
+            stop, ellipsis = 0, ""
+        return self._backend.render(
+            slice_tokens(self._tokens, 0, stop, ellipsis), ParseState()
+        )
+
+    def ljust(self, width: int, fill: str = " ") -> str:
+        """Render the markup left aligned in the given width.
+
+        Args:
+            width (int): The width to pad to
+            fill (str): The one column wide character to pad with
+
+        Returns:
+            str: The padded rendered markup
+        """
+        return self.__pad(width, "<", fill)
+
+    def rjust(self, width: int, fill: str = " ") -> str:
+        """Render the markup right aligned in the given width.
+
+        Args:
+            width (int): The width to pad to
+            fill (str): The one column wide character to pad with
+
+        Returns:
+            str: The padded rendered markup
+        """
+        return self.__pad(width, ">", fill)
+
+    def center(self, width: int, fill: str = " ") -> str:
+        """Render the markup centered in the given width.
+
+        Args:
+            width (int): The width to pad to
+            fill (str): The one column wide character to pad with
+
+        Returns:
+            str: The padded rendered markup
+        """
+        return self.__pad(width, "^", fill)
+
+    def __pad(self, width: int, align: str, fill: str) -> str:
+        from .width import pad
+
+        left, right = pad(self.visible_width(), width, align, self._backend.escape(fill))
+        return left + self.render() + right
+
+    def __str__(self) -> str:
+        return self.render()
+
+    def __repr__(self) -> str:
+        return f"<CompiledMarkup: {self._markup!r}>"
+
+
+class CacheInfo(NamedTuple):
+    """Snapshot of the state of a `MarkupCache`."""
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+    maxbytes: int
+    currbytes: int
+
+
+class MarkupCache:
+    """Least recently used cache of compiled markup.
+
+    The cache is bounded by the number of entries, `maxsize`, and by the approximate number of
+    bytes held by the cached markup, `maxbytes`. Whichever limit is reached first causes the
+    least recently used entries to be evicted. A `maxsize` of `0` disables the cache.
+    """
+
+    def __init__(self, maxsize: int = 1024, maxbytes: int = 4 * 1024 * 1024) -> None:
+        self._entries: OrderedDict[str, CompiledMarkup] = OrderedDict()
+        self._by_func: dict[str, set[str]] = {}
+        self._lock = Lock()
+        self._maxsize = maxsize
+        self._maxbytes = maxbytes
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def maxsize(self) -> int:
+        """Maximum number of entries in the cache."""
+        return self._maxsize
+
+    @property
+    def maxbytes(self) -> int:
+        """Maximum number of bytes held by the entries in the cache."""
+        return self._maxbytes
+
+    def get(self, markup: str) -> Optional[CompiledMarkup]:
+        """Get the compiled version of the markup if it is cached.
+
+        Args:
+            markup (str): The SAIML markup string
+
+        Returns:
+            CompiledMarkup | None: The cached compiled markup or None if it isn't cached
+        """
+        with self._lock:
+            compiled = self._entries.get(markup)
+            if compiled is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(markup)
+            self.hits += 1
+            return compiled
+
+    def put(self, compiled: CompiledMarkup) -> None:
+        """Add compiled markup to the cache evicting the least recently used entries if the cache
+        is full.
+
+        Args:
+            compiled (CompiledMarkup): The compiled markup to cache
+        """
+        size = compiled.size
+        if self._maxsize <= 0 or size > self._maxbytes:
+            return
+
+        with self._lock:
+            if compiled.markup in self._entries:
+                self.__remove(compiled.markup)
+
+            self._entries[compiled.markup] = compiled
+            compiled._owner = self
+            self._bytes += size
+            for func in compiled.funcs:
+                self._by_func.setdefault(func, set()).add(compiled.markup)
+
+            self.__evict()
+
+    def _grow(self, compiled: CompiledMarkup, size: int) -> None:
+        """Count the bytes of a value that cached markup rendered with another backend. Entries
+        are evicted if the cache is now too large."""
+        with self._lock:
+            compiled._size += size
+            if self._entries.get(compiled.markup) is compiled:
+                self._bytes += size
+                self.__evict()
+
+    def invalidate(self, func: str) -> int:
+        """Remove all entries that reference the given function macro.
+
+        Args:
+            func (str): The name of the function macro
+
+        Returns:
+            int: The number of entries removed
+        """
+        with self._lock:
+            markups = self._by_func.pop(func, set())
+            for markup in markups:
+                self.__remove(markup)
+            return len(markups)
+
+    def resize(self, maxsize: Optional[int] = None, maxbytes: Optional[int] = None) -> None:
+        """Change the bounds of the cache. Entries are evicted if the cache is now too large.
+
+        Args:
+            maxsize (int, optional): The maximum number of entries
+            maxbytes (int, optional): The maximum number of bytes held by the entries
+        """
+        with self._lock:
+            if maxsize is not None:
+                self._maxsize = maxsize
+            if maxbytes is not None:
+                self._maxbytes = maxbytes
+            self.__evict()
+
+    def clear(self) -> None:
+        """Remove all entries and reset the hit and miss counters."""
+        with self._lock:
+            for compiled in self._entries.values():
+                compiled._owner = None
+            self._entries.clear()
+            self._by_func.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> CacheInfo:
+        """Get the current hits, misses, and size of the cache."""
+        return CacheInfo(
+            self.hits,
+            self.misses,
+            self._maxsize,
+            len(self._entries),
+            self._maxbytes,
+            self._bytes,
+        )
+
+    def __evict(self) -> None:
+        while self._entries and (
+            len(self._entries) > self._maxsize or self._bytes > self._maxbytes
+        ):
+            self.__remove(next(iter(self._entries)))
+
+    def __remove(self, markup: str) -> None:
+        compiled = self._entries.pop(markup)
+        compiled._owner = None
+        self._bytes -= compiled.size
+        for func in compiled.funcs:
+            markups = self._by_func.get(func)
+            if markups is not None:
+                markups.discard(markup)
+                if len(markups) == 0:
+                    del self._by_func[func]
+
+    def __contains__(self, markup: str) -> bool:
+        return markup in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
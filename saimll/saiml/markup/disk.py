@@ -0,0 +1,204 @@
+"""A persistent cache of compiled markup so new processes can render markup without parsing it.
+
+Entries are stored with `marshal` as the rendered value and the tokens of the markup, keyed by
+the name of the backend and the markup. The file is only read the first time markup isn't found
+in the in memory cache and belongs to a single version of the library; a file written by another
+version, or one that can't be read, is ignored.
+
+Saving reads the file again and merges its entries with the new ones before writing. The file is
+written to a temporary file in the same directory that then replaces the old file, so processes
+that save at the same time never leave a partial file behind. The last of them wins, so entries
+only one of them added may be missing until they are saved again.
+
+Markup with function macros is never stored since the functions may change between processes.
+"""
+from __future__ import annotations
+
+import marshal
+import os
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from threading import Lock
+from typing import Any, Optional, Union
+
+from ... import __version__
+from .backends import Backend
+from .cache import CompiledMarkup
+from .tokens import (
+    BOLD_TOKENS,
+    ESCAPE_TOKEN,
+    RESET_TOKEN,
+    UNDERLINE_TOKENS,
+    Color,
+    HLink,
+    Op,
+    Text,
+    Token,
+)
+
+__all__ = [
+    "DiskCache",
+    "default_path",
+]
+
+FORMAT = 1
+"""The version of the file layout."""
+
+
+def default_path() -> Path:
+    """The default cache file in the users cache directory, `$XDG_CACHE_HOME/saimll` or
+    `~/.cache/saimll`."""
+    root = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(root, "saimll", f"markup-{__version__}.marshal")
+
+
+def _encode(token: Token) -> tuple:
+    op = token.op
+    if op in (Op.TEXT, Op.BOLD, Op.UNDERLINE):
+        return (op, token.value)
+    if op == Op.COLOR:
+        return (op, list(token.colors), token.type)
+    if op == Op.HLINK:
+        return (op, "~" + token.url)
+    return (op,)
+
+
+def _decode(data: tuple) -> Token:
+    op = data[0]
+    if op == Op.TEXT:
+        return Text(data[1])
+    if op == Op.BOLD:
+        return BOLD_TOKENS[data[1]]
+    if op == Op.UNDERLINE:
+        return UNDERLINE_TOKENS[data[1]]
+    if op == Op.COLOR:
+        return Color("", data[1], data[2])
+    if op == Op.HLINK:
+        return HLink(data[1])
+    if op == Op.RESET:
+        return RESET_TOKEN
+    if op == Op.ESCAPE:
+        return ESCAPE_TOKEN
+    raise ValueError(f"Unknown token opcode {op!r}")
+
+
+class DiskCache:
+    """Compiled markup stored in a file that is shared between processes.
+
+    Args:
+        path (str | PathLike, optional): The cache file. Defaults to `default_path()`.
+        maxsize (int): The most entries kept in the file. The oldest entries are dropped first.
+    """
+
+    def __init__(self, path: Union[str, os.PathLike, None] = None, maxsize: int = 4096) -> None:
+        self.path: Path = default_path() if path is None else Path(path)
+        self.maxsize: int = maxsize
+        self._entries: Optional[dict[tuple[str, str], tuple]] = None
+        self._added: dict[tuple[str, str], tuple] = {}
+        self._lock = Lock()
+
+    def __read(self) -> dict[tuple[str, str], tuple]:
+        try:
+            with open(self.path, "rb") as file:
+                data = marshal.loads(file.read())
+        except (OSError, EOFError, ValueError, TypeError):
+            return {}
+        if (
+            not isinstance(data, dict)
+            or data.get("format") != FORMAT
+            or data.get("version") != __version__
+        ):
+            return {}
+        return data.get("entries", {})
+
+    def get(self, markup: str, backend: Backend) -> Optional[CompiledMarkup]:
+        """Get the compiled markup for a backend. The file is read the first time this is called.
+
+        Args:
+            markup (str): The SAIML markup string
+            backend (Backend): The backend the value was rendered with
+
+        Returns:
+            CompiledMarkup | None: The compiled markup or None if it isn't stored
+        """
+        if self._entries is None:
+            with self._lock:
+                if self._entries is None:
+                    self._entries = self.__read()
+
+        entry = self._entries.get((backend.name, markup))
+        if entry is None:
+            return None
+        try:
+            value, tokens = entry
+            return CompiledMarkup(markup, [_decode(token) for token in tokens], value, (), backend)
+        except (ValueError, TypeError, KeyError, IndexError):
+            return None
+
+    def add(self, compiled: CompiledMarkup, backend: Backend) -> None:
+        """Store compiled markup the next time the cache is saved. Markup with function macros,
+        or from a backend without a name, is skipped.
+
+        Args:
+            compiled (CompiledMarkup): The compiled markup
+            backend (Backend): The backend the value was rendered with
+        """
+        if compiled.funcs or not backend.name:
+            return
+        entry = (compiled.render(backend), [_encode(token) for token in compiled.tokens])
+        with self._lock:
+            self._added[(backend.name, compiled.markup)] = entry
+
+    def save(self) -> int:
+        """Merge the new entries into the file. Does nothing if nothing was added.
+
+        Returns:
+            int: The number of entries in the file
+        """
+        with self._lock:
+            if len(self._added) == 0:
+                return 0
+
+            entries = self.__read()
+            for key, entry in self._added.items():
+                entries.pop(key, None)
+                entries[key] = entry
+            while len(entries) > self.maxsize:
+                del entries[next(iter(entries))]
+
+            data: dict[str, Any] = {"format": FORMAT, "version": __version__, "entries": entries}
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            file = NamedTemporaryFile(
+                "wb", dir=self.path.parent, prefix=f".{self.path.name}.", delete=False
+            )
+            try:
+                with file:
+                    file.write(marshal.dumps(data))
+                os.replace(file.name, self.path)
+            except BaseException:
+                os.unlink(file.name)
+                raise
+
+            self._entries = entries
+            self._added.clear()
+            return len(entries)
+
+    def _save_at_exit(self) -> None:
+        """Save when the process exits. A cache that can't be written is skipped."""
+        try:
+            self.save()
+        except OSError:
+            pass
+
+    def clear(self) -> None:
+        """Forget the new entries and remove the file."""
+        with self._lock:
+            self._entries = {}
+            self._added.clear()
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+
+    def __repr__(self) -> str:
+        return f"<DiskCache: {str(self.path)!r}>"
@@ -0,0 +1,232 @@
+"""Translate tokens into the minimal ansi escape sequences.
+
+The emitter keeps two styles; the style requested by the markup so far and the style the terminal
+is currently in. Formatting tokens only change the requested style. When text is written the
+difference between the two is output as a single SGR sequence. Redundant sequences, such as
+setting a color that is already active or toggling bold on and off between text, are never
+written. The string is only reset at the end if a style was left active.
+"""
+from __future__ import annotations
+
+from re import compile as re_compile
+from typing import TYPE_CHECKING, Callable, Optional
+
+from .formatting import BOLD, LINK, RESET, UNDERLINE, ColorType
+from .tokens import Op, Token
+
+if TYPE_CHECKING:
+    from .stream import ParseState
+
+__all__ = [
+    "Style",
+    "emit",
+    "ColorMap",
+]
+
+ColorMap = Callable[[str], str]
+"""Maps a color code to the color code that is written. Used to downsample colors."""
+
+SGR_SEQUENCE = re_compile(r"\x1b\[([0-9;]*)m")
+"""Matches an SGR sequence and captures its parameters."""
+
+
+class Style:
+    """The foreground, background, bold, underline, and hyperlink state of the terminal."""
+
+    __slots__ = ("fg", "bg", "bold", "underline", "link", "unknown")
+
+    def __init__(self) -> None:
+        self.fg: Optional[str] = None
+        """The foreground color code or None for the default foreground."""
+
+        self.bg: Optional[str] = None
+        """The background color code or None for the default background."""
+
+        self.bold: bool = False
+        self.underline: bool = False
+
+        self.link: Optional[str] = None
+        """The url of the open hyperlink or None if no link is open."""
+
+        self.unknown: bool = False
+        """True if raw ansi, like the output of a function macro, may have changed the style."""
+
+    def reset(self) -> None:
+        """Reset the colors, bold, and underline. Hyperlinks are not affected."""
+        self.fg = self.bg = None
+        self.bold = self.underline = False
+
+    def is_default(self) -> bool:
+        """True if no color, bold, or underline is active."""
+        return (
+            self.fg is None
+            and self.bg is None
+            and not self.bold
+            and not self.underline
+            and not self.unknown
+        )
+
+    def params(self) -> list[str]:
+        """The SGR parameters that set this style from the default style."""
+        params = []
+        if self.bold:
+            params.append(str(BOLD.PUSH))
+        if self.underline:
+            params.append(str(UNDERLINE.PUSH))
+        if self.fg is not None:
+            params.append(self.fg)
+        if self.bg is not None:
+            params.append(self.bg)
+        return params
+
+    def diff(self, target: Style) -> list[str]:
+        """The SGR parameters that change this style into the target style."""
+        params = []
+        if self.bold != target.bold:
+            params.append(str(BOLD.PUSH if target.bold else BOLD.POP))
+        if self.underline != target.underline:
+            params.append(str(UNDERLINE.PUSH if target.underline else UNDERLINE.POP))
+        if self.fg != target.fg:
+            params.append(target.fg or str(ColorType.FG + 9))
+        if self.bg != target.bg:
+            params.append(target.bg or str(ColorType.BG + 9))
+        return params
+
+    def apply(self, token: Token, colors: Optional[ColorMap] = None) -> None:
+        """Apply a formatting token to the style.
+
+        Args:
+            token (Token): Color, bold, underline, hyperlink, or reset token
+            colors (ColorMap, optional): Maps each color code before it is applied
+        """
+        op = token.op
+        if op == Op.COLOR:
+            for ctype, code in zip(token.type, token.colors):
+                if ctype == ColorType.FG:
+                    default = code == str(ColorType.FG + 9)
+                    self.fg = None if default else code if colors is None else colors(code)
+                elif ctype == ColorType.BG:
+                    default = code == str(ColorType.BG + 9)
+                    self.bg = None if default else code if colors is None else colors(code)
+        elif op == Op.BOLD:
+            self.bold = token.value == BOLD.PUSH
+        elif op == Op.UNDERLINE:
+            self.underline = token.value == UNDERLINE.PUSH
+        elif op == Op.HLINK:
+            self.link = None if token.closing else token.url
+        elif op == Op.RESET:
+            self.reset()
+
+    def update(self, target: Style) -> None:
+        """Copy the colors, bold, and underline of the target style."""
+        self.fg = target.fg
+        self.bg = target.bg
+        self.bold = target.bold
+        self.underline = target.underline
+        self.unknown = False
+
+
+def _map_colors(text: str, colors: ColorMap) -> str:
+    """Map the extended colors of the SGR sequences in raw ansi, like the output of a function
+    macro.
+    """
+
+    def replace(match) -> str:
+        params = match.group(1).split(";")
+        output, index = [], 0
+        while index < len(params):
+            param = params[index]
+            if param in ("38", "48") and index + 1 < len(params):
+                size = 3 if params[index + 1] == "5" else 5 if params[index + 1] == "2" else 0
+                if size > 0 and index + size <= len(params):
+                    output.append(colors(";".join(params[index : index + size])))
+                    index += size
+                    continue
+            output.append(param)
+            index += 1
+        return f"\x1b[{';'.join(output)}m"
+
+    return SGR_SEQUENCE.sub(replace, text)
+
+
+def _sync(output: list[str], style: Style, terminal: Style) -> None:
+    """Write the sequences that bring the terminal to the requested style."""
+    if terminal.link != style.link:
+        output.append(LINK.CLOSE if style.link is None else LINK.OPEN(style.link))
+        terminal.link = style.link
+
+    if terminal.unknown:
+        params = ["0", *style.params()]
+    else:
+        params = terminal.diff(style)
+        if len(params) > 1:
+            # Resetting and setting the style can be shorter than undoing each part
+            full = ["0", *style.params()]
+            if len(";".join(full)) < len(";".join(params)):
+                params = full
+
+    if len(params) > 0:
+        output.append(f"\x1b[{';'.join(params)}m")
+        terminal.update(style)
+
+
+def emit(
+    tokens: list[Token], state: ParseState, final: bool = True, colors: Optional[ColorMap] = None
+) -> str:
+    """Translate tokens into ansi. Only the differences in style are written before each block of
+    text.
+
+    Args:
+        tokens (list[Token]): The tokens generated from parsing the SAIML markup
+        state (ParseState): The requested and terminal style carried between chunks of markup
+        final (bool): Whether these are the last tokens. If so, open links are closed and the
+        style is reset if anything is still active.
+        colors (ColorMap, optional): Maps each color code before it is written
+
+    Returns:
+        str: The ansi translated string
+    """
+    style = state.style
+    terminal = state.terminal
+    func = state.func
+    output = []
+
+    for token in tokens:
+        op = token.op
+        if op == Op.TEXT:
+            text = token.value
+            if func is not None:
+                if state.stats is None:
+                    text, func = func.exec(text), None
+                else:
+                    text, func = state.stats.call(func, text), None
+                if not isinstance(text, str):
+                    continue
+                if colors is not None:
+                    text = _map_colors(text, colors)
+                _sync(output, style, terminal)
+                output.append(text)
+                terminal.unknown = True
+            else:
+                _sync(output, style, terminal)
+                output.append(text)
+        elif op == Op.FUNC:
+            func = token
+        else:
+            if op == Op.RESET:
+                func = None
+            style.apply(token, colors)
+
+    if final:
+        if terminal.link is not None:
+            output.append(LINK.CLOSE)
+            terminal.link = None
+        if not terminal.is_default():
+            output.append(RESET)
+            terminal.reset()
+            terminal.unknown = False
+        style.reset()
+        style.link = None
+
+    state.func = func
+    return "".join(output)
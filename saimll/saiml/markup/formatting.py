@@ -7,18 +7,20 @@ Colors must be RGB, Xterm index, predefined, or hex.
 * hex = #aaa or #aaaaaa ... `[@F #abc]` or `[@B #abcabc]`
 * predefined = black, red, green, yellow, blue, magenta, cyan, and white ... `[@F green]`
 
-Function macros can be of types rainbow, gradient, esc, and repr
+Function macros can be of types rainbow, gradient, and repr
 
 * rainbow takes a string and returns a rainbow formatted string
-* gradient is more complex. It takes a comma seperated string with the format {color n}...,string.
-    * All but last value is the color value. Must have at least two colors which are hex.
-    * Finally, the last value is the string that the gradient will be applied too.
-* esc takes a string and returns the literal value thus escaping the markup
+* gradient takes the colors of the gradient as arguments, `[^gradient #f00,#00f]text`.
+    * There must be at least two colors. Any color format except rgb with `,` can be used.
+    * The last argument can be the color space to blend in; rgb, hsl, or oklab. `[^gradient red,blue oklab]`
 * repr takes a given string and returns the literal value surrounded by `'`
 """
 from __future__ import annotations
-from dataclasses import dataclass
-from typing import Union
+from functools import lru_cache
+from re import compile as re_compile
+from typing import Optional, Union
+
+from .palette import code_rgb
 
 __all__ = [
     "UNDERLINE",
@@ -26,20 +28,26 @@ __all__ = [
     "RESET",
     "FUNC",
     "build_color",
+    "resolve_color",
 ]
 
 
-@dataclass
 class ColorType:
     FG: int = 30
     BG: int = 40
     BOTH: list = (30, 40)
 
 
+FUNC_CACHE_SIZE = 256
+"""The default number of results a pure function macro keeps."""
+
 FUNC = {
-    "rainbow": lambda string: __RAINBOW(string),
+    "rainbow": lru_cache(maxsize=FUNC_CACHE_SIZE)(lambda string: __RAINBOW(string)),
+    "gradient": lru_cache(maxsize=FUNC_CACHE_SIZE)(lambda string, *args: __GRADIENT(string, *args)),
     "repr": lambda string: repr(string),
 }
+"""The function macros. Pure functions are wrapped in an lru cache so the same text is only
+formatted once."""
 
 PREDEFINED = {
     "black": lambda c: f"{c + 0}",
@@ -56,6 +64,19 @@ XTERM = lambda c, v: f"{c + 8};5;{v}"
 RESETCOLOR = lambda ctype: f"{ctype + 9}"
 RESET = "\x1b[0m"
 
+HEX_PATTERN = re_compile(r"#(?:[a-f0-9]{6}|[a-f0-9]{3})")
+RGB_PATTERN = re_compile(r"\d{1,3}\s*[,;]\s*\d{1,3}\s*[,;]\s*\d{1,3}")
+XTERM_PATTERN = re_compile(r"\d{1,3}")
+
+COLOR_TABLE = {
+    ctype: {
+        **{name: code(ctype) for name, code in PREDEFINED.items()},
+        **{str(index): XTERM(ctype, index) for index in range(256)},
+    }
+    for ctype in (ColorType.FG, ColorType.BG)
+}
+"""Precomputed color codes for the predefined colors and xterm indexes for both fg and bg."""
+
 
 def HEX(context: int, hex: str) -> str:
     """Converts 3 or 6 digit hex into an rgb literal
@@ -78,13 +99,12 @@ def HEX(context: int, hex: str) -> str:
         return RGB(context, r, g, b)
     elif l == 3:
         hex = "".join(h + h for h in hex)
-        r, g, b = tuple(int(hex[i : i + 2], 16) for i in (0, 2))
+        r, g, b = tuple(int(hex[i : i + 2], 16) for i in (0, 2, 4))
         return RGB(context, r, g, b)
 
     raise ValueError(f"Expected hex with length of 3 or 6")
 
 
-@dataclass
 class BOLD:
     """The bold value based on the current toggle value."""
 
@@ -96,7 +116,6 @@ class BOLD:
         return BOLD.POP if current == BOLD.PUSH else BOLD.PUSH
 
 
-@dataclass
 class UNDERLINE:
     """The bold value based on the current toggle value."""
 
@@ -108,7 +127,6 @@ class UNDERLINE:
         return UNDERLINE.POP if current == UNDERLINE.PUSH else UNDERLINE.PUSH
 
 
-@dataclass
 class LINK:
     CLOSE: str = "\x1b]8;;\x1b\\"
     OPEN: str = lambda url: f"\x1b]8;;{url}\x1b\\"
@@ -124,34 +142,53 @@ def get_color(types: Union[int, list[int]], content: str) -> Union[int, list[int
     Returns:
         Union[int, list[int]]: List of color code values according to the needed types
     """
-    from re import match
-
     results = []
-    content = content.lower()
     for ctype in types:
-        if len(content) == 0:
-            results.append(RESETCOLOR(ctype))
-        elif content.startswith("#"):
-            if len(content) == 4 and match(r"#[a-fA-F0-9]{3}", content):
-                results.append(HEX(ctype, content))
-            elif len(content) == 7 and match(r"#[a-fA-F0-9]{6}", content):
-                results.append(HEX(ctype, content))
-        elif match(r"\d{1,3}\s*[,;]\s*\d{1,3}\s*[,;]\s*\d{1,3}", content):
-            rgb = content.replace(";", ",").split(",")
-            results.append(RGB(ctype, rgb[0].strip(), rgb[1].strip(), rgb[2].strip()))
-        elif match(r"\d{1,3}", content):
-            results.append(XTERM(ctype, content))
-        else:
-            if content in PREDEFINED:
-                results.append(PREDEFINED[content](ctype))
-            else:
-                raise ValueError(
-                    f"The color, \x1b[1;31m{content}\x1b[0m, does not match any valid format"
-                )
+        code = resolve_color(ctype, content)
+        if code is not None:
+            results.append(code)
 
     return results
 
 
+@lru_cache(maxsize=1024)
+def resolve_color(ctype: int, content: str) -> Optional[str]:
+    """Translate a single color value for a color type into it's color code. Results are memoized
+    so a color is only parsed the first time it is seen.
+
+    Args:
+        ctype (int): The color type, fg or bg, to generate the color code for
+        content (str): The color string that is to be parsed
+
+    Raises:
+        ValueError: If the color does not match any of the valid formats
+
+    Returns:
+        str | None: The color code or None if it is a malformed hex code
+    """
+    content = content.lower()
+    if len(content) == 0:
+        return RESETCOLOR(ctype)
+
+    table = COLOR_TABLE.get(ctype)
+    if table is not None and content in table:
+        return table[content]
+
+    if content.startswith("#"):
+        if HEX_PATTERN.fullmatch(content):
+            return HEX(ctype, content)
+        return None
+    elif RGB_PATTERN.match(content):
+        rgb = content.replace(";", ",").split(",")
+        return RGB(ctype, rgb[0].strip(), rgb[1].strip(), rgb[2].strip())
+    elif XTERM_PATTERN.match(content):
+        return XTERM(ctype, content)
+    elif content in PREDEFINED:
+        return PREDEFINED[content](ctype)
+
+    raise ValueError(f"The color, \x1b[1;31m{content}\x1b[0m, does not match any valid format")
+
+
 def build_color(color: str) -> tuple[ColorType, str]:
     """Takes a color macro and determines if it is type fg, bg, or both.
     It will get the color string and produce color codes for each type that was specified.
@@ -177,6 +214,14 @@ def build_color(color: str) -> tuple[ColorType, str]:
     return ctype, get_color(ctype, content)
 
 
+RAINBOW = tuple(
+    f"\x1b[{XTERM(ColorType.FG, index)}m"
+    # red orange yellow green blue purple
+    for index in (196, 202, 190, 41, 39, 92)
+)
+"""The escape sequences of the rainbow colors."""
+
+
 def __RAINBOW(input: str) -> str:
     """Take a string input and make each character rainbow
 
@@ -186,20 +231,47 @@ def __RAINBOW(input: str) -> str:
     Returns:
         str: Rainbow string
     """
-    # red orange yellow green blue purple
-    context = 30
-    colors = [
-        f"\x1b[{XTERM(context, 196)}m",
-        f"\x1b[{XTERM(context, 202)}m",
-        f"\x1b[{XTERM(context, 190)}m",
-        f"\x1b[{XTERM(context, 41)}m",
-        f"\x1b[{XTERM(context, 39)}m",
-        f"\x1b[{XTERM(context, 92)}m",
-    ]
-
-    out = []
-    for i, char in enumerate(input):
-        out.append(colors[i % len(colors)] + char)
+    out = [""] * (2 * len(input))
+    out[0::2] = (RAINBOW * (len(input) // len(RAINBOW) + 1))[: len(input)]
+    out[1::2] = input
     out.append("\x1b[39;49m")
 
     return "".join(out)
+
+
+@lru_cache(maxsize=256)
+def gradient_stop(color: str) -> tuple[int, int, int]:
+    """Get the rgb value of a color given to the gradient function macro.
+
+    Args:
+        color (str): A predefined, xterm, hex, or rgb color
+
+    Raises:
+        ValueError: If the color is not a valid color
+
+    Returns:
+        tuple[int, int, int]: The rgb value of the color
+    """
+    code = resolve_color(ColorType.FG, color)
+    rgb = None if code is None else code_rgb(code)
+    if rgb is None:
+        raise ValueError(f"Invalid gradient color \x1b[1;31m{color}\x1b[0m")
+    return rgb
+
+
+def __GRADIENT(input: str, *args: str) -> str:
+    """Color a string with a gradient between the colors given as arguments
+
+    Args:
+        input (str): The string to apply the gradient to
+        *args (str): The colors of the gradient optionally followed by the color space
+
+    Returns:
+        str: Gradient string
+    """
+    from .gradient import SPACES, gradient
+
+    space = "rgb"
+    if len(args) > 0 and args[-1].lower() in SPACES:
+        space, args = args[-1].lower(), args[:-1]
+    return gradient(input, tuple(gradient_stop(color) for color in args), space)
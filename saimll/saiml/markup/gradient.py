@@ -0,0 +1,207 @@
+"""Color ramps for the `gradient` function macro.
+
+A ramp interpolates between any number of evenly spaced color stops in rgb, hsl, or oklab. Ramps
+are cached by their stops, length, and color space so a gradient over text of the same length
+is only computed once. Characters next to each other that land on the same color share one
+escape sequence.
+
+If NumPy is installed it is imported the first time a ramp is built and used to interpolate the
+ramps. Without it the ramps are interpolated in pure python with the same results.
+"""
+from __future__ import annotations
+
+from colorsys import hls_to_rgb, rgb_to_hls
+from functools import lru_cache
+from typing import Tuple
+
+
+__all__ = [
+    "SPACES",
+    "ramp",
+    "ramp_sequences",
+    "gradient",
+]
+
+RGB = Tuple[int, int, int]
+
+SPACES = ("rgb", "hsl", "oklab")
+"""The color spaces a gradient can be interpolated in."""
+
+
+def _to_linear(channel: float) -> float:
+    return channel / 12.92 if channel <= 0.04045 else ((channel + 0.055) / 1.055) ** 2.4
+
+
+def _from_linear(channel: float) -> float:
+    return 12.92 * channel if channel <= 0.0031308 else 1.055 * channel ** (1 / 2.4) - 0.055
+
+
+def _rgb_to_oklab(rgb: RGB) -> tuple[float, float, float]:
+    r, g, b = (_to_linear(channel / 255) for channel in rgb)
+    l = (0.4122214708 * r + 0.5363325363 * g + 0.0514459929 * b) ** (1 / 3)
+    m = (0.2119034982 * r + 0.6806995451 * g + 0.1073969566 * b) ** (1 / 3)
+    s = (0.0883024619 * r + 0.2817188376 * g + 0.6299787005 * b) ** (1 / 3)
+    return (
+        0.2104542553 * l + 0.7936177850 * m - 0.0040720468 * s,
+        1.9779984951 * l - 2.4285922050 * m + 0.4505937099 * s,
+        0.0259040371 * l + 0.7827717662 * m - 0.8086757660 * s,
+    )
+
+
+def _oklab_to_rgb(lab: tuple[float, float, float]) -> tuple[float, float, float]:
+    L, a, b = lab
+    l = (L + 0.3963377774 * a + 0.2158037573 * b) ** 3
+    m = (L - 0.1055613458 * a - 0.0638541728 * b) ** 3
+    s = (L - 0.0894841775 * a - 1.2914855480 * b) ** 3
+    return (
+        _from_linear(4.0767416621 * l - 3.3077115913 * m + 0.2309699292 * s),
+        _from_linear(-1.2684380046 * l + 2.6097574011 * m - 0.3413193965 * s),
+        _from_linear(-0.0041960863 * l - 0.7034186147 * m + 1.7076147010 * s),
+    )
+
+
+def _rgb_to_hsl(rgb: RGB) -> tuple[float, float, float]:
+    h, l, s = rgb_to_hls(*(channel / 255 for channel in rgb))
+    return (h * 360, s, l)
+
+
+def _hsl_to_rgb(hsl: tuple[float, float, float]) -> tuple[float, float, float]:
+    h, s, l = hsl
+    return hls_to_rgb((h % 360) / 360, l, s)
+
+
+def _stops(stops: tuple[RGB, ...], space: str) -> list[tuple[float, float, float]]:
+    """Convert the stops into the color space. Hues are unwrapped so interpolating between two
+    stops always takes the shortest way around the color wheel."""
+    if space == "oklab":
+        return [_rgb_to_oklab(stop) for stop in stops]
+    if space == "hsl":
+        converted = [_rgb_to_hsl(stop) for stop in stops]
+        for index in range(1, len(converted)):
+            previous, (h, s, l) = converted[index - 1][0], converted[index]
+            h += round((previous - h) / 360) * 360
+            converted[index] = (h, s, l)
+        return converted
+    return [tuple(channel / 255 for channel in stop) for stop in stops]
+
+
+def _clamp(channel: float) -> int:
+    return min(max(round(channel * 255), 0), 255)
+
+
+def _interpolate(points: list[tuple[float, float, float]], length: int) -> list[tuple]:
+    """Interpolate evenly spaced points into the given number of values."""
+    segments = len(points) - 1
+    if length == 1:
+        return [points[0]]
+
+    values = []
+    for index in range(length):
+        position = index * segments / (length - 1)
+        segment = min(int(position), segments - 1)
+        t = position - segment
+        start, end = points[segment], points[segment + 1]
+        values.append(tuple(a + (b - a) * t for a, b in zip(start, end)))
+    return values
+
+
+@lru_cache(maxsize=1)
+def _numpy():
+    """Import NumPy the first time a ramp is built. None if it isn't installed."""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def _interpolate_numpy(points: list[tuple[float, float, float]], length: int) -> list[tuple]:
+    """Interpolate evenly spaced points into the given number of values with NumPy. The math is
+    the same as `_interpolate` so colors that round at exactly .5 match it."""
+    numpy = _numpy()
+    segments = len(points) - 1
+    if length == 1:
+        return [points[0]]
+
+    points = numpy.asarray(points, dtype=float)
+    position = numpy.arange(length) * segments / (length - 1)
+    segment = numpy.minimum(position.astype(int), segments - 1)
+    t = (position - segment)[:, None]
+    start, end = points[segment], points[segment + 1]
+    return [tuple(value) for value in (start + (end - start) * t).tolist()]
+
+
+@lru_cache(maxsize=256)
+def ramp(stops: tuple[RGB, ...], length: int, space: str = "rgb") -> tuple[RGB, ...]:
+    """Interpolate the colors between evenly spaced color stops.
+
+    Args:
+        stops (tuple[RGB, ...]): At least two rgb colors
+        length (int): The number of colors in the ramp
+        space (str): The color space to interpolate in; `rgb`, `hsl`, or `oklab`
+
+    Raises:
+        ValueError: If there are fewer than two stops or the color space is unknown
+
+    Returns:
+        tuple[RGB, ...]: The rgb colors of the ramp
+    """
+    if len(stops) < 2:
+        raise ValueError("A gradient needs at least two colors")
+    if space not in SPACES:
+        raise ValueError(f"Unknown color space {space!r}, expected one of {', '.join(SPACES)}")
+    if length <= 0:
+        return ()
+
+    points = _stops(stops, space)
+    if _numpy() is not None:
+        values = _interpolate_numpy(points, length)
+    else:
+        values = _interpolate(points, length)
+
+    if space == "oklab":
+        values = [_oklab_to_rgb(value) for value in values]
+    elif space == "hsl":
+        values = [_hsl_to_rgb(value) for value in values]
+    return tuple(tuple(_clamp(channel) for channel in value) for value in values)
+
+
+@lru_cache(maxsize=256)
+def ramp_sequences(stops: tuple[RGB, ...], length: int, space: str = "rgb") -> tuple[str, ...]:
+    """The foreground escape sequence for each color of a ramp. A color that is the same as the
+    color before it is an empty string so runs of the same color share one sequence.
+
+    Args:
+        stops (tuple[RGB, ...]): At least two rgb colors
+        length (int): The number of colors in the ramp
+        space (str): The color space to interpolate in; `rgb`, `hsl`, or `oklab`
+
+    Returns:
+        tuple[str, ...]: The escape sequence before each character
+    """
+    sequences, previous = [], None
+    for color in ramp(stops, length, space):
+        sequences.append("" if color == previous else "\x1b[38;2;{};{};{}m".format(*color))
+        previous = color
+    return tuple(sequences)
+
+
+def gradient(text: str, stops: tuple[RGB, ...], space: str = "rgb") -> str:
+    """Color the text with a gradient across the color stops.
+
+    Args:
+        text (str): The text to color
+        stops (tuple[RGB, ...]): At least two rgb colors
+        space (str): The color space to interpolate in; `rgb`, `hsl`, or `oklab`
+
+    Returns:
+        str: The text with a foreground color for each run of characters
+    """
+    if len(text) == 0:
+        return text
+
+    output = [""] * (2 * len(text))
+    output[0::2] = ramp_sequences(stops, len(text), space)
+    output[1::2] = text
+    output.append("\x1b[39m")
+    return "".join(output)
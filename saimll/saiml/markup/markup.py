@@ -7,46 +7,228 @@ Raises:
 """
 from __future__ import annotations
 
-from typing import Iterator, Callable
-from .tokens import Token, Color, Text, Bold, Underline, Formatter, HLink, Reset, Func, Escape
-from .formatting import BOLD, UNDERLINE, RESET, LINK, FUNC
+import atexit
+import sys
+from contextlib import contextmanager
+from functools import lru_cache
+from re import DOTALL
+from re import compile as re_compile
+from re import escape as re_escape
+from time import perf_counter
+from typing import IO, TYPE_CHECKING, Any, Iterable, Iterator, Callable, Mapping, Optional, Union
+from weakref import WeakSet
+from .backends import AnsiBackend, Backend, PlainBackend, depth_backend, get_backend
+from .cache import CacheInfo, CompiledMarkup, MarkupCache
+from .stats import ParserStats
+from .stream import MAX_FUNC_TEXT, MAX_PENDING, MarkupStream, ParseState
+from .strip import StripMode, strip, strip_stream
+from .terminal import color_depth
+from .tokens import (
+    Token,
+    Op,
+    Color,
+    Text,
+    HLink,
+    Reset,
+    Func,
+    BOLD_TOKENS,
+    UNDERLINE_TOKENS,
+    RESET_TOKEN,
+    ESCAPE_TOKEN,
+)
+from .formatting import BOLD, UNDERLINE, FUNC, FUNC_CACHE_SIZE
+
+if TYPE_CHECKING:
+    from os import PathLike
+
+    from .disk import DiskCache
+    from .template import MarkupTemplate
 
 __all__ = [
     "SAIML",
 ]
 
+SPECIAL_CHARS = re_compile(r"[\\*_\[]")
+"""Matches the characters that start a token; `\\`, `*`, `_`, and `[`."""
+
+PLAIN_MACROS = re_compile(r"\\.?|(\[)([^\]]*)(\]?)", DOTALL)
+"""Finds the macros of markup the same way the tokenizer does, skipping escaped characters. The
+groups are the `[`, the macro contents, and the `]` which is empty if the macro isn't closed."""
+
+PLAIN_MACRO_CACHE_SIZE = 1024
+"""The most macros a parser remembers as checked for markup that is stripped instead of parsed."""
+
+BATCH_SEPARATOR = "\x00"
+"""Joins the strings given to `escape_many` so they can be escaped together."""
+
+SIGILS = "$@~!^"
+"""The characters that start a builtin macro. A chained macro, `[@F red@B blue]`, is split before
+each of them wherever they appear."""
+
+COLOR_SPECIFIERS = ("@F", "@B", "@")
+"""Color macros that are still waiting for their color, `[@F #fff]` or `[@ #fff]`, so a
+registered sigil after them is part of the color instead of a new macro."""
+
+MacroHandler = Union[Callable[[str], Union[str, "list[Token]", None]], Mapping[str, str]]
+"""Compiles a registered kind of macro. Given the name after the sigil it returns the macro
+contents it stands for, like `"@F red @B black"`, or the tokens it compiles to."""
+
+RENDER_CHUNK_SIZE = 64 * 1024
+"""Markup longer than this is rendered by `render_into` without being kept in the cache."""
+
+MACRO_BATCH_SIZE = 1024
+"""The most parsed macros `iparse_many` shares between markup strings before starting over, so a
+long running generator stays bounded."""
+
+Writer = Union[Callable[[str], Any], IO[str], bytearray]
+"""Where `render_into` writes; a write callable, a text stream, or a bytearray."""
+
+
+_PARSERS: WeakSet = WeakSet()
+"""Every parser. Function macros are shared by all parsers, so defining one clears the markup
+that uses it from the cache of each parser."""
+
+
+def _pure(callback: Optional[Callable]) -> bool:
+    """Whether a function macro was defined as pure. Pure functions are wrapped in an lru cache."""
+    return hasattr(callback, "cache_info")
+
+
+def _get_write(target: Writer, encoding: str = "utf-8") -> Callable[[str], Any]:
+    """Get the write callable of a writer. Text written to a bytearray is encoded."""
+    if isinstance(target, bytearray):
+        return lambda text: target.extend(text.encode(encoding))
+    write = getattr(target, "write", None)
+    if write is not None:
+        return write
+    if callable(target):
+        return target
+    raise TypeError(f"Can not write to {type(target).__name__}, expected a write callable")
+
 
 class SAIMLParser:
-    """Main class exposed by the library to give access the markup utility functions."""
+    """Main class exposed by the library to give access the markup utility functions.
+
+    Args:
+        backend (str | Backend): The default render target; `"ansi"`, `"256"`, `"16"`, `"plain"`,
+        `"html"`, or a `Backend`. Defaults to truecolor ansi.
+    """
 
-    def __init__(self) -> None:
+    def __init__(self, backend: Union[str, Backend] = "ansi") -> None:
         self._funcs = FUNC
+        self._cache = MarkupCache()
+        self._backend: Backend = get_backend(backend)
+        self._stats: Optional[ParserStats] = None
+        self._disk: Optional[DiskCache] = None
+        self._macro_kinds: dict[str, Callable[[str], list[Token]]] = {
+            "@": self.__color_macro,
+            "~": self.__link_macro,
+            "^": self.__func_macro,
+            "$": self.__escape_macro,
+        }
+        self._custom_macros: dict[str, MacroHandler] = {}
+        self._plain_macros: dict[str, bool] = {}
+        self._sigil_pattern = re_compile(f"[{re_escape(SIGILS)}]")
+        _PARSERS.add(self)
+
+    @property
+    def backend(self) -> Backend:
+        """The default render target of the parser."""
+        return self._backend
+
+    @backend.setter
+    def backend(self, backend: Union[str, Backend]) -> None:
+        self._backend = get_backend(backend)
+
+    def __get_backend(self, backend: Union[str, Backend, None]) -> Backend:
+        return self._backend if backend is None else get_backend(backend)
+
+    def output_backend(self, file: Optional[IO[str]] = None) -> Backend:
+        """The render target for writing to a stream. An ansi backend is lowered to the colors the
+        stream can display, or to plain text when color is off, see `terminal`. Other backends are
+        used as is.
+
+        Args:
+            file (IO[str], optional): The stream to write to. Defaults to `sys.stdout`.
+
+        Returns:
+            Backend: The backend to render with
+        """
+        backend = self._backend
+        if isinstance(backend, AnsiBackend):
+            depth = color_depth(file)
+            if depth < backend.depth:
+                return depth_backend(depth)
+        return backend
+
+    def __plain(self, markup: str) -> Optional[str]:
+        """Get the plain text of markup by stripping the macros instead of parsing them. Markup
+        with function macros or escape toggles, `^` and `$`, has to be parsed so None is returned,
+        as it is for a macro that isn't closed so the tokenizer raises the error.
+
+        Each macro is compiled, once, so a malformed macro raises the same error it does when the
+        markup is parsed for any other backend.
+        """
+        if "^" in markup or "$" in markup:
+            return None
+
+        checked = self._plain_macros
+        for bracket, macro, closed in PLAIN_MACROS.findall(markup):
+            if not bracket:
+                continue
+            if not closed:
+                return None
+            plain = checked.get(macro)
+            if plain is None:
+                if len(checked) >= PLAIN_MACRO_CACHE_SIZE:
+                    checked.clear()
+                # Registered macros may stand for function macros or escape toggles
+                plain = checked[macro] = all(
+                    token.op not in (Op.FUNC, Op.ESCAPE) for token in self.__parse_macro(macro)
+                )
+            if not plain:
+                return None
+
+        value = strip(markup, StripMode.MARKUP)
+        if self._stats is not None:
+            self._stats.count_input(markup)
+            self._stats.count_output(value)
+        return value
 
     def __split_macros(self, text: str) -> Iterator[str]:
         """Takes a macro, surrounded by brackets `[]` and splits the nested/chained macros.
 
+        A builtin sigil starts a new macro anywhere. A registered sigil only starts a new macro
+        after whitespace, and not right after a color specifier or in the arguments of a function
+        macro, so `[@F #fff]` stays a color and `[^gradient #f00,#00f]` keeps its arguments.
+
         Args:
             text (str): The contents of the macro inside of brackets `[]`
 
         Yields:
             Iterator[str]: Iterates from each token to the next until entire macro is consumed
         """
-        schars = ["$", "@", "~", "!"]
-        last, index = 0, 0
-        while index < len(text):
-            if index != 0:
-                if text[index] in schars:
-                    yield text[last:index]
-                    last = index
-
-            index += 1
+        last = 0
+        for match in self._sigil_pattern.finditer(text, 1):
+            index = match.start()
+            if text[index] not in SIGILS:
+                if not text[index - 1].isspace():
+                    continue
+                macro = text[last:index].strip()
+                if macro in COLOR_SPECIFIERS or macro.startswith("^"):
+                    continue
+            yield text[last:index]
+            last = index
 
-        if last != index:
+        if last != len(text):
             yield text[last:]
 
     def __parse_macro(self, text: str) -> list[Token]:
         """Takes the chained, nested, or single macros and generates a token based on it's type.
 
+        Each macro is compiled by the handler of its sigil, its first character. Macros with an
+        unknown sigil are ignored.
+
         Args:
             text (str): The macro content inside of brackets `[]`
 
@@ -54,235 +236,725 @@ class SAIMLParser:
             list[Token]: The list of tokens created from the macro content inside of brackets `[]`
         """
         tokens = []
+        stats = self._stats
+        if stats is not None:
+            start = perf_counter()
 
         if len(text) == 0:
-            tokens.append(Reset())
-            return tokens
-
-        for sub_macro in self.__split_macros(text):
-            sub_macro = sub_macro.strip()
-            if sub_macro.startswith("@"):
-                tokens.append(Color(sub_macro))
-            elif sub_macro.startswith("~"):
-                tokens.append(HLink(sub_macro))
-            elif sub_macro.startswith("^"):
-                tokens.append(Func(sub_macro, self._funcs))
-            elif sub_macro.startswith("$"):
-                tokens.append(Escape())
+            tokens.append(RESET_TOKEN)
+        else:
+            kinds = self._macro_kinds
+            for sub_macro in self.__split_macros(text):
+                sub_macro = sub_macro.strip()
+                handler = kinds.get(sub_macro[:1])
+                if handler is not None:
+                    tokens.extend(handler(sub_macro))
+
+        if stats is not None:
+            stats.count_macros(tokens)
+            stats.add_time("macros", start)
         return tokens
 
-    def __optimize(self, tokens: list) -> list:
-        """Takes the generated tokens from the markup string and removes and combines tokens where
-        possible.
+    def __color_macro(self, macro: str) -> list[Token]:
+        if self._stats is None:
+            return [Color(macro)]
+        start = perf_counter()
+        token = Color(macro)
+        self._stats.add_time("colors", start)
+        return [token]
 
-        Example:
-            Since there can be combinations such as fg, bg, bold, and underline they can be
-            represented in two ways.
-            * Unoptimized - `\\x1b[1m\\x1b[4m\\x1b[31m\\x1b[41m`
-            * Optimized - `\\x1b[1;4;31;41m`
+    @staticmethod
+    def __link_macro(macro: str) -> list[Token]:
+        return [HLink(macro)]
 
+    def __func_macro(self, macro: str) -> list[Token]:
+        return [Func(macro, self._funcs)]
 
-            Also, if many fg, bg, bold, and underline tokens are repeated they will be optimized.
-            * `*Bold* *Still bold` translates to `\\x1b[1mBold still bold\\x1b[0m`
-                * You can see that it removes unnecessary tokens as the affect is null.
-            * `[@> red @> green]Green text` translates to `\\x1b[32mGreen text\\x1b[0m`
-                * Here is an instance of overriding the colors. Order matters here, but since you
-                are applying the foreground repeatedly only the last one will show up. So all
-                previous declerations are removed.
+    @staticmethod
+    def __escape_macro(macro: str) -> list[Token]:
+        return [ESCAPE_TOKEN]
+
+    def __custom_macro(self, macro: str) -> list[Token]:
+        """Compile a macro of a registered kind into the tokens of the macro it stands for."""
+        handler = self._custom_macros[macro[0]]
+        name = macro[1:].strip()
+        if isinstance(handler, Mapping):
+            value = handler.get(name)
+        else:
+            value = handler(name)
+
+        if value is None:
+            raise ValueError(f"Invalid Macro \x1b[1;31m{macro}\x1b[0m")
+        if isinstance(value, str):
+            return self.__parse_macro(value)
+        return list(value)
+
+    def register_macro(self, sigil: str, handler: MacroHandler) -> None:
+        """Add a kind of macro that starts with the given sigil, like a theme, `[%error]`, or
+        tags, `[#warn]`. The handler is called once when markup with the macro is parsed, with the
+        name after the sigil. It returns the macro contents the name stands for, like
+        `"@F red @B black"`, or the tokens it compiles to. A mapping of names to macro contents
+        can be given instead of a function. Unknown names raise an error.
+
+        In a chained macro, a registered sigil starts a new macro only after whitespace,
+        `[@F red %error]`.
 
         Args:
-            tokens (list): The list of tokens generated from parsing the SAIML markup
+            sigil (str): The single character that starts the macro
+            handler (MacroHandler): A function or mapping that compiles the macro
 
-        Returns:
-            list: The optimized list of tokens. Bold, underline, fg, and bg tokens are combined into
-            Formatter tokens
+        Raises:
+            ValueError: If the sigil isn't a single character or is used by a builtin macro
         """
-        open_link = False
-        func = None
-        formatter = Formatter()
-        last_format = formatter
-        output = []
+        if len(sigil) != 1 or sigil in SIGILS or sigil.isspace() or sigil in "[]\\*_":
+            raise ValueError(f"Invalid macro sigil {sigil!r}")
 
-        for token in tokens:
-            if isinstance(token, Color):
-                formatter.color = token
-            elif isinstance(token, Bold):
-                formatter.bold = token
-            elif isinstance(token, Underline):
-                formatter.underline = token
-            elif isinstance(token, HLink):
-                if token.closing and open_link:
-                    open_link = False
-                    output.append(token)
-                elif not token.closing and open_link:
-                    token.value = LINK.CLOSE + token.value
-                    output.append(token)
-                else:
-                    open_link = True
-                    output.append(token)
-            elif isinstance(token, Func):
-                func = token
-            else:
-                if not formatter.is_empty():
-                    last_format = formatter
-                    output.append(formatter)
-                    formatter = Formatter()
-                if func is not None:
-                    new_value = func.exec(token.value)
-                    if isinstance(new_value, str):
-                        token.value = new_value
-                        output.append(token)
-                        output.append(last_format)
-                    func = None
-                else:
-                    output.append(token)
+        self._custom_macros[sigil] = handler
+        self._macro_kinds[sigil] = self.__custom_macro
+        self._sigil_pattern = re_compile(f"[{re_escape(SIGILS + ''.join(self._custom_macros))}]")
+        # Compiled markup may have used the previous handler
+        self._cache.clear()
+        self._plain_macros.clear()
 
-        if not formatter.is_empty():
-            last_format = formatter
-            output.append(formatter)
-        if open_link:
-            output.append(HLink("~"))
+    def __uses_custom_macros(self, markup: str) -> bool:
+        return any(sigil in markup for sigil in self._custom_macros)
 
-        return output
-
-    def __parse_tokens(self, string: str):
+    def __parse_tokens(
+        self,
+        string: str,
+        macros: Optional[dict] = None,
+        state: Optional[ParseState] = None,
+        final: bool = True,
+    ) -> list[Token]:
         """Splits the SAIML markup string into tokens. If `*` or `_` are found then a Bold or
         Underline token will be generated respectively. If `[` is found then it marches to the end
         of the macro, `]`, and then parses it. All special characters can be escaped with `\\`
 
         Args:
             text (str): The SAIML markup string that will be parsed
+            macros (dict, optional): Tokens of already parsed macros that are shared between
+            parses. Tokens are looked up here before the macro is parsed.
+            state (ParseState, optional): State carried over from previous chunks of markup
+            final (bool): Whether this is the last chunk of markup. If not, a partial macro or
+            trailing `\\` is kept in the state to be completed by the next chunk.
 
         Raises:
             MacroError: If a macro is not closed
 
         Returns:
-            str: The translated ansi representation of the given sting
+            list[Token]: The unoptimized tokens of the given string
         """
 
-        bold_state = BOLD.POP
+        if state is None:
+            state = ParseState()
+
+        if state.pending:
+            string = state.pending + string
+            state.pending = ""
+
+        bold_state = state.bold
         """BOLD: The current state/value of being bold. Either is bold, or is not bold."""
 
-        underline_state = UNDERLINE.POP
+        underline_state = state.underline
         """UNDERLINE: The current state/value of being underlined. Either is underlined, or is not 
         underlined."""
-        
-        global_escape: bool = False
+
+        global_escape: bool = state.escape
         """The escaped status based on the escape macro."""
 
-        text: list = []
-        """The chunks of text between special tokens."""
+        awaiting_func: Optional[Func] = state.awaiting_func
+        """The function macro that is waiting for the next text block."""
+
+        text: list = state.text
+        """Pieces of plain text between special tokens when the text isn't one contiguous run."""
+
+        carried: int = len(text)
+        """The number of pieces of text that were carried from previous chunks."""
+
+        run_start: int = -1
+        """Start offset of the current contiguous run of plain text. -1 if there is no run."""
+
+        run_end: int = -1
+        """End offset of the current contiguous run of plain text."""
 
         output: list = []
         """Final output of the parse."""
 
-        escaped: bool = False
-        """Indicates whether to escape the next character or not."""
-
         index: int = 0
-        """Current index of walking through the markup string."""
-
-        def consume_macro(index: int, global_escape: bool):
-            """Starts from start of the macro and grabs characters until at the end of the macro.
-
-            Args:
-                index (int): The current index in the string
-
-            Raises:
-                MacroError: If at the end of the markup string and the macro isn't closed
-
-            Returns:
-                int: Index after moving to the end of the macro
-            """
-            start = index
-            index += 1
-            char = string[index]
-            macro = []
-            while char != "]":
-                macro.append(char)
-                index += 1
-                if index == len(string):
-                    raise ValueError(f"Macro's must be closed \n {string[start-1:]}")
-                char = string[index]
-            tokens = self.__parse_macro("".join(macro))
-            if len([token for token in tokens if isinstance(token, Escape)]) % 2 != 0:
-                global_escape = not global_escape
-            output.extend([token for token in tokens if not isinstance(token, Escape)])
-
-            return index, global_escape
-
-        while index < len(string):
-            char = string[index]
-            if char == "*" and not escaped and not global_escape:
-                if len(text) > 0:
-                    output.append(Text("".join(text)))
-                    text = []
+        """Current index of scanning through the markup string."""
+
+        length: int = len(string)
+        search = SPECIAL_CHARS.search
+
+        while index < length:
+            match = search(string, index)
+            start = length if match is None else match.start()
+
+            if start > index:
+                # Extend the current run of text, only copying text if it isn't contiguous
+                if run_end == index:
+                    run_end = start
+                elif run_start == -1 and len(text) == 0:
+                    run_start, run_end = index, start
+                else:
+                    if run_start != -1:
+                        text.append(string[run_start:run_end])
+                    run_start, run_end = index, start
+
+            if match is None:
+                break
+
+            char = string[start]
+            index = start + 1
+            if char == "\\" or (global_escape and char != "["):
+                # The next character, or this character if globally escaped, is always literal
+                if char == "\\":
+                    if index == length:
+                        if not final:
+                            state.pending = char
+                        break
+                    start, index = index, index + 1
+
+                if run_end == start:
+                    run_end = index
+                else:
+                    if run_start != -1:
+                        text.append(string[run_start:run_end])
+                    run_start, run_end = start, index
+                continue
+
+            if char == "[":
+                end = string.find("]", index)
+                if end == -1:
+                    if not final and length - start <= MAX_PENDING:
+                        state.pending = string[start:]
+                        break
+                    if not final:
+                        # A partial macro is only held back up to a limit so memory stays bounded
+                        raise ValueError(
+                            f"Macro's must be closed \n {string[max(start-1, 0):start + 80]}"
+                        )
+                    raise ValueError(f"Macro's must be closed \n {string[max(start-1, 0):]}")
+
+            if run_start != -1 or len(text) > 0:
+                output.append(self.__text(string, run_start, run_end, text))
+                awaiting_func = None
+                run_start = run_end = -1
+                text = []
+                carried = state.text_length = 0
+
+            if char == "[":
+                macro = string[index:end]
+                if macros is None:
+                    tokens = self.__parse_macro(macro)
+                else:
+                    tokens = macros.get(macro)
+                    if tokens is None:
+                        tokens = macros[macro] = self.__parse_macro(macro)
+
+                for token in tokens:
+                    op = token.op
+                    if op == Op.ESCAPE:
+                        global_escape = not global_escape
+                        continue
+                    elif op == Op.FUNC:
+                        awaiting_func = token
+                    elif op == Op.RESET:
+                        awaiting_func = None
+                    output.append(token)
+                index = end + 1
+            elif char == "*":
                 bold_state = BOLD.inverse(bold_state)
-                output.append(Bold(bold_state))
-            elif char == "_" and not escaped and not global_escape:
-                if len(text) > 0:
-                    output.append(Text("".join(text)))
-                    text = []
-                underline_state = UNDERLINE.inverse(underline_state)
-                output.append(Underline(underline_state))
-            elif char == "[" and not escaped:
-                if len(text) > 0:
-                    output.append(Text("".join(text)))
-                    text = []
-                index, global_escape = consume_macro(index, global_escape)
-            elif char == "\\" and not escaped:
-                escaped = True
+                output.append(BOLD_TOKENS[bold_state])
             else:
-                text.append(char)
-                escaped = False
+                underline_state = UNDERLINE.inverse(underline_state)
+                output.append(UNDERLINE_TOKENS[underline_state])
 
-            index += 1
+        if run_start != -1 or len(text) > 0:
+            if final or awaiting_func is None:
+                output.append(self.__text(string, run_start, run_end, text))
+                awaiting_func = None
+                text = []
+                state.text_length = 0
+            else:
+                # Text for a function macro is carried to the next chunk
+                if run_start != -1:
+                    text.append(string[run_start:run_end])
+                state.text_length += sum(len(piece) for piece in text[carried:])
+                if state.text_length > MAX_FUNC_TEXT:
+                    # The function needs all of its text, so it is only held back up to a limit
+                    raise ValueError(
+                        f"Function macro text must be at most {MAX_FUNC_TEXT} characters when "
+                        f"streamed \n {text[0][:80]}"
+                    )
 
-        if len(text) > 0:
-            output.append(Text("".join(text)))
-            text = []
+        state.bold = bold_state
+        state.underline = underline_state
+        state.escape = global_escape
+        state.awaiting_func = awaiting_func
+        state.text = text
+        return output
 
-        return "".join(str(token) for token in self.__optimize(output)) + RESET
+    @staticmethod
+    def __text(string: str, run_start: int, run_end: int, text: list) -> Text:
+        """Create a text token from the current run of text. A single contiguous run references
+        the markup by offsets instead of copying it.
+        """
+        if len(text) == 0:
+            return Text(string, run_start, run_end)
+        if run_start != -1:
+            text.append(string[run_start:run_end])
+        return Text("".join(text))
 
-    def define(self, name: str, callback: Callable) -> None:
+    def define(
+        self,
+        name: str,
+        callback: Callable,
+        pure: bool = False,
+        maxsize: Optional[int] = FUNC_CACHE_SIZE,
+    ) -> None:
         """Adds a callable function to the functions macro. This allows it to be called from withing
         a macro. Functions must return a string, if it doesn't it will ignore the the return. It
         will automaticaly grab the next text block and use it for the input of the function.
         The function should manipulate the text and return the result.
 
+        Arguments after the name in the macro, `[^name arg1, arg2]`, are split when the markup is
+        parsed and passed to the function after the text.
+
         Args:
             name (str): The name associated with the function. Used in the macro
             callback (Callable): The function to call when the macro is executed
+            pure (bool): Whether the function always returns the same result for the same text and
+            arguments. The results of pure functions are cached, as is the rendered markup that
+            calls them. Markup that calls a function that isn't pure is rendered again, calling
+            the function, every time it is parsed.
+            maxsize (int): The number of results a pure function keeps, least recently used results
+            are removed first. `None` keeps every result.
         """
-        self._funcs.update({name: callback})
+        if pure:
+            callback = lru_cache(maxsize=maxsize)(callback)
+        name = name.lower()
+        self._funcs[name] = callback
+        for parser in list(_PARSERS):
+            if parser._funcs is self._funcs:
+                parser._cache.invalidate(name)
+
+    def compile(self, markup: str) -> CompiledMarkup:
+        """Parses a SAIML markup string into a reusable compiled object. Compiled markup is kept
+        in a least recently used cache so parsing the same markup again is a lookup.
+
+        Args:
+            markup (str): The SAIML markup string
 
-    def parse(self, text: str) -> str:
+        Returns:
+            CompiledMarkup: The parsed markup along with its ansi translation
+        """
+        return self.__compile(markup)
+
+    def __compile(self, markup: str, macros: Optional[dict] = None) -> CompiledMarkup:
+        compiled = self._cache.get(markup)
+        if (
+            compiled is None
+            and self._disk is not None
+            and not (self._custom_macros and self.__uses_custom_macros(markup))
+        ):
+            compiled = self._disk.get(markup, self._backend)
+            if compiled is not None:
+                self._cache.put(compiled)
+
+        stats = self._stats
+        if stats is not None:
+            stats.count_input(markup)
+            if compiled is None:
+                stats.cache_misses += 1
+            else:
+                stats.cache_hits += 1
+
+        if compiled is None:
+            if stats is None:
+                tokens = self.__parse_tokens(markup, macros)
+            else:
+                start = perf_counter()
+                tokens = self.__parse_tokens(markup, macros)
+                stats.add_time("tokenize", start)
+
+            funcs = {token.value for token in tokens if token.op == Op.FUNC}
+            # Functions that aren't pure are called every time the markup is rendered
+            dynamic = not all(_pure(self._funcs.get(func)) for func in funcs)
+            value = ""
+            if not dynamic:
+                value = self.__render_tokens(tokens, self._backend)
+
+            compiled = CompiledMarkup(markup, tokens, value, funcs, self._backend, dynamic)
+            self._cache.put(compiled)
+            if self._disk is not None and not (
+                self._custom_macros and self.__uses_custom_macros(markup)
+            ):
+                # Registered macros may compile differently in another process
+                self._disk.add(compiled, self._backend)
+        return compiled
+
+    def parse(self, text: str, backend: Union[str, Backend, None] = None) -> str:
         """Parses a SAIML markup string and returns the translated ansi equivilent.
 
+        With the plain backend, markup without function macros or escape toggles is stripped
+        instead of parsed. Its macros are still checked, so malformed markup raises the same
+        error for every backend.
+
         Args:
             text (str): The SAIML markup string
+            backend (str | Backend, optional): The render target. Defaults to the parsers backend.
 
         Returns:
             str: The ansi translated string
         """
-        return self.__parse_tokens(text)
+        backend = self.__get_backend(backend)
+        if type(backend) is PlainBackend:
+            value = self.__plain(text)
+            if value is not None:
+                return value
+
+        value = self.__render(self.__compile(text), backend)
+        if self._stats is not None:
+            self._stats.count_output(value)
+        return value
+
+    def __render(self, compiled: CompiledMarkup, backend: Backend) -> str:
+        """Get the rendered value of compiled markup. Dynamic markup is rendered again."""
+        if compiled.dynamic:
+            return self.__render_tokens(compiled.tokens, backend)
+        return compiled.render(backend)
+
+    def __render_tokens(self, tokens: list[Token], backend: Backend) -> str:
+        state = ParseState()
+        stats = state.stats = self._stats
+        if stats is None:
+            return backend.render(tokens, state)
+        start = perf_counter()
+        value = backend.render(tokens, state)
+        stats.add_time("render", start)
+        return value
+
+    def render_tokens(self, tokens: list[Token], backend: Union[str, Backend, None] = None) -> str:
+        """Render tokens that were built directly instead of parsed from markup, like the colors,
+        links, and functions of `style()`.
+
+        Args:
+            tokens (list[Token]): The tokens to render
+            backend (str | Backend, optional): The render target. Defaults to the parsers backend.
+
+        Returns:
+            str: The rendered string
+        """
+        state = ParseState()
+        state.stats = self._stats
+        value = self.__get_backend(backend).render(tokens, state)
+        if self._stats is not None:
+            self._stats.count_output(value)
+        return value
+
+    def stream(self, backend: Union[str, Backend, None] = None) -> MarkupStream:
+        """Create a parser for markup that arrives in chunks. Formatting, open hyperlinks, the
+        global escape, and partially read macros are carried between chunks.
+
+        Args:
+            backend (str | Backend, optional): The render target. Defaults to the parsers backend.
+
+        Returns:
+            MarkupStream: Object with `feed(chunk)` and `close()` that return the rendered markup
+        """
+        return MarkupStream(self, self.__get_backend(backend))
+
+    def _render_chunk(self, chunk: str, state: ParseState, backend: Backend, final: bool) -> str:
+        """Parse and render a chunk of markup continuing from the given state."""
+        stats = state.stats = self._stats
+        if stats is None:
+            return backend.render(self.__parse_tokens(chunk, state=state, final=final), state, final)
+
+        stats.count_input(chunk)
+        start = perf_counter()
+        tokens = self.__parse_tokens(chunk, state=state, final=final)
+        stats.add_time("tokenize", start)
+        start = perf_counter()
+        output = backend.render(tokens, state, final)
+        stats.add_time("render", start)
+        stats.count_output(output)
+        return output
+
+    def template(self, markup: str, backend: Union[str, Backend, None] = None) -> MarkupTemplate:
+        """Create a template from markup with `str.format` style fields. The markup around the
+        fields is parsed once and only the values are formatted in when it is rendered.
+
+        Example:
+            ```python
+            failed = SAIML.template("[@F red]{user}[@F] failed in {ms}ms")
+            failed.render(user="fox", ms=12)
+            ```
+
+        Args:
+            markup (str): The SAIML markup string with fields
+            backend (str | Backend, optional): The render target. Defaults to the parsers backend.
+
+        Returns:
+            MarkupTemplate: Object with `render(*args, **values)` that returns the rendered string
+        """
+        from .template import MarkupTemplate
+
+        return MarkupTemplate(self, markup, self.__get_backend(backend))
+
+    def _render_template(self, skeleton: str, holes: list[str], backend: Backend) -> Optional[str]:
+        """Render the markup of a template where each field is a placeholder character. Returns
+        None if a placeholder is the input to a function macro as the result of the function
+        depends on the value of the field, or if a function macro isn't pure and has to be called
+        every time the template is rendered.
+        """
+        tokens = self.__parse_tokens(skeleton)
+
+        func = False
+        for token in tokens:
+            if isinstance(token, Func):
+                if not _pure(token.caller):
+                    return None
+                func = True
+            elif isinstance(token, (Text, Reset)):
+                if func and isinstance(token, Text) and any(hole in token.value for hole in holes):
+                    return None
+                func = False
+
+        return backend.render(tokens, ParseState())
+
+    def parse_many(
+        self, markup: Iterable[str], backend: Union[str, Backend, None] = None
+    ) -> list[str]:
+        """Parses many SAIML markup strings at once. Identical strings are rendered from the
+        parsers cache and parsed macros are shared across the batch.
+
+        Args:
+            markup (Iterable[str]): The SAIML markup strings
+            backend (str | Backend, optional): The render target. Defaults to the parsers backend.
+
+        Returns:
+            list[str]: The ansi translated strings in the same order as the given markup
+        """
+        return list(self.iparse_many(markup, backend))
+
+    def iparse_many(
+        self, markup: Iterable[str], backend: Union[str, Backend, None] = None
+    ) -> Iterator[str]:
+        """Generator version of `parse_many`. Each markup string is parsed as it is consumed from
+        the iterable. Memory stays bounded for any number of strings; repeated strings are found in
+        the parsers cache and at most `MACRO_BATCH_SIZE` parsed macros are shared.
+
+        Args:
+            markup (Iterable[str]): The SAIML markup strings
+            backend (str | Backend, optional): The render target. Defaults to the parsers backend.
+
+        Yields:
+            Iterator[str]: The ansi translated strings in the same order as the given markup
+        """
+        backend = self.__get_backend(backend)
+        macros: dict[str, list[Token]] = {}
+
+        for text in markup:
+            if len(macros) > MACRO_BATCH_SIZE:
+                macros.clear()
+            value = self.__render(self.__compile(text, macros), backend)
+            if self._stats is not None:
+                self._stats.count_output(value)
+            yield value
+
+    def enable_stats(self, enabled: bool = True) -> None:
+        """Start or stop collecting parser stats. Starting keeps any stats already collected.
+
+        Args:
+            enabled (bool): Whether stats are collected
+        """
+        if not enabled:
+            self._stats = None
+        elif self._stats is None:
+            self._stats = ParserStats()
+
+    def stats(self) -> ParserStats:
+        """Get the stats collected since `enable_stats` was called. Empty stats are returned if
+        stats are not being collected.
+
+        Returns:
+            ParserStats: Parses, bytes in and out, cache hits, macros by kind, function macro calls
+            and time, and the time spent in each phase of parsing
+        """
+        return ParserStats() if self._stats is None else self._stats
+
+    @contextmanager
+    def profile(self) -> Iterator[ParserStats]:
+        """Collect parser stats for a block of code. If stats are already being collected, the
+        stats of the block are added to them when the block exits.
+
+        Example:
+            ```python
+            with SAIML.profile() as stats:
+                SAIML.parse("[@F red]Hello[@F] world")
+            print(stats.as_dict())
+            ```
+
+        Yields:
+            Iterator[ParserStats]: The stats collected in the block
+        """
+        previous = self._stats
+        stats = self._stats = ParserStats()
+        try:
+            yield stats
+        finally:
+            self._stats = previous
+            if previous is not None:
+                previous.merge(stats)
+
+    def configure_cache(
+        self, maxsize: Optional[int] = None, maxbytes: Optional[int] = None
+    ) -> None:
+        """Change the bounds of the compiled markup cache. A maxsize of 0 disables caching.
+
+        Args:
+            maxsize (int, optional): The maximum number of cached markup strings
+            maxbytes (int, optional): The maximum number of bytes held by the cache
+        """
+        self._cache.resize(maxsize, maxbytes)
+
+    def cache_info(self) -> CacheInfo:
+        """Get the hits, misses, and size of the compiled markup cache."""
+        return self._cache.info()
+
+    def clear_cache(self) -> None:
+        """Remove all compiled markup from the cache and reset its counters."""
+        self._cache.clear()
+
+    def enable_disk_cache(
+        self,
+        enabled: bool = True,
+        path: Union[str, PathLike, None] = None,
+        maxsize: int = 4096,
+    ) -> None:
+        """Keep compiled markup in a file shared between processes so markup compiled by an earlier
+        process is rendered without being parsed. The file is read the first time markup isn't
+        in the cache, and new markup is saved when the process exits or with `save_disk_cache`.
+
+        Args:
+            enabled (bool): Whether to use the disk cache
+            path (str | PathLike, optional): The cache file. Defaults to a file for this version of
+            the library in `~/.cache/saimll`, or `$XDG_CACHE_HOME/saimll`.
+            maxsize (int): The most entries kept in the file. Disabling the cache, or enabling it
+            again, saves the new markup first.
+        """
+        if self._disk is not None:
+            atexit.unregister(self._disk._save_at_exit)
+            self._disk._save_at_exit()
+            self._disk = None
+
+        if enabled:
+            from .disk import DiskCache
+
+            self._disk = DiskCache(path, maxsize)
+            atexit.register(self._disk._save_at_exit)
+
+    def save_disk_cache(self) -> int:
+        """Write newly compiled markup to the disk cache file.
+
+        Returns:
+            int: The number of entries in the file, 0 if nothing was written
+        """
+        if self._disk is None:
+            return 0
+        return self._disk.save()
 
     def encode(self, text: str) -> str:
         """"""
 
-    def print(self, *args) -> None:
+    def render_into(
+        self,
+        markup: Union[str, Iterable[str]],
+        write: Writer,
+        backend: Union[str, Backend, None] = None,
+    ) -> None:
+        """Render markup straight into a writer without building the whole output string.
+
+        A markup string is rendered in one pass so the output is always the same as `parse`.
+        Markup up to `RENDER_CHUNK_SIZE` characters is compiled and cached, longer markup is
+        rendered without being cached. An iterable of markup chunks, like an open file, is parsed
+        and written one chunk at a time.
+
+        Args:
+            markup (str | Iterable[str]): The SAIML markup string or chunks of markup
+            write (Writer): A write callable, a text stream like `io.StringIO`, or a bytearray
+            which the output is utf-8 encoded into
+            backend (str | Backend, optional): The render target. Defaults to the parsers backend.
+        """
+        write = _get_write(write)
+        backend = self.__get_backend(backend)
+
+        if isinstance(markup, str):
+            value = self.__plain(markup) if type(backend) is PlainBackend else None
+            if value is None:
+                if len(markup) <= RENDER_CHUNK_SIZE:
+                    value = self.__render(self.__compile(markup), backend)
+                elif self._stats is None:
+                    value = self.__render_tokens(self.__parse_tokens(markup), backend)
+                else:
+                    self._stats.count_input(markup)
+                    start = perf_counter()
+                    tokens = self.__parse_tokens(markup)
+                    self._stats.add_time("tokenize", start)
+                    value = self.__render_tokens(tokens, backend)
+                if self._stats is not None:
+                    self._stats.count_output(value)
+            write(value)
+            return
+
+        state = ParseState()
+        for chunk in markup:
+            output = self._render_chunk(chunk, state, backend, final=False)
+            if output:
+                write(output)
+        output = self._render_chunk("", state, backend, final=True)
+        if output:
+            write(output)
+
+    def print(
+        self,
+        *args: Any,
+        sep: str = " ",
+        end: str = "\n",
+        file: Optional[IO[str]] = None,
+        flush: bool = False,
+    ) -> None:
         """Works similare to the buildin print function.
         Takes all arguments and passes them through the parser.
         When finished it will print the results to the screen with a space inbetween the args.
 
+        Each argument is rendered straight into the file so large output never builds an
+        intermediate string. Colors are lowered to what the file can display and when color is
+        off, like when writing to a pipe or with `NO_COLOR`, only the text is written.
+
         Args:
             *args (Any): Any argument that is a string or has a __str__ implementation
+            sep (str): Written between each argument. Defaults to a space.
+            end (str): Written after the last argument. Defaults to a newline.
+            file (IO[str], optional): The stream to write to. Defaults to `sys.stdout`.
+            flush (bool): Whether to flush the stream after writing
         """
-        parsed = []
-        for arg in args:
-            parsed.append(self.parse(str(arg)))
+        if file is None:
+            file = sys.stdout
+            if file is None:
+                return
+
+        write = file.write
+        backend = self.output_backend(file)
+        for index, arg in enumerate(args):
+            if index > 0:
+                write(sep)
+            self.render_into(str(arg), write, backend)
+        write(end)
 
-        print(*parsed)
+        if flush:
+            file.flush()
 
     @staticmethod
     def escape(text: str) -> str:
@@ -294,28 +966,64 @@ class SAIMLParser:
         Returns:
             str: The escaped/encoded version of the given string
         """
-        schars = ["\\", "*", "_", "["]
-        for char in schars:
-            text = f"\\{char}".join(text.split(char))
-        return text
+        # Each replace is a single scan in C that returns the same string if there is no match
+        return (
+            text.replace("\\", "\\\\")
+            .replace("*", "\\*")
+            .replace("_", "\\_")
+            .replace("[", "\\[")
+        )
 
     @staticmethod
-    def strip(text: str) -> str:
-        """Removes SAIML specific markup.
+    def escape_many(texts: Iterable[str]) -> list[str]:
+        """Escape many strings at once. The strings are escaped together as one string which is
+        much faster than escaping each string on it's own.
+
+        Args:
+            texts (Iterable[str]): The strings to encode/escape
+
+        Returns:
+            list[str]: The escaped/encoded strings in the same order as the given strings
+        """
+        texts = list(texts)
+        if len(texts) == 0:
+            return []
+
+        joined = BATCH_SEPARATOR.join(texts)
+        if joined.count(BATCH_SEPARATOR) != len(texts) - 1:
+            return [SAIMLParser.escape(text) for text in texts]
+        return SAIMLParser.escape(joined).split(BATCH_SEPARATOR)
+
+    @staticmethod
+    def strip(text: str, mode: int = StripMode.BOTH) -> str:
+        """Removes SAIML specific markup, ansi escape sequences, or both.
 
         Args:
             text (str): String to strip markup from.
+            mode (int): `StripMode.MARKUP`, `StripMode.ANSI`, or `StripMode.BOTH`. Defaults to both.
 
         Returns:
-            str: Version of text free from markup.S
+            str: Version of text free from markup.
         """
-        from re import sub
+        return strip(text, mode)
 
-        return sub(
-            r"\x1b\[(\d{0,2};?)*m|(?<!\\)\*|(?<!\\)_|(?<!\\)\[[^\[\]]+\]|\\",
-            "",
-            text,
-        )
+    @staticmethod
+    def strip_stream(
+        src: IO[str], dst: IO[str], mode: int = StripMode.BOTH, chunk_size: int = 64 * 1024
+    ) -> int:
+        """Removes markup, ansi, or both from a text stream, like a large log file, reading it in
+        fixed size chunks.
+
+        Args:
+            src (IO[str]): The stream to read from
+            dst (IO[str]): The stream to write the stripped text to
+            mode (int): `StripMode.MARKUP`, `StripMode.ANSI`, or `StripMode.BOTH`. Defaults to both.
+            chunk_size (int): The number of characters read at a time
+
+        Returns:
+            int: The number of characters written
+        """
+        return strip_stream(src, dst, mode, chunk_size)
 
 
 SAIML = SAIMLParser()
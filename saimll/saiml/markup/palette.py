@@ -0,0 +1,223 @@
+"""The xterm 256 color palette and mapping of color codes between color depths.
+
+Color codes are the SGR parameters generated by the color macros; `31`, `38;5;9`, or
+`38;2;255;0;0`. They can be mapped down to the 256 color xterm palette or the 16 color ansi
+palette, and to an rgb value for targets like html.
+"""
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Optional
+
+__all__ = [
+    "SYSTEM_COLORS",
+    "CUBE_LEVELS",
+    "SYSTEM_LEVELS",
+    "xterm_rgb",
+    "rgb_to_xterm",
+    "rgb_to_ansi16",
+    "code_rgb",
+    "downsample",
+]
+
+SYSTEM_COLORS: tuple[tuple[int, int, int], ...] = (
+    (0, 0, 0),
+    (128, 0, 0),
+    (0, 128, 0),
+    (128, 128, 0),
+    (0, 0, 128),
+    (128, 0, 128),
+    (0, 128, 128),
+    (192, 192, 192),
+    (128, 128, 128),
+    (255, 0, 0),
+    (0, 255, 0),
+    (255, 255, 0),
+    (0, 0, 255),
+    (255, 0, 255),
+    (0, 255, 255),
+    (255, 255, 255),
+)
+"""The rgb values of the 16 system colors, xterm indexes 0-15."""
+
+CUBE_LEVELS: tuple[int, ...] = (0, 95, 135, 175, 215, 255)
+"""The channel values of the 6x6x6 color cube, xterm indexes 16-231."""
+
+SYSTEM_LEVELS: tuple[int, ...] = (0, 128, 192, 255)
+"""The channel values used by the system colors."""
+
+_SQUARES: tuple[tuple[int, ...], ...] = tuple(
+    tuple((value - level) ** 2 for value in range(256)) for level in SYSTEM_LEVELS
+)
+"""The squared distance from each system level to every channel value."""
+
+_SYSTEM_LEVEL_INDEXES: tuple[tuple[int, int, int], ...] = tuple(
+    tuple(SYSTEM_LEVELS.index(channel) for channel in color) for color in SYSTEM_COLORS
+)
+"""The index into `SYSTEM_LEVELS` of each channel of each system color."""
+
+
+def xterm_rgb(index: int) -> tuple[int, int, int]:
+    """Get the rgb value of an xterm color index.
+
+    Args:
+        index (int): The xterm index from 0 to 255
+
+    Returns:
+        tuple[int, int, int]: The rgb value
+    """
+    if index < 16:
+        return SYSTEM_COLORS[index]
+    if index < 232:
+        index -= 16
+        return (CUBE_LEVELS[index // 36], CUBE_LEVELS[index // 6 % 6], CUBE_LEVELS[index % 6])
+    gray = 8 + (index - 232) * 10
+    return (gray, gray, gray)
+
+
+def _distance(first: tuple[int, int, int], second: tuple[int, int, int]) -> int:
+    return (
+        (first[0] - second[0]) ** 2 + (first[1] - second[1]) ** 2 + (first[2] - second[2]) ** 2
+    )
+
+
+def _perceptual_distance(first: tuple[int, int, int], second: tuple[int, int, int]) -> int:
+    """The "redmean" distance, a cheap approximation of how different two colors look. Green is
+    weighted the most and red and blue are weighted by how red the colors are."""
+    mean = (first[0] + second[0]) >> 1
+    red, green, blue = first[0] - second[0], first[1] - second[1], first[2] - second[2]
+    return (
+        (((512 + mean) * red * red) >> 8) + 4 * green * green + (((767 - mean) * blue * blue) >> 8)
+    )
+
+
+def _cube_index(channel: int) -> int:
+    """Index of the closest cube level to the channel value."""
+    if channel < 48:
+        return 0
+    if channel < 115:
+        return 1
+    return (channel - 35) // 40
+
+
+@lru_cache(maxsize=4096)
+def rgb_to_xterm(red: int, green: int, blue: int, perceptual: bool = False) -> int:
+    """Get the xterm index, from 16 to 255, that is closest to the rgb value. Only the color cube
+    and grayscale ramp are used as the system colors vary between terminals.
+
+    The closest cube color and gray are found directly from the channel values, so only those
+    two candidates are compared.
+
+    Args:
+        red (int): The red channel from 0 to 255
+        green (int): The green channel from 0 to 255
+        blue (int): The blue channel from 0 to 255
+        perceptual (bool): Compare the candidates by how different they look instead of by
+        their euclidean distance
+
+    Returns:
+        int: The xterm color index
+    """
+    rgb = (red, green, blue)
+    r, g, b = _cube_index(red), _cube_index(green), _cube_index(blue)
+    cube = (CUBE_LEVELS[r], CUBE_LEVELS[g], CUBE_LEVELS[b])
+
+    average = (red + green + blue) // 3
+    gray = 23 if average > 238 else max(0, (average - 3) // 10)
+    level = 8 + gray * 10
+
+    distance = _perceptual_distance if perceptual else _distance
+    if distance((level, level, level), rgb) < distance(cube, rgb):
+        return 232 + gray
+    return 16 + 36 * r + 6 * g + b
+
+
+@lru_cache(maxsize=4096)
+def rgb_to_ansi16(red: int, green: int, blue: int, perceptual: bool = False) -> int:
+    """Get the system color index, from 0 to 15, that is closest to the rgb value.
+
+    The system colors only use four channel values, so the distance to each of them is looked up
+    for each channel and the distance to a system color is the sum of three of them.
+
+    Args:
+        red (int): The red channel from 0 to 255
+        green (int): The green channel from 0 to 255
+        blue (int): The blue channel from 0 to 255
+        perceptual (bool): Compare the system colors by how different they look instead of by
+        their euclidean distance
+
+    Returns:
+        int: The system color index
+    """
+    reds = [squares[red] for squares in _SQUARES]
+    greens = [squares[green] for squares in _SQUARES]
+    blues = [squares[blue] for squares in _SQUARES]
+    if perceptual:
+        # The same as `_perceptual_distance`, the weights only depend on the red levels
+        means = [(red + level) >> 1 for level in SYSTEM_LEVELS]
+        reds = [((512 + mean) * square) >> 8 for mean, square in zip(means, reds)]
+        distances = [
+            reds[r] + 4 * greens[g] + (((767 - means[r]) * blues[b]) >> 8)
+            for r, g, b in _SYSTEM_LEVEL_INDEXES
+        ]
+    else:
+        distances = [reds[r] + greens[g] + blues[b] for r, g, b in _SYSTEM_LEVEL_INDEXES]
+    return distances.index(min(distances))
+
+
+@lru_cache(maxsize=1024)
+def code_rgb(code: str) -> Optional[tuple[int, int, int]]:
+    """Get the rgb value of a fg or bg color code.
+
+    Args:
+        code (str): The color code, `31`, `38;5;9`, or `38;2;255;0;0`
+
+    Returns:
+        tuple[int, int, int] | None: The rgb value or None if the code isn't a color
+    """
+    params = code.split(";")
+    try:
+        if len(params) == 1:
+            value = int(params[0])
+            if 30 <= value <= 37 or 40 <= value <= 47:
+                return SYSTEM_COLORS[value % 10]
+            if 90 <= value <= 97 or 100 <= value <= 107:
+                return SYSTEM_COLORS[value % 10 + 8]
+        elif len(params) == 3 and params[1] == "5":
+            return xterm_rgb(min(int(params[2]), 255))
+        elif len(params) == 5 and params[1] == "2":
+            return tuple(min(int(channel), 255) for channel in params[2:])
+    except ValueError:
+        pass
+    return None
+
+
+@lru_cache(maxsize=1024)
+def downsample(code: str, colors: int) -> str:
+    """Map a fg or bg color code to a code that is available with the given number of colors.
+
+    Args:
+        code (str): The color code, `31`, `38;5;9`, or `38;2;255;0;0`
+        colors (int): The number of colors available; 16, 256, or more for truecolor
+
+    Returns:
+        str: The color code that is closest to the original color
+    """
+    params = code.split(";")
+    if colors > 256 or len(params) == 1:
+        return code
+
+    rgb = code_rgb(code)
+    if rgb is None:
+        return code
+
+    if colors == 256:
+        if params[1] == "5":
+            return code
+        return f"{params[0]};5;{rgb_to_xterm(*rgb)}"
+
+    index = rgb_to_ansi16(*rgb)
+    base = int(params[0]) - 8
+    if index < 8:
+        return str(base + index)
+    return str(base + 60 + index - 8)
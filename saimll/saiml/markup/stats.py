@@ -0,0 +1,155 @@
+"""Opt-in instrumentation for the SAIML parser.
+
+A `ParserStats` collects counters and per-phase timings while it is installed on a parser, with
+`SAIML.enable_stats()` or for a block with `SAIML.profile()`. When no stats are installed the
+parser only checks for None at a few coarse points, once per parse, once per newly parsed macro,
+and once per function macro call.
+
+Phases nest. `tokenize` includes `macros`, which includes `colors`, and `render` includes `funcs`.
+Times are in seconds.
+"""
+from __future__ import annotations
+
+from time import perf_counter
+from typing import Any, Optional
+
+from .tokens import Func, Op, Token
+
+__all__ = [
+    "ParserStats",
+    "MACRO_KINDS",
+    "PHASES",
+]
+
+MACRO_KINDS = {
+    Op.COLOR: "color",
+    Op.HLINK: "link",
+    Op.FUNC: "func",
+    Op.RESET: "reset",
+    Op.ESCAPE: "escape",
+}
+"""The name each kind of macro token is counted under."""
+
+PHASES = ("tokenize", "macros", "colors", "render", "funcs")
+"""The timed phases of a parse."""
+
+
+class ParserStats:
+    """Counters and timers collected while parsing markup."""
+
+    def __init__(self) -> None:
+        self.parses: int = 0
+        """Markup strings, or stream chunks, given to the parser."""
+
+        self.bytes_in: int = 0
+        """Utf-8 encoded size of the markup given to the parser."""
+
+        self.bytes_out: int = 0
+        """Utf-8 encoded size of the rendered output."""
+
+        self.cache_hits: int = 0
+        self.cache_misses: int = 0
+
+        self.macros: dict[str, int] = {}
+        """Number of parsed macros by kind; color, link, func, reset, and escape."""
+
+        self.func_calls: dict[str, int] = {}
+        """Number of calls of each function macro."""
+
+        self.func_time: dict[str, float] = {}
+        """Cumulative time spent in each function macro."""
+
+        self.func_hits: dict[str, int] = {}
+        """Number of calls of each pure function macro that were answered from its cache."""
+
+        self.phases: dict[str, float] = dict.fromkeys(PHASES, 0.0)
+        """Cumulative time spent in each phase of parsing."""
+
+    def add_time(self, phase: str, start: float) -> None:
+        """Add the time since `start`, a `perf_counter` value, to a phase."""
+        self.phases[phase] += perf_counter() - start
+
+    def count_input(self, markup: str) -> None:
+        """Count a markup string or chunk given to the parser."""
+        self.parses += 1
+        self.bytes_in += len(markup.encode("utf-8", "surrogatepass"))
+
+    def count_output(self, output: str) -> None:
+        """Count rendered output."""
+        self.bytes_out += len(output.encode("utf-8", "surrogatepass"))
+
+    def count_macros(self, tokens: list[Token]) -> None:
+        """Count the kinds of the tokens of a parsed macro."""
+        for token in tokens:
+            kind = MACRO_KINDS.get(token.op)
+            if kind is not None:
+                self.macros[kind] = self.macros.get(kind, 0) + 1
+
+    def call(self, func: Func, text: str) -> Any:
+        """Call a function macro, counting the call, whether a pure function had the result
+        cached, and timing it."""
+        cache_info = getattr(func.caller, "cache_info", None)
+        hits = cache_info().hits if cache_info is not None else 0
+        start = perf_counter()
+        try:
+            return func.exec(text)
+        finally:
+            elapsed = perf_counter() - start
+            name = func.value
+            self.func_calls[name] = self.func_calls.get(name, 0) + 1
+            self.func_time[name] = self.func_time.get(name, 0.0) + elapsed
+            self.phases["funcs"] += elapsed
+            if cache_info is not None:
+                hit = int(cache_info().hits > hits)
+                self.func_hits[name] = self.func_hits.get(name, 0) + hit
+
+    def func_hit_rate(self, name: str) -> Optional[float]:
+        """The fraction of calls of a pure function macro that were answered from its cache.
+
+        Args:
+            name (str): The name of the function macro
+
+        Returns:
+            float | None: The hit rate or None if the function isn't pure or wasn't called
+        """
+        if name not in self.func_hits or self.func_calls.get(name, 0) == 0:
+            return None
+        return self.func_hits[name] / self.func_calls[name]
+
+    def merge(self, other: ParserStats) -> None:
+        """Add the counters and timers of other stats to these stats."""
+        self.parses += other.parses
+        self.bytes_in += other.bytes_in
+        self.bytes_out += other.bytes_out
+        self.cache_hits += other.cache_hits
+        self.cache_misses += other.cache_misses
+        for mine, theirs in (
+            (self.macros, other.macros),
+            (self.func_calls, other.func_calls),
+            (self.func_time, other.func_time),
+            (self.func_hits, other.func_hits),
+            (self.phases, other.phases),
+        ):
+            for key, value in theirs.items():
+                mine[key] = mine.get(key, 0) + value
+
+    def as_dict(self) -> dict[str, Any]:
+        """The counters and timers as a dictionary."""
+        return {
+            "parses": self.parses,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "macros": dict(self.macros),
+            "func_calls": dict(self.func_calls),
+            "func_time": dict(self.func_time),
+            "func_hits": dict(self.func_hits),
+            "phases": dict(self.phases),
+        }
+
+    def __repr__(self) -> str:
+        return (
+            f"<ParserStats: {self.parses} parses, {self.bytes_in}B in, {self.bytes_out}B out, "
+            f"{self.cache_hits}/{self.cache_hits + self.cache_misses} cache hits>"
+        )
@@ -0,0 +1,130 @@
+"""Incremental parsing of SAIML markup that arrives in chunks.
+
+A `MarkupStream` keeps the state of a parse between chunks; bold and underline toggles, the
+open hyperlink, the global `[$]` escape, a partially read macro, and the current style. Output
+is produced for each chunk as soon as it can be rendered so memory stays bounded by the size of
+a chunk rather than the size of the whole markup. Text for a function macro is the exception, it
+is held back until the function's text ends, up to `MAX_FUNC_TEXT` characters.
+"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Optional
+
+from .emitter import Style
+from .formatting import BOLD, UNDERLINE
+from .tokens import Func
+
+if TYPE_CHECKING:
+    from .backends import Backend
+    from .markup import SAIMLParser
+    from .stats import ParserStats
+
+__all__ = [
+    "ParseState",
+    "MarkupStream",
+    "MAX_PENDING",
+    "MAX_FUNC_TEXT",
+]
+
+MAX_PENDING = 4096
+"""The most characters of a partial macro carried between chunks. A longer partial macro is an
+error so memory stays bounded."""
+
+MAX_FUNC_TEXT = 1024 * 1024
+"""The most characters of text carried between chunks while it waits for a function macro. A
+function is always given its whole text, so longer text is an error instead of being split."""
+
+
+class ParseState:
+    """The state of parsing markup that is carried from one chunk of markup to the next."""
+
+    def __init__(self) -> None:
+        self.bold: int = BOLD.POP
+        """The current bold toggle."""
+
+        self.underline: int = UNDERLINE.POP
+        """The current underline toggle."""
+
+        self.escape: bool = False
+        """Whether the global escape macro, `[$]`, is active."""
+
+        self.pending: str = ""
+        """Markup that could not be parsed yet. Either a partial macro or a trailing `\\`. At
+        most `MAX_PENDING` characters."""
+
+        self.text: list[str] = []
+        """Text held back because it is the input to a function macro that isn't complete."""
+
+        self.text_length: int = 0
+        """The number of characters held back in `text`. At most `MAX_FUNC_TEXT`."""
+
+        self.awaiting_func: Optional[Func] = None
+        """The function macro that is waiting for it's text block, if any."""
+
+        self.func: Optional[Func] = None
+        """The function macro that will be applied to the next text block."""
+
+        self.style: Style = Style()
+        """The style requested by the markup so far."""
+
+        self.terminal: Style = Style()
+        """The style that has been written to the output."""
+
+        self.stats: Optional[ParserStats] = None
+        """Stats that function macro calls are recorded in while the parser is instrumented."""
+
+
+class MarkupStream:
+    """Parse SAIML markup incrementally. Each call to `feed` returns the rendered translation of as
+    much of the markup as can be rendered. `close` flushes what is left and resets the terminal
+    formatting.
+
+    Example:
+        ```python
+        stream = SAIML.stream()
+        for chunk in source:
+            sys.stdout.write(stream.feed(chunk))
+        sys.stdout.write(stream.close())
+        ```
+    """
+
+    def __init__(self, parser: SAIMLParser, backend: Backend) -> None:
+        self._parser = parser
+        self._backend = backend
+        self._state = ParseState()
+        self._closed = False
+
+    @property
+    def closed(self) -> bool:
+        """True if the stream has been closed."""
+        return self._closed
+
+    def feed(self, chunk: str) -> str:
+        """Parse the next chunk of markup.
+
+        Args:
+            chunk (str): The next chunk of the SAIML markup
+
+        Raises:
+            ValueError: If the stream is already closed
+
+        Returns:
+            str: The rendered markup that could be rendered so far
+        """
+        if self._closed:
+            raise ValueError("Can not feed a closed markup stream")
+        return self._parser._render_chunk(chunk, self._state, self._backend, final=False)
+
+    def close(self) -> str:
+        """Parse any remaining markup and reset the formatting.
+
+        Raises:
+            ValueError: If a macro was left open
+
+        Returns:
+            str: The rendered remaining markup
+        """
+        if self._closed:
+            return ""
+        self._closed = True
+        return self._parser._render_chunk("", self._state, self._backend, final=True)
@@ -0,0 +1,148 @@
+"""Remove SAIML markup and ansi escape sequences from text.
+
+Each mode is a single precompiled pattern so text is stripped in one pass. Ansi sequences are
+matched completely, including truecolor SGR, `\\x1b[38;2;r;g;bm`, and OSC 8 hyperlinks,
+`\\x1b]8;;url\\x1b\\\\`. When only markup is stripped, ansi sequences are kept as is.
+"""
+from __future__ import annotations
+
+from functools import lru_cache
+from re import DOTALL
+from re import compile as re_compile
+from typing import IO
+
+__all__ = [
+    "StripMode",
+    "strip",
+    "strip_stream",
+]
+
+ANSI = r"\x1b\[[0-?]*[ -/]*[@-~]|\x1b\][^\x07\x1b]*(?:\x07|\x1b\\)"
+"""Control sequences, like SGR, and operating system commands, like OSC 8 hyperlinks."""
+
+MARKUP = r"\\([^\x1b]?)|[*_]|\[[^\]]*\]"
+"""Escapes, where the escaped character is kept, bold and underline toggles, and macros."""
+
+
+class StripMode:
+    """What is removed from the text. Modes are flags so `MARKUP | ANSI` is the same as `BOTH`."""
+
+    MARKUP: int = 1
+    ANSI: int = 2
+    BOTH: int = 3
+
+
+PATTERNS = {
+    StripMode.MARKUP: f"({ANSI})|{MARKUP}",
+    StripMode.ANSI: ANSI,
+    StripMode.BOTH: f"{ANSI}|{MARKUP}",
+}
+"""The pattern for each mode. Patterns are compiled the first time the mode is used."""
+
+REPLACE = {StripMode.MARKUP: r"\1\2", StripMode.ANSI: "", StripMode.BOTH: r"\1"}
+"""What each match is replaced with; the kept ansi or escaped character."""
+
+INCOMPLETE_ANSI = r"\x1b(?:\[[0-?]*[ -/]*|\][^\x07\x1b]*\x1b?)?\Z"
+INCOMPLETE_MARKUP = r"(?<!\x1b)\[[^\]]*\Z"
+INCOMPLETE = {
+    StripMode.MARKUP: f"{INCOMPLETE_ANSI}|{INCOMPLETE_MARKUP}",
+    StripMode.ANSI: INCOMPLETE_ANSI,
+    StripMode.BOTH: f"{INCOMPLETE_ANSI}|{INCOMPLETE_MARKUP}",
+}
+"""Matches a sequence or macro that was cut off at the end of a chunk."""
+
+MAX_PENDING = 4096
+"""The most characters held back between chunks, unless the chunk size is larger."""
+
+
+@lru_cache(maxsize=None)
+def _pattern(mode: int):
+    try:
+        return re_compile(PATTERNS[mode], DOTALL), REPLACE[mode]
+    except KeyError:
+        raise ValueError(f"Invalid strip mode {mode!r}") from None
+
+
+@lru_cache(maxsize=None)
+def _incomplete(mode: int):
+    return re_compile(INCOMPLETE[mode])
+
+
+def strip(text: str, mode: int = StripMode.BOTH) -> str:
+    """Remove SAIML markup, ansi escape sequences, or both from the text.
+
+    Args:
+        text (str): The text to strip
+        mode (int): A `StripMode`. Defaults to stripping both markup and ansi.
+
+    Returns:
+        str: The text without markup or ansi
+    """
+    pattern, replace = _pattern(mode)
+    return pattern.sub(replace, text)
+
+
+def _split(text: str, mode: int) -> int:
+    """The offset where the text can be cut without splitting a sequence, macro, or escape."""
+    match = _incomplete(mode).search(text)
+    cut = len(text) if match is None else match.start()
+    if mode != StripMode.ANSI:
+        if cut < len(text) and text[cut] == "[":
+            # The `[` may be escaped, `\\[`, so the backslashes before it are held back with it
+            rest = text[:cut].rstrip("\\")
+            run = cut - len(rest)
+            if rest.endswith("\x1b"):
+                run -= 1
+            if run % 2 == 1:
+                cut -= run
+        # An odd run of trailing backslashes ends with an escape of the next chunks character
+        rest = text.rstrip("\\")
+        run = len(text) - len(rest)
+        if rest.endswith("\x1b"):
+            # The first backslash ends a hyperlink sequence
+            run -= 1
+        if run % 2 == 1:
+            cut = min(cut, len(text) - 1)
+    return cut
+
+
+def strip_stream(
+    src: IO[str], dst: IO[str], mode: int = StripMode.BOTH, chunk_size: int = 64 * 1024
+) -> int:
+    """Strip a text stream, like a large log file, in fixed size chunks. Sequences and macros
+    that are split between chunks are held back until the next chunk. Anything held back that is
+    longer than a chunk, or `MAX_PENDING` characters, is written as is so memory stays bounded.
+
+    Args:
+        src (IO[str]): The stream to read from
+        dst (IO[str]): The stream to write the stripped text to
+        mode (int): A `StripMode`. Defaults to stripping both markup and ansi.
+        chunk_size (int): The number of characters read at a time
+
+    Returns:
+        int: The number of characters written
+    """
+    pattern, replace = _pattern(mode)
+    limit = max(chunk_size, MAX_PENDING)
+    pending = ""
+    written = 0
+
+    while True:
+        chunk = src.read(chunk_size)
+        if not chunk:
+            break
+        text = pending + chunk
+        cut = _split(text, mode)
+        if len(text) - cut > limit:
+            cut = len(text)
+        text, pending = text[:cut], text[cut:]
+        if text:
+            text = pattern.sub(replace, text)
+            dst.write(text)
+            written += len(text)
+
+    if pending:
+        pending = pattern.sub(replace, pending)
+        dst.write(pending)
+        written += len(pending)
+    return written
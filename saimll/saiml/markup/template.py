@@ -0,0 +1,160 @@
+"""Parameterized SAIML markup.
+
+A template is markup with `str.format` style fields, `[@F red]{user}[@F] failed in {ms}ms`. The
+markup around the fields is parsed once and rendered ahead of time. Rendering the template then
+only formats the values into the pre-rendered output, which costs about the same as a call to
+`str.format`.
+
+Values are always treated as plain text. They are never parsed as markup.
+"""
+from __future__ import annotations
+
+from re import compile as re_compile
+from string import Formatter
+from typing import TYPE_CHECKING, Any, Optional
+
+if TYPE_CHECKING:
+    from .backends import Backend
+    from .markup import SAIMLParser
+
+__all__ = [
+    "MarkupTemplate",
+]
+
+HOLE = 0xF0000
+"""First codepoint used as a placeholder for a field while the template is parsed. These are in
+a private use plane so they will not collide with markup."""
+
+MACRO_BOUNDS = re_compile(r"[\\\[]")
+"""Matches the characters that start an escape or a macro."""
+
+
+class MarkupTemplate:
+    """SAIML markup with fields that are filled in when it is rendered.
+
+    Fields follow the same syntax as `str.format`; `{name}`, `{}`, `{0}`, `{ms:.1f}`, and `{!r}`.
+    Use `{{` and `}}` for literal braces.
+
+    If a field is the input to a function macro, `[^rainbow]{name}`, or is inside of a macro,
+    `[@F {color}]`, the markup can't be rendered ahead of time. These templates escape the values
+    and parse the whole markup each time they are rendered.
+    """
+
+    def __init__(self, parser: SAIMLParser, markup: str, backend: Backend) -> None:
+        self._parser = parser
+        self._markup = markup
+        self._backend = backend
+        self._format: Optional[str] = None
+        self._static: bool = False
+
+        skeleton, fields = [], []
+        auto = 0
+        for literal, field, spec, conversion in Formatter().parse(markup):
+            skeleton.append(literal)
+            if field is not None:
+                if field == "":
+                    field, auto = str(auto), auto + 1
+                field = "{" + field
+                if conversion:
+                    field += "!" + conversion
+                if spec:
+                    field += ":" + spec
+                skeleton.append(chr(HOLE + len(fields)))
+                fields.append(field + "}")
+
+        holes = [chr(HOLE + i) for i in range(len(fields))]
+        skeleton = "".join(skeleton)
+
+        raw = self.__macro_fields(skeleton, holes)
+        try:
+            rendered = parser._render_template(skeleton, holes, backend)
+        except ValueError:
+            # Fields inside of macros, `[@F {color}]`, can only be parsed once they are filled in
+            if not any(raw):
+                raise
+            rendered = None
+
+        self._fields = fields
+        self._raw = raw
+        if rendered is not None and all(rendered.count(hole) == 1 for hole in holes):
+            self._static = True
+            if backend.escapes:
+                # Values are escaped by the backend so they are joined with the rendered segments
+                self._segments = self.__split(rendered, holes)
+            else:
+                rendered = rendered.replace("{", "{{").replace("}", "}}")
+                for hole, field in zip(holes, fields):
+                    rendered = rendered.replace(hole, field)
+                self._format = rendered
+        else:
+            self._segments = self.__split(skeleton, holes)
+
+    @staticmethod
+    def __split(text: str, holes: list[str]) -> list[str]:
+        """Split the text around each placeholder."""
+        segments = [text]
+        for hole in holes:
+            segments[-1:] = segments[-1].split(hole)
+        return segments
+
+    @staticmethod
+    def __macro_fields(skeleton: str, holes: list[str]) -> list[bool]:
+        """Find the fields that are inside of a macro. Their values are not escaped."""
+        raw = [False] * len(holes)
+        index = 0
+        while True:
+            match = MACRO_BOUNDS.search(skeleton, index)
+            if match is None:
+                break
+            if match.group() == "\\":
+                index = match.end() + 1
+                continue
+            end = skeleton.find("]", match.end())
+            if end == -1:
+                break
+            macro = skeleton[match.end() : end]
+            for i, hole in enumerate(holes):
+                if hole in macro:
+                    raw[i] = True
+            index = end + 1
+        return raw
+
+    @property
+    def markup(self) -> str:
+        """The template markup."""
+        return self._markup
+
+    @property
+    def static(self) -> bool:
+        """True if the markup around the fields was rendered ahead of time."""
+        return self._static
+
+    def render(self, *args: Any, **values: Any) -> str:
+        """Fill in the fields of the template and get the rendered string.
+
+        Args:
+            *args (Any): Values for positional fields, `{}` or `{0}`
+            **values (Any): Values for named fields, `{name}`
+
+        Returns:
+            str: The rendered string
+        """
+        if self._format is not None:
+            return self._format.format(*args, **values)
+
+        if self._static:
+            output = [self._segments[0]]
+            for field, segment in zip(self._fields, self._segments[1:]):
+                output.append(self._backend.escape(field.format(*args, **values)))
+                output.append(segment)
+            return "".join(output)
+
+        markup = [self._segments[0]]
+        for field, raw, segment in zip(self._fields, self._raw, self._segments[1:]):
+            value = field.format(*args, **values)
+            markup.append(value if raw else self._parser.escape(value))
+            markup.append(segment)
+        return self._parser.parse("".join(markup), self._backend)
+
+    def __repr__(self) -> str:
+        return f"<MarkupTemplate: {self._markup!r}>"
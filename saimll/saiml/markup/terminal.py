@@ -0,0 +1,124 @@
+"""Detect how many colors a stream can display.
+
+The depth is decided once per stream and cached. In order:
+
+1. `FORCE_COLOR` turns color on even when the stream isn't a terminal. `0` or `false` turns it
+   off, `1`, `2`, and `3` ask for at least 16, 256, and truecolor. A terminal that reports more
+   colors keeps its depth, while other streams use the level as is. Any other value uses the depth
+   the terminal reports, but at least 16 colors.
+2. A non empty `NO_COLOR` turns color off, see https://no-color.org.
+3. Streams that aren't a terminal, and `TERM=dumb`, have no color.
+4. `COLORTERM=truecolor` or `24bit`, or a `TERM` ending in `-direct`, is truecolor, a `TERM`
+   with `256` in it is 256 colors, and any other terminal has 16 colors. Windows terminals are
+   truecolor.
+"""
+from __future__ import annotations
+
+import os
+import sys
+from typing import IO, Mapping, Optional
+from weakref import WeakKeyDictionary
+
+from .backends import ColorDepth
+
+__all__ = [
+    "color_depth",
+    "detect_color_depth",
+    "clear_color_depths",
+]
+
+FORCE_LEVELS = {
+    "0": ColorDepth.NONE,
+    "false": ColorDepth.NONE,
+    "1": ColorDepth.ANSI16,
+    "2": ColorDepth.XTERM256,
+    "3": ColorDepth.TRUECOLOR,
+}
+"""The least color depth for each level of `FORCE_COLOR`."""
+
+_DEPTHS: WeakKeyDictionary = WeakKeyDictionary()
+"""The detected color depth of each stream."""
+
+
+def _isatty(stream: Optional[IO[str]]) -> bool:
+    try:
+        return stream is not None and stream.isatty()
+    except (AttributeError, ValueError, OSError):
+        # Missing or closed streams
+        return False
+
+
+def _terminal_depth(environ: Mapping[str, str]) -> int:
+    """The color depth reported by the terminal through `TERM` and `COLORTERM`."""
+    term = environ.get("TERM", "").lower()
+    if term == "dumb":
+        return ColorDepth.NONE
+    if environ.get("COLORTERM", "").lower() in ("truecolor", "24bit"):
+        return ColorDepth.TRUECOLOR
+    if term.endswith("-direct") or os.name == "nt":
+        return ColorDepth.TRUECOLOR
+    if "256" in term:
+        return ColorDepth.XTERM256
+    return ColorDepth.ANSI16
+
+
+def detect_color_depth(
+    stream: Optional[IO[str]] = None, environ: Optional[Mapping[str, str]] = None
+) -> int:
+    """Detect the color depth of a stream without caching it.
+
+    Args:
+        stream (IO[str], optional): The stream to detect. Defaults to `sys.stdout`.
+        environ (Mapping[str, str], optional): The environment variables. Defaults to `os.environ`.
+
+    Returns:
+        int: A `ColorDepth`
+    """
+    if stream is None:
+        stream = sys.stdout
+    if environ is None:
+        environ = os.environ
+
+    force = environ.get("FORCE_COLOR")
+    if force is not None:
+        depth = FORCE_LEVELS.get(force.strip().lower())
+        if depth == ColorDepth.NONE:
+            return depth
+        if depth is not None:
+            if _isatty(stream):
+                return max(depth, _terminal_depth(environ))
+            return depth
+        return max(_terminal_depth(environ), ColorDepth.ANSI16)
+
+    if environ.get("NO_COLOR", "") != "":
+        return ColorDepth.NONE
+    if not _isatty(stream):
+        return ColorDepth.NONE
+    return _terminal_depth(environ)
+
+
+def color_depth(stream: Optional[IO[str]] = None) -> int:
+    """The color depth of a stream. The depth is detected the first time a stream is used and
+    cached while the stream exists.
+
+    Args:
+        stream (IO[str], optional): The stream to write to. Defaults to `sys.stdout`.
+
+    Returns:
+        int: A `ColorDepth`
+    """
+    if stream is None:
+        stream = sys.stdout
+    try:
+        return _DEPTHS[stream]
+    except KeyError:
+        depth = _DEPTHS[stream] = detect_color_depth(stream)
+        return depth
+    except TypeError:
+        # Streams that can't be weakly referenced are detected every time
+        return detect_color_depth(stream)
+
+
+def clear_color_depths() -> None:
+    """Forget the detected color depths, like after changing the environment variables."""
+    _DEPTHS.clear()
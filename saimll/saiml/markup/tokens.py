@@ -1,19 +1,41 @@
 from __future__ import annotations
-from functools import cached_property
-from lib2to3.pytree import Base
-from typing import Union, Callable, Dict
+from re import compile as re_compile
+from typing import Optional, Callable, Dict
 
-from .formatting import build_color, ColorType, LINK, RESET, FUNC
+from .formatting import build_color, ColorType, BOLD, UNDERLINE, LINK, RESET
+
+
+ARGUMENT_SEPARATOR = re_compile(r"[\s,]+")
+"""Separates the arguments of a function macro, `[^gradient #f00, #00f]`."""
+
+
+class Op:
+    """Integer opcodes that identify the type of a token."""
+
+    TEXT: int = 0
+    BOLD: int = 1
+    UNDERLINE: int = 2
+    COLOR: int = 3
+    HLINK: int = 4
+    FUNC: int = 5
+    RESET: int = 6
+    ESCAPE: int = 7
 
 
 class Token:
     """Generic base class that has a default repr."""
 
+    __slots__ = ()
+    op: int = -1
+
     def __repr__(self) -> str:
         return f"<{type(self).__name__}: {self._markup}, {self.value}>"
 
 
 class Reset(Token):
+    __slots__ = ()
+    op: int = Op.RESET
+
     @property
     def value(self) -> str:
         return RESET
@@ -23,9 +45,21 @@ class Reset(Token):
 
 
 class Func(Token):
+    """A function macro. Anything after the name of the function is split into arguments that are
+    passed to the function after the text, `[^gradient #f00,#00f]` calls
+    `gradient(text, "#f00", "#00f")`.
+    """
+
+    __slots__ = ("_markup", "_func", "_args", "_caller")
+    op: int = Op.FUNC
+
     def __init__(self, markup: str, funcs: Dict[str, Callable]) -> None:
         self._markup: str = markup
-        self._func: str = markup[1:].strip().lower()
+        name, _, args = markup[1:].strip().partition(" ")
+        self._func: str = name.lower()
+        self._args: tuple[str, ...] = tuple(
+            arg for arg in ARGUMENT_SEPARATOR.split(args.strip()) if arg
+        )
         self._caller = lambda string: string
         self.parse_func(funcs)
 
@@ -36,8 +70,20 @@ class Func(Token):
             raise ValueError(f"Invalid Function \x1b[1;31m{self._markup}\x1b[0m")
 
     def exec(self, string: str) -> str:
+        if self._args:
+            return self._caller(string, *self._args)
         return self._caller(string)
 
+    @property
+    def caller(self) -> Callable:
+        """The function that is called with the text."""
+        return self._caller
+
+    @property
+    def args(self) -> tuple[str, ...]:
+        """The arguments given to the function after the text."""
+        return self._args
+
     @property
     def value(self) -> str:
         return self._func
@@ -50,6 +96,9 @@ class Func(Token):
 
 
 class HLink(Token):
+    __slots__ = ("_markup", "_closing", "_value")
+    op: int = Op.HLINK
+
     def __init__(self, markup: str) -> None:
         self._markup = markup.strip()
         self._closing = False
@@ -81,20 +130,41 @@ class HLink(Token):
         """True if this link token is a closing link token."""
         return self._closing
 
+    @property
+    def url(self) -> str:
+        """The url of the link. Empty for closing link tokens."""
+        return self._markup[1:]
+
     def __str__(self) -> str:
         return self.value
 
 
 class Text(Token):
-    """Plain text token."""
+    """Plain text token. The text can be given directly or as the `start` and `end` offsets into
+    the markup it came from. Offsets are only sliced when the value is needed.
+    """
 
-    def __init__(self, markup: str) -> None:
+    __slots__ = ("_markup", "_start", "_end", "_value")
+    op: int = Op.TEXT
+
+    def __init__(self, markup: str, start: Optional[int] = None, end: Optional[int] = None) -> None:
         self._markup: str = markup
-        self._value: str = markup
+        self._start: Optional[int] = start
+        self._end: Optional[int] = end
+        self._value: Optional[str] = markup if start is None else None
+
+    @property
+    def span(self) -> tuple[int, int]:
+        """The start and end offsets of the text in the markup."""
+        if self._start is None:
+            return (0, len(self._markup))
+        return (self._start, self._end)
 
     @property
     def value(self) -> str:
         """Fomatted value of the tokens markup."""
+        if self._value is None:
+            self._value = self._markup[self._start : self._end]
         return self._value
 
     @value.setter
@@ -103,31 +173,36 @@ class Text(Token):
         self._value = text
 
     def __repr__(self) -> str:
-        return f"<{type(self).__name__}: '{self._markup}'>"
+        return f"<{type(self).__name__}: '{self._markup[slice(*self.span)]}'>"
 
     def __str__(self) -> str:
-        return self._value
+        return self.value
 
 
 class Color(Token):
     """A color tokens that is either hex, xterm, rgb, or predefined."""
 
+    __slots__ = ("_markup", "_type", "_colors", "_value")
+    op: int = Op.COLOR
+
     def __init__(
         self, markup: str, colors: list[int] = None, ctype: ColorType = None
     ) -> None:
         self._markup: str = markup
-        self._type, self._colors = build_color(markup)
+        if colors is None or ctype is None:
+            self._type, self._colors = build_color(markup)
         if colors is not None:
             self._colors = colors
         if ctype is not None:
             self._type = ctype
+        self._value: str = ";".join(self._colors)
 
-    @cached_property
+    @property
     def value(self) -> str:
         """Fomatted value of the tokens markup."""
-        return f"{';'.join(self._colors)}"
+        return self._value
 
-    @cached_property
+    @property
     def type_str(self) -> str:
         """Readable type of the color."""
         if len(self._type) == 1 and self._type[0] == ColorType.FG:
@@ -145,6 +220,7 @@ class Color(Token):
     @colors.setter
     def colors(self, colors: list[int]) -> None:
         self._colors = colors
+        self._value = ";".join(colors)
 
     @property
     def type(self) -> ColorType:
@@ -157,12 +233,15 @@ class Color(Token):
 
     def __str__(self) -> str:
         """Full ansi representation of the token."""
-        return f"\x1b[{';'.join(self._colors)}m"
+        return f"\x1b[{self._value}m"
 
 
 class Bold(Token):
+    __slots__ = ("_value",)
+    op: int = Op.BOLD
+    _markup: str = "*"
+
     def __init__(self, value: str) -> None:
-        self._markup: str = "*"
         self._value: str = value
 
     @property
@@ -175,22 +254,25 @@ class Bold(Token):
         return f"\x1b[{self.value}m"
 
 class Escape(Token):
-    def __init__(self) -> None:
-        self._markup: str = "$"
-        self._value: str = ""
+    __slots__ = ()
+    op: int = Op.ESCAPE
+    _markup: str = "$"
 
     @property
     def value(self) -> int:
         """The ansi code for the markup."""
-        return self._value
+        return ""
 
     def __str__(self) -> str:
         """Full ansi representation of the token."""
-        return f"\\"
+        return "\\"
 
 class Underline(Token):
+    __slots__ = ("_value",)
+    op: int = Op.UNDERLINE
+    _markup: str = "_"
+
     def __init__(self, value: str) -> None:
-        self._markup: str = "_"
         self._value: str = value
 
     @property
@@ -203,72 +285,16 @@ class Underline(Token):
         return f"\x1b[{self.value}m"
 
 
-class Formatter(Token):
-    """A class used to combine format tokens that are next to eachother."""
-
-    def __init__(self):
-        self._fg = None
-        self._bg = None
-        self._underline = None
-        self._bold = None
+BOLD_TOKENS: dict[int, Bold] = {value: Bold(value) for value in (BOLD.PUSH, BOLD.POP)}
+"""Shared bold tokens for each toggle value. Tokens are never changed so they can be reused."""
 
-    @property
-    def color(self) -> str:
-        """The colors current in the format"""
-        return f"{self._fg};{self._bg}"
-
-    @color.setter
-    def color(self, color: Color) -> None:
-        if color.type == [ColorType.FG]:
-            self._fg = color
-        elif color.type == [ColorType.BG]:
-            self._bg = color
-        elif color.type == ColorType.BOTH:
-            self._fg = Color("", [color.colors[0]], [ColorType.FG])
-            self._bg = Color("", [color.colors[1]], [ColorType.BG])
-
-    @property
-    def bold(self) -> Union[Bold, None]:
-        """The bold toggle currently in the format."""
-        return self._bold
-
-    @bold.setter
-    def bold(self, bold: Bold) -> None:
-        self._bold = bold if self._bold is None else None
-
-    @property
-    def underline(self) -> Union[Underline, None]:
-        """The underline toggle currently in the format."""
-        return self._underline
-
-    @bold.setter
-    def underline(self, underline: Underline) -> None:
-        self._underline = underline if self._underline is None else None
-
-    def is_empty(self) -> bool:
-        """True if all of fg, bg, underline, and bold are None."""
-        return (
-            self._fg is None
-            and self._bg is None
-            and self._underline is None
-            and self._bold is None
-        )
+UNDERLINE_TOKENS: dict[int, Underline] = {
+    value: Underline(value) for value in (UNDERLINE.PUSH, UNDERLINE.POP)
+}
+"""Shared underline tokens for each toggle value."""
 
-    def __str__(self) -> str:
-        values = []
-        if self._bold is not None:
-            values.append(self._bold.value)
-        if self._underline is not None:
-            values.append(self._underline.value)
-        if self._fg is not None:
-            values.append(self._fg.value)
-        if self._bg is not None:
-            values.append(self._bg.value)
-
-        if len(values) > 0:
-            return f"\x1b[{';'.join(str(value) for value in values)}m"
-        else:
-            return ""
+RESET_TOKEN = Reset()
+"""Shared reset token."""
 
-    def __repr__(self) -> str:
-        return f"<Format: {repr(str(self))}>"
+ESCAPE_TOKEN = Escape()
+"""Shared escape token."""
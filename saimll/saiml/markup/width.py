@@ -0,0 +1,276 @@
+"""Display width aware operations on markup and rendered ansi.
+
+Widths are measured in terminal columns. Wide east asian characters take two columns and
+combining marks take none, see `char_widths`. Escape sequences and formatting tokens take no
+columns.
+
+Cutting text never drops formatting. Only the text outside of the cut is removed, every sequence
+or formatting token is kept, so the styles before, inside, and after the cut stay intact. For
+compiled markup the emitter then drops any formatting that no longer applies to text.
+"""
+from __future__ import annotations
+
+from bisect import bisect_right
+from re import compile as re_compile
+from typing import Optional
+
+from .char_widths import WIDTH_ENDS, WIDTH_STARTS, WIDTH_VALUES
+from .strip import ANSI
+from .tokens import Func, Op, Text, Token
+
+__all__ = [
+    "char_width",
+    "text_width",
+    "visible_width",
+    "slice_ansi",
+    "truncate",
+    "ljust",
+    "rjust",
+    "center",
+    "tokens_width",
+    "slice_tokens",
+    "pad",
+]
+
+ANSI_SPLIT = re_compile(f"({ANSI})")
+"""Splits rendered ansi into text and escape sequences. Sequences are at the odd indexes."""
+
+
+def char_width(char: str) -> int:
+    """The number of columns a character takes in a terminal.
+
+    Args:
+        char (str): A single character
+
+    Returns:
+        int: 0, 1, or 2
+    """
+    codepoint = ord(char)
+    if codepoint < WIDTH_STARTS[0]:
+        return 1
+    index = bisect_right(WIDTH_STARTS, codepoint) - 1
+    if codepoint <= WIDTH_ENDS[index]:
+        return WIDTH_VALUES[index]
+    return 1
+
+
+def text_width(text: str) -> int:
+    """The number of columns plain text takes in a terminal.
+
+    Args:
+        text (str): Plain text without markup or ansi
+
+    Returns:
+        int: The width of the text
+    """
+    if text.isascii():
+        return len(text)
+    return sum(map(char_width, text))
+
+
+def _cut(text: str, column: int, start: int, stop: int) -> tuple[str, int]:
+    """Get the part of the text that is between the start and stop columns. The text starts at
+    the given column. Characters that would cross the start or stop column are removed.
+
+    Returns:
+        tuple[str, int]: The part of the text and the column after the text
+    """
+    if text.isascii():
+        end = column + len(text)
+        return text[max(start - column, 0) : max(min(stop, end) - column, 0)], end
+
+    kept = []
+    for char in text:
+        width = char_width(char)
+        if column >= start and column + width <= stop:
+            kept.append(char)
+        column += width
+    return "".join(kept), column
+
+
+def pad(width: int, target: int, align: str, fill: str = " ") -> tuple[str, str]:
+    """Get the padding on the left and right that brings text of the given width to the target
+    width.
+
+    Args:
+        width (int): The current width
+        target (int): The width after padding
+        align (str): `<` for left, `>` for right, and `^` for centered alignment
+        fill (str): The one column wide character to pad with
+
+    Returns:
+        tuple[str, str]: The left and right padding
+    """
+    space = max(target - width, 0)
+    if align == "<":
+        return "", fill * space
+    if align == ">":
+        return fill * space, ""
+    left = space // 2
+    return fill * left, fill * (space - left)
+
+
+def tokens_width(tokens: list[Token]) -> int:
+    """The number of columns the text of the tokens takes. Function macros are assumed to keep
+    the width of their text.
+
+    Args:
+        tokens (list[Token]): Tokens from parsing SAIML markup
+
+    Returns:
+        int: The width of the text
+    """
+    return sum(text_width(token.value) for token in tokens if token.op == Op.TEXT)
+
+
+def slice_tokens(
+    tokens: list[Token], start: int = 0, stop: Optional[int] = None, ellipsis: str = ""
+) -> list[Token]:
+    """Keep the text between the start and stop columns along with all formatting tokens.
+
+    Function macros are given the part of their text that is kept. If none of their text is kept
+    the function is dropped so it doesn't apply to other text.
+
+    Args:
+        tokens (list[Token]): Tokens from parsing SAIML markup
+        start (int): The first column to keep
+        stop (int, optional): The column to stop at. Defaults to the end of the text.
+        ellipsis (str): Text added where the text was cut at the stop column
+
+    Returns:
+        list[Token]: The tokens of the slice
+    """
+    if stop is None:
+        stop = tokens_width(tokens)
+
+    output = []
+    column = 0
+    func: Optional[Func] = None
+    for token in tokens:
+        op = token.op
+        if op == Op.FUNC:
+            func = token
+            continue
+        if op == Op.TEXT:
+            text, end = _cut(token.value, column, start, stop)
+            if ellipsis and column <= stop < end:
+                text, ellipsis = text + ellipsis, ""
+            column = end
+            if text:
+                if func is not None:
+                    output.append(func)
+                output.append(Text(text))
+            func = None
+            continue
+        if op == Op.RESET:
+            func = None
+        if func is not None:
+            output.append(func)
+            func = None
+        output.append(token)
+    if func is not None:
+        output.append(func)
+    return output
+
+
+def visible_width(text: str) -> int:
+    """The number of columns rendered ansi takes in a terminal.
+
+    Args:
+        text (str): Rendered ansi, like the result of `SAIML.parse`
+
+    Returns:
+        int: The width of the text without escape sequences
+    """
+    return sum(text_width(part) for part in ANSI_SPLIT.split(text)[::2])
+
+
+def slice_ansi(text: str, start: int = 0, stop: Optional[int] = None, ellipsis: str = "") -> str:
+    """Keep the text of rendered ansi between the start and stop columns. All escape sequences
+    are kept so the styles of the slice match the original.
+
+    Args:
+        text (str): Rendered ansi, like the result of `SAIML.parse`
+        start (int): The first column to keep
+        stop (int, optional): The column to stop at. Defaults to the end of the text.
+        ellipsis (str): Text added where the text was cut at the stop column
+
+    Returns:
+        str: The slice of the rendered ansi
+    """
+    parts = ANSI_SPLIT.split(text)
+    if stop is None:
+        stop = sum(text_width(part) for part in parts[::2])
+
+    column = 0
+    for index in range(0, len(parts), 2):
+        part, end = _cut(parts[index], column, start, stop)
+        if ellipsis and column <= stop < end:
+            part, ellipsis = part + ellipsis, ""
+        parts[index] = part
+        column = end
+    return "".join(parts)
+
+
+def truncate(text: str, width: int, ellipsis: str = "…") -> str:
+    """Shorten rendered ansi to fit in the given width. The ellipsis is added where the text was
+    cut and takes the style of the text it replaces.
+
+    Args:
+        text (str): Rendered ansi, like the result of `SAIML.parse`
+        width (int): The maximum width
+        ellipsis (str): Text added to show the text was cut. Defaults to `…`
+
+    Returns:
+        str: The rendered ansi that fits in the width. When the ellipsis is wider than the width
+        only the escape sequences are kept.
+    """
+    if visible_width(text) <= width:
+        return text
+    stop = width - text_width(ellipsis)
+    if stop < 0:
+        return slice_ansi(text, 0, 0)
+    return slice_ansi(text, 0, stop, ellipsis)
+
+
+def ljust(text: str, width: int, fill: str = " ") -> str:
+    """Left align rendered ansi in the given width.
+
+    Args:
+        text (str): Rendered ansi, like the result of `SAIML.parse`
+        width (int): The width to pad to
+        fill (str): The one column wide character to pad with
+
+    Returns:
+        str: The padded rendered ansi
+    """
+    return text + pad(visible_width(text), width, "<", fill)[1]
+
+
+def rjust(text: str, width: int, fill: str = " ") -> str:
+    """Right align rendered ansi in the given width.
+
+    Args:
+        text (str): Rendered ansi, like the result of `SAIML.parse`
+        width (int): The width to pad to
+        fill (str): The one column wide character to pad with
+
+    Returns:
+        str: The padded rendered ansi
+    """
+    return pad(visible_width(text), width, ">", fill)[0] + text
+
+
+def center(text: str, width: int, fill: str = " ") -> str:
+    """Center rendered ansi in the given width.
+
+    Args:
+        text (str): Rendered ansi, like the result of `SAIML.parse`
+        width (int): The width to pad to
+        fill (str): The one column wide character to pad with
+
+    Returns:
+        str: The padded rendered ansi
+    """
+    left, right = pad(visible_width(text), width, "^", fill)
+    return left + text + right
@@ -0,0 +1,74 @@
+from itertools import count
+
+from saimll.saiml.markup.markup import SAIMLParser
+
+
+def test_parse_is_cached():
+    parser = SAIMLParser()
+    first = parser.parse("[@F red]cached[@F] text")
+    assert parser.parse("[@F red]cached[@F] text") == first
+    info = parser.cache_info()
+    assert (info.hits, info.misses, info.currsize) == (1, 1, 1)
+
+
+def test_compiled_markup_matches_parse():
+    parser = SAIMLParser()
+    markup = "*bold* _under_ [@F #ead1a8 @B 4]color[@] [~https://example.com]link"
+    compiled = parser.compile(markup)
+    assert compiled.render() == parser.parse(markup)
+    assert str(compiled) == parser.parse(markup)
+
+
+def test_configure_cache_disables_caching():
+    parser = SAIMLParser()
+    parser.configure_cache(maxsize=0)
+    parser.parse("[@F red]x")
+    parser.parse("[@F red]x")
+    assert parser.cache_info().currsize == 0
+
+
+def test_impure_function_is_called_on_every_parse():
+    parser = SAIMLParser("plain")
+    ticks = count()
+    parser.define("cache_tick", lambda text: f"{text}{next(ticks)}")
+    assert [parser.parse("[^cache_tick]n") for _ in range(3)] == ["n0", "n1", "n2"]
+    assert parser.parse_many(["[^cache_tick]n"] * 2) == ["n3", "n4"]
+    assert parser.compile("[^cache_tick]n").dynamic
+
+
+def test_define_invalidates_every_parser():
+    first, second = SAIMLParser("plain"), SAIMLParser("plain")
+    first.define("cache_case", str.upper, pure=True)
+    assert second.parse("[^cache_case]Abc") == "ABC"
+    assert first.parse("[^cache_case]Abc") == "ABC"
+
+    first.define("cache_case", str.lower, pure=True)
+    assert second.parse("[^cache_case]Abc") == "abc"
+    assert first.parse("[^cache_case]Abc") == "abc"
+
+
+def test_cache_counts_renders_of_other_backends():
+    parser = SAIMLParser()
+    markup = "[@F red]" + "sized text " * 50
+    parser.parse(markup)
+    before = parser.cache_info().currbytes
+    assert before >= parser.compile(markup).size > len(markup)
+
+    parser.parse(markup, "html")
+    parser.parse(markup, "256")
+    compiled = parser.compile(markup)
+    assert parser.cache_info().currbytes == compiled.size > before
+
+    parser.configure_cache(maxbytes=compiled.size - 1)
+    assert parser.cache_info().currsize == 0
+    parser.configure_cache(maxbytes=4 * 1024 * 1024)
+    parser.clear_cache()
+    assert parser.cache_info().currbytes == 0
+
+
+def test_iparse_many_is_bounded_by_the_parser_cache():
+    parser = SAIMLParser()
+    parser.configure_cache(maxsize=8)
+    markup = [f"[@F red]line {index % 20}[@F]" for index in range(200)]
+    assert list(parser.iparse_many(iter(markup))) == [parser.parse(text) for text in markup]
+    assert parser.cache_info().currsize == 8
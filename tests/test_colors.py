@@ -0,0 +1,15 @@
+from saimll.saiml.color.colors import Color
+
+
+def test_colors_are_shared():
+    assert Color.RGB(1, 2, 3) is Color.RGB(1, 2, 3)
+    assert Color.HEX("#ff8800") is Color.HEX("ff8800")
+
+
+def test_shared_colors_keep_value_types():
+    first = Color.RGB(1, 2, 3)
+    second = Color.RGB(1.0, 2, 3)
+    assert first is not second
+    assert type(first.red) is int
+    assert type(second.red) is float
+    assert type(Color.RGB(1, 2, 3).red) is int
@@ -0,0 +1,59 @@
+import pytest
+
+from saimll.saiml.markup.backends import get_backend
+from saimll.saiml.markup.disk import DiskCache
+from saimll.saiml.markup.markup import SAIMLParser
+
+MARKUP = [
+    "plain text",
+    "*bold* and _underline_ [@F red]red[@F] [@B #ead1a8]bg[@]",
+    "[@F 9 @B 4]chained[@] \\*escaped\\* \\[not a macro] \\\\",
+    "[~https://example.com]link[~] after",
+    "[@F 114;12,212]rgb *nested _both_ off* end",
+]
+
+
+@pytest.mark.parametrize("backend", ["ansi", "256", "plain", "html"])
+def test_disk_cache_round_trip(tmp_path, backend: str):
+    path = tmp_path / "markup.marshal"
+    writer = SAIMLParser(backend)
+    writer.enable_disk_cache(path=path)
+    expected = [writer.compile(markup) for markup in MARKUP]
+    assert writer.save_disk_cache() == len(MARKUP)
+    writer.enable_disk_cache(False)
+
+    disk = DiskCache(path)
+    for markup in MARKUP:
+        assert disk.get(markup, get_backend(backend)) is not None
+
+    reader = SAIMLParser(backend)
+    reader.enable_disk_cache(path=path)
+    for markup, compiled in zip(MARKUP, expected):
+        loaded = reader.compile(markup)
+        assert str(loaded) == str(compiled)
+        assert loaded.visible_width() == compiled.visible_width()
+        assert loaded.truncate(6) == compiled.truncate(6)
+        assert loaded.render(get_backend("html")) == compiled.render(get_backend("html"))
+    reader.enable_disk_cache(False)
+
+
+def test_function_macros_are_not_stored(tmp_path):
+    path = tmp_path / "markup.marshal"
+    parser = SAIMLParser("plain")
+    parser.define("disk_upper", str.upper)
+    parser.enable_disk_cache(path=path)
+    parser.parse("[^disk_upper]text[]")
+    assert parser.save_disk_cache() == 0
+    parser.enable_disk_cache(False)
+    assert not path.exists()
+
+
+def test_unreadable_file_is_ignored(tmp_path):
+    path = tmp_path / "markup.marshal"
+    path.write_bytes(b"not marshal data")
+    parser = SAIMLParser("plain")
+    parser.enable_disk_cache(path=path)
+    assert str(parser.compile("*plain*")) == "plain"
+    assert parser.save_disk_cache() == 1
+    parser.enable_disk_cache(False)
+    assert DiskCache(path).get("*plain*", get_backend("plain")) is not None
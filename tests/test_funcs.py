@@ -0,0 +1,39 @@
+from saimll.saiml.markup.markup import SAIMLParser
+
+
+def counted(calls: list):
+    def func(text: str, *args: str) -> str:
+        calls.append((text, *args))
+        return text.upper()
+
+    return func
+
+
+def test_impure_function_is_called_again_on_repeated_parse():
+    parser = SAIMLParser("plain")
+    calls = []
+    parser.define("funcs_impure", counted(calls))
+    for _ in range(3):
+        assert parser.parse("[^funcs_impure]abc") == "ABC"
+    assert calls == [("abc",)] * 3
+
+
+def test_pure_function_results_are_cached():
+    parser = SAIMLParser("plain")
+    calls = []
+    parser.define("funcs_pure", counted(calls), pure=True)
+    with parser.profile() as stats:
+        assert parser.parse("[^funcs_pure]abc") == "ABC"
+        assert parser.parse("[^funcs_pure]abc") == "ABC"
+        assert parser.parse("[^funcs_pure]abc[] tail") == "ABC tail"
+    assert calls == [("abc",)]
+    assert stats.func_calls["funcs_pure"] == 2
+    assert stats.func_hit_rate("funcs_pure") == 0.5
+
+
+def test_function_arguments():
+    parser = SAIMLParser("plain")
+    calls = []
+    parser.define("funcs_args", counted(calls))
+    assert parser.parse("[^funcs_args #f00,#00f]abc") == "ABC"
+    assert calls == [("abc", "#f00", "#00f")]
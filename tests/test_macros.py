@@ -0,0 +1,68 @@
+import pytest
+
+from saimll.saiml.markup.markup import SAIMLParser
+
+THEME = {"error": "@F red @B black", "warn": "@F yellow"}
+
+
+@pytest.fixture
+def parser() -> SAIMLParser:
+    parser = SAIMLParser()
+    parser.register_macro("#", THEME)
+    parser.register_macro("%", lambda name: THEME.get(name))
+    return parser
+
+
+def test_registered_macro(parser: SAIMLParser):
+    assert parser.parse("[#error]x") == parser.parse("[@F red @B black]x")
+    assert parser.parse("[%warn]x") == parser.parse("[@F yellow]x")
+    assert parser.parse("[@B blue #warn]x") == parser.parse("[@B blue @F yellow]x")
+
+
+def test_unknown_registered_macro_raises(parser: SAIMLParser):
+    with pytest.raises(ValueError, match="Invalid Macro"):
+        parser.parse("[#missing]x")
+
+
+@pytest.mark.parametrize(
+    "markup",
+    [
+        "[@F #fff]x",
+        "[@B #fff]x",
+        "[@ #fff]x",
+        "[@F #f00 @B #00f]x",
+        "[^gradient #f00,#00f]gradient",
+        "[^gradient #f00, #00f]gradient",
+    ],
+)
+def test_builtin_macros_with_sigil_arguments(parser: SAIMLParser, markup: str):
+    assert parser.parse(markup) == SAIMLParser().parse(markup)
+
+
+def test_function_arguments_with_registered_sigils(parser: SAIMLParser):
+    parser.define("macros_args", lambda text, *args: f"{text}:{','.join(args)}")
+    assert parser.parse("[^macros_args #a, %b]x", "plain") == "x:#a,%b"
+
+
+def test_invalid_sigils(parser: SAIMLParser):
+    for sigil in ("@", "^", "[", "", "ab", " "):
+        with pytest.raises(ValueError):
+            parser.register_macro(sigil, THEME)
+
+
+@pytest.mark.parametrize(
+    "markup", ["[@F nosuchcolor]x", "[@Q]x", "text [@F red @B nope]x", "a[b", "[#missing]x"]
+)
+def test_plain_backend_rejects_malformed_markup(parser: SAIMLParser, markup: str):
+    for backend in ("ansi", "plain"):
+        with pytest.raises(ValueError):
+            parser.parse(markup, backend)
+        with pytest.raises(ValueError):
+            parser.render_into(markup, [].append, backend)
+
+
+def test_plain_backend_applies_registered_functions():
+    parser = SAIMLParser("plain")
+    parser.define("plain_upper", str.upper)
+    parser.register_macro("%", {"loud": "^plain_upper"})
+    assert parser.parse("[%loud]quiet[] \\[kept]") == "QUIET [kept]"
@@ -0,0 +1,51 @@
+from itertools import product
+
+import pytest
+
+from saimll.saiml.color import array as color_array
+from saimll.saiml.color.array import ARRAY_SPACES, ColorArray
+from saimll.saiml.markup import gradient
+
+numpy = pytest.importorskip("numpy")
+
+HEX = ["#000000", "#ffffff", "#ff0000", "#00ff00", "#0000ff", "#ead1a8", "#808080", "#123456"]
+STOPS = [((255, 0, 0), (0, 0, 255)), ((0, 0, 0), (255, 136, 0), (18, 52, 86), (255, 255, 255))]
+
+
+@pytest.fixture
+def use_numpy(monkeypatch):
+    def use(enabled: bool):
+        module = numpy if enabled else None
+        monkeypatch.setattr(gradient, "_numpy", lambda: module)
+        monkeypatch.setattr(color_array, "_numpy", lambda: module)
+        gradient.ramp.cache_clear()
+        gradient.ramp_sequences.cache_clear()
+
+    yield use
+    gradient.ramp.cache_clear()
+    gradient.ramp_sequences.cache_clear()
+
+
+def convert(source: str, target: str) -> list:
+    return list(ColorArray.from_hex(HEX).to(source).to(target))
+
+
+@pytest.mark.parametrize("source, target", list(product(ARRAY_SPACES, ARRAY_SPACES)))
+def test_color_array_numpy_matches_python(use_numpy, source: str, target: str):
+    use_numpy(True)
+    vectorized = convert(source, target)
+    use_numpy(False)
+    python = convert(source, target)
+    for fast, slow in zip(vectorized, python):
+        assert fast == pytest.approx(slow, rel=1e-6, abs=1e-9)
+    assert ColorArray.from_hex(HEX).to(source).to_hex() == HEX
+
+
+@pytest.mark.parametrize("stops", STOPS)
+@pytest.mark.parametrize("space", gradient.SPACES)
+def test_gradient_numpy_matches_python(use_numpy, stops: tuple, space: str):
+    for length in (1, 2, 3, 7, 40):
+        use_numpy(True)
+        vectorized = gradient.ramp(stops, length, space)
+        use_numpy(False)
+        assert gradient.ramp(stops, length, space) == vectorized
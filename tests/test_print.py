@@ -0,0 +1,34 @@
+from io import StringIO
+
+import pytest
+
+from saimll.saiml.markup.markup import RENDER_CHUNK_SIZE, SAIMLParser
+
+MARKUP = "[^gradient #f00,#00f]" + "g" * (RENDER_CHUNK_SIZE + 8000) + "[] *done*"
+
+
+class TTY(StringIO):
+    def isatty(self) -> bool:
+        return True
+
+
+@pytest.fixture
+def truecolor(monkeypatch):
+    for name in ("FORCE_COLOR", "NO_COLOR"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("COLORTERM", "truecolor")
+
+
+@pytest.mark.parametrize("stream, backend", [(TTY, "ansi"), (StringIO, "plain")])
+def test_print_matches_parse_for_long_markup(truecolor, stream: type, backend: str):
+    parser = SAIMLParser()
+    file = stream()
+    parser.print(MARKUP, file=file, end="")
+    assert file.getvalue() == parser.parse(MARKUP, backend)
+
+
+def test_render_into_long_markup_matches_parse():
+    parser = SAIMLParser()
+    output = []
+    parser.render_into(MARKUP, output.append)
+    assert "".join(output) == parser.parse(MARKUP)
@@ -0,0 +1,78 @@
+import pytest
+
+from saimll.saiml.markup import markup
+from saimll.saiml.markup.markup import SAIMLParser
+from saimll.saiml.markup.stream import MAX_PENDING
+
+MARKUP = [
+    "plain text",
+    "*bold* and _underline_ [@F red]red[@F] [@B #ead1a8]bg[@]",
+    "[@F 9 @B 4]chained[@] \\*escaped\\* \\[not a macro] \\\\",
+    "[~https://example.com]link[~] after [^rainbow]rainbow[] done",
+    "[$]*literal* _text_[$] *bold*",
+    "[@F 114;12,212]rgb *nested _both_ off* end",
+]
+
+
+def chunks(text: str, size: int) -> list[str]:
+    return [text[start : start + size] for start in range(0, len(text), size)]
+
+
+@pytest.mark.parametrize("markup", MARKUP)
+@pytest.mark.parametrize("backend", ["ansi", "plain", "html"])
+def test_stream_matches_parse(markup: str, backend: str):
+    parser = SAIMLParser(backend)
+    expected = parser.parse(markup)
+    for size in range(1, len(markup) + 1):
+        stream = parser.stream()
+        output = "".join(stream.feed(chunk) for chunk in chunks(markup, size)) + stream.close()
+        assert output == expected, size
+
+
+@pytest.mark.parametrize("markup", MARKUP)
+def test_render_into_chunks_matches_parse(markup: str):
+    parser = SAIMLParser()
+    for size in (1, 3, 7):
+        output = []
+        parser.render_into(chunks(markup, size), output.append)
+        assert "".join(output) == parser.parse(markup)
+
+
+def test_unclosed_macro_raises_once_too_long():
+    stream = SAIMLParser().stream()
+    stream.feed("[@F red")
+    with pytest.raises(ValueError, match="Macro's must be closed"):
+        for _ in range(MAX_PENDING):
+            stream.feed("x")
+    assert len(stream._state.pending) <= MAX_PENDING
+
+
+def test_function_is_given_its_whole_text():
+    parser = SAIMLParser("plain")
+    parser.define("stream_count", lambda text: str(len(text)))
+    stream = parser.stream()
+    output = [stream.feed("[^stream_count]")]
+    for _ in range(100):
+        output.append(stream.feed("a" * 1000))
+    output.append(stream.close())
+    assert "".join(output) == "100000"
+
+
+def test_function_text_is_bounded(monkeypatch):
+    monkeypatch.setattr(markup, "MAX_FUNC_TEXT", 5000)
+    parser = SAIMLParser("plain")
+    parser.define("stream_upper", str.upper)
+    stream = parser.stream()
+    stream.feed("[^stream_upper]")
+    for _ in range(5):
+        assert stream.feed("a" * 1000) == ""
+    with pytest.raises(ValueError, match="Function macro text"):
+        stream.feed("a")
+
+
+def test_long_gradient_stream_matches_parse():
+    parser = SAIMLParser()
+    text = "[^gradient #f00,#00f]" + "g" * 72_000 + "[] done"
+    stream = parser.stream()
+    output = "".join(stream.feed(chunk) for chunk in chunks(text, 4096)) + stream.close()
+    assert output == parser.parse(text)
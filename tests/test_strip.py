@@ -0,0 +1,35 @@
+from io import StringIO
+
+import pytest
+
+from saimll.saiml.markup.markup import SAIMLParser
+from saimll.saiml.markup.strip import StripMode, strip, strip_stream
+
+TEXT = [
+    "\\[]",
+    "a\\[b]c \\\\[x] \\\\\\[y]",
+    "*bold* _underline_ \\*kept\\* trailing \\",
+    "[@F red]red[@F] [~https://example.com]link[~] [^rainbow]rainbow[]",
+    SAIMLParser().parse("*\\[[@F #ff8800]Warning[@F]\\]* slow query"),
+    SAIMLParser().parse("[~https://example.com]*link*[~] [@F 196 @B 21]error[]"),
+    "\x1b[38;2;1;2;3mtruecolor\x1b[0m \x1b]8;;https://a.b\x1b\\osc\x1b]8;;\x1b\\ \\[kept]",
+]
+
+
+def stream(text: str, mode: int, size: int) -> str:
+    dst = StringIO()
+    strip_stream(StringIO(text), dst, mode, size)
+    return dst.getvalue()
+
+
+def test_escaped_bracket_is_kept():
+    assert strip("\\[]") == "[]"
+    assert stream("\\[]", StripMode.BOTH, 1) == "[]"
+
+
+@pytest.mark.parametrize("text", TEXT)
+@pytest.mark.parametrize("mode", [StripMode.MARKUP, StripMode.ANSI, StripMode.BOTH])
+def test_strip_stream_matches_strip(text: str, mode: int):
+    expected = strip(text, mode)
+    for size in range(1, len(text) + 1):
+        assert stream(text, mode, size) == expected, size
@@ -0,0 +1,28 @@
+from itertools import count
+
+from saimll.saiml.markup.markup import SAIMLParser
+
+
+def test_template_matches_parse():
+    parser = SAIMLParser()
+    template = parser.template("[@F red]{user}[@F] failed in *{ms}ms*")
+    assert template.static
+    assert template.render(user="f_x*", ms=12) == parser.parse(
+        f"[@F red]{parser.escape('f_x*')}[@F] failed in *12ms*"
+    )
+
+
+def test_template_field_in_macro():
+    parser = SAIMLParser()
+    template = parser.template("[@F {color}]text")
+    assert not template.static
+    assert template.render(color="red") == parser.parse("[@F red]text")
+
+
+def test_template_calls_impure_function_every_render():
+    parser = SAIMLParser("plain")
+    ticks = count()
+    parser.define("template_tick", lambda text: f"{text}{next(ticks)}")
+    template = parser.template("[^template_tick]n[] {value}")
+    assert not template.static
+    assert [template.render(value=1), template.render(value=2)] == ["n0 1", "n1 2"]
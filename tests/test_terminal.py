@@ -0,0 +1,37 @@
+from io import StringIO
+
+import pytest
+
+from saimll.saiml.markup.backends import ColorDepth
+from saimll.saiml.markup.terminal import detect_color_depth
+
+
+class TTY(StringIO):
+    def isatty(self) -> bool:
+        return True
+
+
+@pytest.mark.parametrize(
+    "force, expected",
+    [("0", ColorDepth.NONE), ("1", ColorDepth.ANSI16), ("3", ColorDepth.TRUECOLOR)],
+)
+def test_force_color_sets_depth_of_other_streams(force: str, expected: int):
+    assert detect_color_depth(StringIO(), {"FORCE_COLOR": force}) == expected
+
+
+@pytest.mark.parametrize("force", ["1", "2", "3"])
+def test_force_color_doesnt_downgrade_terminals(force: str):
+    environ = {"FORCE_COLOR": force, "COLORTERM": "truecolor", "TERM": "xterm-256color"}
+    assert detect_color_depth(TTY(), environ) == ColorDepth.TRUECOLOR
+
+
+def test_force_color_raises_terminal_depth():
+    environ = {"FORCE_COLOR": "2", "TERM": "xterm"}
+    assert detect_color_depth(TTY(), environ) == ColorDepth.XTERM256
+    assert detect_color_depth(TTY(), {"FORCE_COLOR": "0", "TERM": "xterm"}) == ColorDepth.NONE
+
+
+def test_no_color_and_non_terminals():
+    assert detect_color_depth(TTY(), {"NO_COLOR": "1", "TERM": "xterm"}) == ColorDepth.NONE
+    assert detect_color_depth(StringIO(), {"TERM": "xterm-256color"}) == ColorDepth.NONE
+    assert detect_color_depth(TTY(), {"TERM": "xterm-256color"}) == ColorDepth.XTERM256
@@ -0,0 +1,29 @@
+import pytest
+
+from saimll.saiml.markup import width
+from saimll.saiml.markup.markup import SAIMLParser
+
+MARKUP = "[@F red]*hello* 世界[@F] plain"
+
+
+def test_slice_ansi_keeps_sequences():
+    text = SAIMLParser().parse(MARKUP)
+    assert width.visible_width(width.slice_ansi(text, 0, 5)) == 5
+    assert width.slice_ansi(text, 0, 0) == "".join(width.ANSI_SPLIT.split(text)[1::2])
+
+
+@pytest.mark.parametrize("columns", range(0, 17))
+def test_truncate_fits_width(columns: int):
+    parser = SAIMLParser()
+    text = parser.parse(MARKUP)
+    compiled = parser.compile(MARKUP)
+    for ellipsis in ("…", "..."):
+        assert width.visible_width(width.truncate(text, columns, ellipsis)) <= columns
+        assert width.visible_width(compiled.truncate(columns, ellipsis)) <= columns
+
+
+def test_truncate_narrower_than_ellipsis_keeps_only_sequences():
+    text = SAIMLParser().parse(MARKUP)
+    assert width.truncate(text, 0) == width.slice_ansi(text, 0, 0)
+    assert width.truncate(text, 2, "...") == width.slice_ansi(text, 0, 0)
+    assert SAIMLParser("plain").compile(MARKUP).truncate(0) == ""